@@ -16,7 +16,15 @@ from users.models import *
 from users.serializers import *
 from schedules.models import *
 from schedules.serializers import *
-from schedules.views import tag_colors
+from schedules.utils import (
+    bump_schedule_version,
+    count_schedule_changed,
+    count_schedules_created,
+    delete_with_tombstones,
+    get_schedule_state,
+    resolve_tags,
+)
+from schedules.utils import delete_schedules as delete_schedule_rows  # 도구 이름과 겹침
 from chatbots.models import Chatting
 from chatbots.serializers import ChattingSerializer
 
@@ -118,28 +126,10 @@ def create_schedule(
             is_completed=is_completed,
             user=user,
         )
+        count_schedules_created([schedule])
 
         if tags:
-            existing_tags = Tag.objects.filter(user=user, name__in=tags)
-            existing_names = set(existing_tags.values_list("name", flat=True))
-
-            new_names = [name for name in tags if name not in existing_names]
-
-            created_tags = []
-            if new_names:
-                current_count = Tag.objects.filter(user=user).count()
-                new_tags = [
-                    Tag(
-                        user=user,
-                        name=name,
-                        color=tag_colors[(current_count + idx) % len(tag_colors)],
-                    )
-                    for idx, name in enumerate(new_names)
-                ]
-                created_tags = Tag.objects.bulk_create(new_tags)
-
-            all_tags = list(existing_tags) + created_tags
-            schedule.tag.set(all_tags)
+            schedule.tag.set(resolve_tags(user, tags))
 
     return {
         "message": "일정이 생성되었습니다.",
@@ -172,16 +162,15 @@ def list_schedules(user_id, scheduled_date, deadline=None, tag_name=None):
         schedules_qs = schedules_qs.filter(scheduled_date=scheduled_date_obj)
 
     if tag_name:
-        schedules_qs = schedules_qs.filter(tag__name=tag_name)
-
-    schedules_qs = schedules_qs.select_related("user").prefetch_related("tag")
+        schedules_qs = schedules_qs.filter(tag__user=user, tag__name=tag_name)
 
-    if not schedules_qs.exists():
+    schedules = serialize_schedules(schedules_qs.order_by("id"))
+    if not schedules:
         return None
 
     return {
         "message": "확인된 일정 목록입니다.",
-        "data": ScheduleSerializer(schedules_qs, many=True).data,
+        "data": schedules,
     }
 
 
@@ -205,11 +194,13 @@ def update_schedule(
     - 예시: 태그1과는 이미 연결되어있는데 태그2를 추가하고 싶다 -> 일정 조회 후 태그값 조회하여 태그1과 연결된 것 확인 -> tags=["태그1","태그2"] 매개변수 전달, 삭제도 마찬가지
     """
     user = get_object_or_404(User.objects.only("id"), id=user_id)
-    schedule = get_object_or_404(
-        Schedule.objects.select_related("user"), id=schedule_id, user=user
-    )
 
     with transaction.atomic():
+        # 동시 수정 시 같은 변경이 두 번 집계되지 않도록 행을 잠근 뒤 수정 전 상태 확인
+        schedule = get_object_or_404(
+            Schedule.objects.select_for_update(), id=schedule_id, user=user
+        )
+        before = get_schedule_state(schedule)
         if title is not None:
             schedule.title = title
         if content is not None:
@@ -222,26 +213,9 @@ def update_schedule(
             schedule.is_completed = is_completed
 
         schedule.save()
+        count_schedule_changed(before, schedule)
         if tags:
-            existing_tags = Tag.objects.filter(user=user, name__in=tags)
-            existing_names = set(existing_tags.values_list("name", flat=True))
-            new_names = [name for name in tags if name not in existing_names]
-
-            created_tags = []
-            if new_names:
-                current_count = Tag.objects.filter(user=user).count()
-                new_tags = [
-                    Tag(
-                        user=user,
-                        name=name,
-                        color=tag_colors[(current_count + idx) % len(tag_colors)],
-                    )
-                    for idx, name in enumerate(new_names)
-                ]
-                created_tags = Tag.objects.bulk_create(new_tags)
-
-            all_tags = list(existing_tags) + created_tags
-            schedule.tag.set(all_tags)
+            schedule.tag.set(resolve_tags(user, tags))
 
     return {
         "message": "일정이 수정되었습니다.",
@@ -253,7 +227,8 @@ def delete_schedules(schedule_id):
     """
     일정을 삭제하는 함수입니다. 일정 id를 받아 해당 일정을 삭제합니다.
     """
-    Schedule.objects.get(id=schedule_id).delete()
+    schedule = Schedule.objects.get(id=schedule_id)
+    delete_schedule_rows(Schedule.objects.filter(id=schedule.id))
 
     return {"message": "일정이 삭제되었습니다. "}
 
@@ -316,11 +291,13 @@ def update_tag(user_id, tag_id, name):
     태그 이름을 수정하는 함수입니다.
     """
     user = get_object_or_404(User.objects.only("id"), id=user_id)
-    tag = get_object_or_404(Tag.objects.select_for_update(), id=tag_id, user=user)
 
     with transaction.atomic():
+        tag = get_object_or_404(Tag.objects.select_for_update(), id=tag_id, user=user)
         tag.name = name
-        tag.save(update_fields=["name"])
+        # updated_at(auto_now)도 저장해야 동기화 피드에 포함됨
+        tag.save(update_fields=["name", "updated_at"])
+        bump_schedule_version(user.id)
 
     return {
         "message": "태그 이름이 수정되었습니다.",
@@ -332,7 +309,9 @@ def delete_tag(tag_id):
     """
     태그를 삭제하는 함수입니다.
     """
-    Tag.objects.filter(id=tag_id).delete()
+    tags = Tag.objects.filter(id=tag_id)
+    bump_schedule_version(*tags.values_list("user_id", flat=True))
+    delete_with_tombstones("tag", tags)
     return {"message": "태그가 삭제되었습니다."}
 
 
@@ -364,6 +343,7 @@ def create_timetable(user_id, subject, day_of_week, start_time, end_time):
         end_time=end_time,
     )
     timetable.save()
+    bump_schedule_version(user.id)
 
     serializer = TimeTableSerializer(timetable)
 
@@ -446,6 +426,7 @@ def update_timetable(user_id, timetable_id, subject, day_of_week, start_time, en
             timetable.end_time = end_time
 
         timetable.save()
+        bump_schedule_version(timetable.user_id)
 
     return {
         "message": "수정된 시간표입니다.",
@@ -458,7 +439,8 @@ def delete_timetable(timetable_id):
     시간표를 삭제하는 함수입니다. 시간표 id를 받아 해당 시간표를 삭제합니다.
     """
     timetable = TimeTable.objects.get(id=timetable_id)
-    timetable.delete()
+    delete_with_tombstones("timetable", TimeTable.objects.filter(id=timetable.id))
+    bump_schedule_version(timetable.user_id)
 
     return {"message": "시간표가 삭제되었습니다. "}
 
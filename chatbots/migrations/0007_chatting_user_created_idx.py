@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chatbots", "0006_chatting_data_alter_chatting_answer"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatting",
+            index=models.Index(
+                fields=["user", "-created_at"], name="chatting_user_created_idx"
+            ),
+        ),
+    ]
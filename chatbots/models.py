@@ -8,3 +8,9 @@ class Chatting(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     answer = models.JSONField(null=True)
     data = models.JSONField(null=True)
+
+    class Meta:
+        indexes = [
+            # 사용자별 최신순 대화 목록 (커서 페이지네이션)
+            models.Index(fields=["user", "-created_at"], name="chatting_user_created_idx"),
+        ]
@@ -1,3 +1,44 @@
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from chatbots.models import Chatting
+from users.models import User
+
+
+class ChattingListTest(TestCase):
+    """대화 목록 최신순 커서 페이지네이션"""
+
+    def setUp(self):
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for i in range(15):
+            Chatting.objects.create(query=f"질문{i}", user=self.user)
+
+    def test_full_list_without_cursor(self):
+        response = self.client.get("/chatbots/")
+        self.assertEqual(len(response.data), 15)
+        self.assertEqual(response.data[0]["query"], "질문14")
+
+    def test_cursor_pages(self):
+        queries = []
+        url = "/chatbots/?page_size=4"
+        while url:
+            response = self.client.get(url)
+            queries += [chatting["query"] for chatting in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(queries, [f"질문{i}" for i in reversed(range(15))])
+
+    def test_cursor_pages_with_same_created_at(self):
+        Chatting.objects.update(created_at=timezone.now())
+        ids = []
+        url = "/chatbots/?page_size=4"
+        while url:
+            response = self.client.get(url)
+            ids += [chatting["id"] for chatting in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(
+            ids,
+            list(Chatting.objects.order_by("-id").values_list("id", flat=True)),
+        )
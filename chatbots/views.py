@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from .models import Chatting
 from .serializers import ChattingSerializer
 from .graphs import run_agent_graph
+from config.pagination import ChattingCursorPagination
 
 from django.utils import timezone
 
@@ -14,6 +15,14 @@ from .core_agent import run_core_agent
 class ChatbotAPIView(APIView):
     def get(self, request):
         chattings = Chatting.objects.filter(user=request.user).order_by("-created_at")
+
+        # ?page_size= 또는 ?cursor= 가 있으면 최신순으로 나눠서 반환
+        paginator = ChattingCursorPagination()
+        page = paginator.paginate_queryset(chattings, request, view=self)
+        if page is not None:
+            serializer = ChattingSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = ChattingSerializer(chattings, many=True)
         return Response(serializer.data)
 
@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    정렬 키 기준 커서 페이지네이션 (페이지 위치와 관계없이 일정한 조회 비용)
+    cursor 또는 page_size 쿼리가 있을 때만 적용, 없으면 기존처럼 전체 목록 반환
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class ChattingCursorPagination(OptionalCursorPagination):
+    # 같은 시각에 저장된 대화가 페이지 경계에서 빠지거나 겹치지 않도록 id로 순서 고정
+    ordering = ("-created_at", "-id")
@@ -66,6 +66,33 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 CELERY_BROKER_URL = "redis://127.0.0.1:6379"
 CELERY_RESULT_BACKEND = "redis://127.0.0.1:6379"
 
+# Cache settings (Celery 브로커와 다른 DB 번호 사용)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://127.0.0.1:6379/1",
+    }
+}
+
+# eCampus 크롤러 설정
+# "http": 브라우저 없이 요청/HTML 파싱 (로그인 페이지 구조가 다르면 Selenium으로 전환)
+# "selenium": 항상 headless Chrome 사용
+CRAWLER_BACKEND = env("CRAWLER_BACKEND", default="http")
+CRAWLER_HTTP_TIMEOUT = 10  # 요청당 대기 시간 (초)
+CRAWLER_HTTP_POOL_SIZE = 10  # 워커 프로세스당 eCampus 연결 수
+CRAWLER_SYLLABUS_WORKERS = 4  # 강의 계획서 동시 요청 수 (Selenium은 동시에 여는 탭 수)
+CRAWLER_SYLLABUS_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 사용자 간 공유하는 강의 계획서 캐시
+CRAWLER_DRIVER_POOL_SIZE = 1  # 워커 프로세스당 미리 띄워 둘 Chrome 수
+CRAWLER_DRIVER_MAX_USES = 20  # 이 횟수만큼 사용한 Chrome은 종료 후 새로 실행
+CRAWLER_DRIVER_MAX_RSS_MB = 500  # Chrome 프로세스 메모리 합이 넘으면 종료
+# 호스트당 동시에 크롤링하는 Chrome 수 (Celery 동시성과 관계없이 적용)
+# 자리는 Chrome을 빌려 쓰는 동안만 차지하고, 풀에서 대기 중인 Chrome은 차지하지 않음
+# 메모리 예산: 워커 동시성 × CRAWLER_DRIVER_POOL_SIZE × CRAWLER_DRIVER_MAX_RSS_MB
+# (+ 웹 프로세스의 Selenium 전환은 풀 없이 쓸 때마다 실행, 최대 CRAWLER_CHROME_SLOTS개)
+CRAWLER_CHROME_SLOTS = env.int("CRAWLER_CHROME_SLOTS", default=2)
+CRAWLER_SLOT_TIMEOUT = 60  # 자리가 날 때까지 기다리는 시간 (초)
+CRAWLER_SLOT_DIR = env("CRAWLER_SLOT_DIR", default="/tmp/schedulo-crawler-slots")
+
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
@@ -177,6 +204,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "notifications.tasks.notify_deadline_schedule",
         "schedule": crontab(hour=22, minute=0),  # 매일 10시 00분에 실행
     },
+    "prune_sync_tombstones": {
+        "task": "schedules.tasks.prune_sync_tombstones_task",
+        "schedule": crontab(hour=4, minute=0),  # 매일 4시 00분에 실행
+    },
 }
 
 
@@ -0,0 +1,105 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from schedules.models import Schedule, Tag
+from schedules.serializers import (
+    GroupedScheduleSerializer,
+    group_schedules_by_date,
+    serialize_schedules,
+)
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "일정 조회 직렬화 ModelSerializer 방식과 .values() 방식 비교 (데이터는 롤백)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedules", type=int, nargs="+", default=[1_000, 10_000],
+            help="측정할 일정 수 목록",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수")
+
+    def handle(self, *args, **options):
+        for n_schedules in options["schedules"]:
+            try:
+                with transaction.atomic():
+                    self.run(n_schedules, options["repeat"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def run(self, n_schedules, repeat):
+        rnd = random.Random(n_schedules)
+        user = User.objects.create(
+            email=f"bench-{time.time_ns()}@bench.local", password="!"
+        )
+        tags = Tag.objects.bulk_create(
+            [Tag(name=f"태그{i}", user=user, color="#CFE6D6") for i in range(8)]
+        )
+        if tags[0].pk is None:
+            tags = list(Tag.objects.filter(user=user))
+
+        first = date.today() - timedelta(days=90)
+        Schedule.objects.bulk_create(
+            [
+                Schedule(
+                    title=f"일정{i}",
+                    content="내용",
+                    scheduled_date=first + timedelta(days=rnd.randrange(180)),
+                    is_completed=rnd.random() < 0.5,
+                    user=user,
+                )
+                for i in range(n_schedules)
+            ],
+            batch_size=1000,
+        )
+        schedule_ids = Schedule.objects.filter(user=user).values_list("id", flat=True)
+        Schedule.tag.through.objects.bulk_create(
+            [
+                Schedule.tag.through(schedule_id=schedule_id, tag_id=tag.id)
+                for schedule_id in schedule_ids
+                for tag in rnd.sample(tags, rnd.randint(0, 3))
+            ],
+            batch_size=1000,
+        )
+
+        schedules = Schedule.objects.filter(
+            user=user, scheduled_date__range=[first, first + timedelta(days=180)]
+        ).order_by("scheduled_date", "id")
+
+        def serializer_path():
+            return JSONRenderer().render(GroupedScheduleSerializer(schedules).data)
+
+        def values_path():
+            return JSONRenderer().render(
+                group_schedules_by_date(serialize_schedules(schedules))
+            )
+
+        timings = {}
+        outputs = {}
+        for name, path in [("serializer", serializer_path), ("values", values_path)]:
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                outputs[name] = path()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+
+        identical = outputs["serializer"] == outputs["values"]
+        self.stdout.write(
+            f"{n_schedules:>7} schedules: serializer {timings['serializer']:.3f}s, "
+            f"values {timings['values']:.3f}s "
+            f"(x{timings['serializer'] / timings['values']:.1f}), "
+            f"동일 출력: {'예' if identical else '아니오'}"
+        )
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_review_key(apps, schema_editor):
+    """기존 자동 생성 복습 일정에 review_key 채우기 (중복된 행은 첫 번째만)"""
+    Schedule = apps.get_model("schedules", "Schedule")
+    seen = set()
+    batch = []
+    rows = (
+        Schedule.objects.filter(
+            title__endswith=" 복습",
+            content__endswith=" 복습 스케줄",
+            scheduled_date__isnull=False,
+            user__isnull=False,
+        )
+        .order_by("id")
+        .only("id", "user_id", "title", "content", "scheduled_date")
+    )
+    for schedule in rows.iterator():
+        if schedule.content != f"{schedule.title} 스케줄":
+            continue
+        review_key = f"{schedule.scheduled_date.isoformat()}:{schedule.title}"
+        if (schedule.user_id, review_key) in seen:
+            continue
+        seen.add((schedule.user_id, review_key))
+        schedule.review_key = review_key
+        batch.append(schedule)
+        if len(batch) >= 1000:
+            Schedule.objects.bulk_update(batch, ["review_key"])
+            batch = []
+    if batch:
+        Schedule.objects.bulk_update(batch, ["review_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedules", "0007_tag_color"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="schedule",
+            name="review_key",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_review_key, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="schedule",
+            constraint=models.UniqueConstraint(
+                fields=("user", "review_key"), name="unique_schedule_review_key"
+            ),
+        ),
+    ]
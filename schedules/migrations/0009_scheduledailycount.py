@@ -0,0 +1,74 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_daily_counts(apps, schema_editor):
+    """기존 일정으로 날짜별 일정 수 채우기"""
+    Schedule = apps.get_model("schedules", "Schedule")
+    ScheduleDailyCount = apps.get_model("schedules", "ScheduleDailyCount")
+    rows = (
+        Schedule.objects.filter(user__isnull=False, scheduled_date__isnull=False)
+        .values("user_id", "scheduled_date")
+        .annotate(total=Count("id"), completed=Count("id", filter=Q(is_completed=True)))
+        .order_by()
+    )
+    ScheduleDailyCount.objects.bulk_create(
+        (
+            ScheduleDailyCount(
+                user_id=row["user_id"],
+                date=row["scheduled_date"],
+                total=row["total"],
+                completed=row["completed"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedules", "0008_schedule_review_key"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleDailyCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("total", models.IntegerField(default=0)),
+                ("completed", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedule_daily_count",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "date"), name="unique_schedule_daily_count"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_daily_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedules", "0009_scheduledailycount"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="schedule",
+            index=models.Index(
+                fields=["user", "scheduled_date"], name="schedule_user_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="schedule",
+            index=models.Index(
+                fields=["deadline", "is_completed"], name="schedule_deadline_done_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="schedule",
+            index=models.Index(
+                fields=["scheduled_date", "is_completed"], name="schedule_date_done_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(fields=["user", "name"], name="tag_user_name_idx"),
+        ),
+    ]
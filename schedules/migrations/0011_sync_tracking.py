@@ -0,0 +1,97 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedules", "0010_schedule_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("schedule", "schedule"),
+                            ("tag", "tag"),
+                            ("timetable", "timetable"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="schedule",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="timetable",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="schedule",
+            index=models.Index(
+                fields=["user", "updated_at", "id"], name="schedule_sync_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "updated_at", "id"], name="tag_sync_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timetable",
+            index=models.Index(
+                fields=["user", "updated_at", "id"], name="timetable_sync_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="synctombstone",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="sync_tombstone",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="synctombstone",
+            index=models.Index(
+                fields=["user", "deleted_at", "id"], name="sync_tombstone_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="synctombstone",
+            index=models.Index(
+                fields=["deleted_at"], name="sync_tombstone_deleted_idx"
+            ),
+        ),
+    ]
@@ -9,6 +9,15 @@ class Tag(models.Model):
         User, null=True, on_delete=models.CASCADE, related_name="tag"
     )
     color = models.CharField(null=True, max_length=10)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 사용자별 태그 이름 조회 (태그 필터, 태그 생성)
+            models.Index(fields=["user", "name"], name="tag_user_name_idx"),
+            # 변경분 동기화
+            models.Index(fields=["user", "updated_at", "id"], name="tag_sync_idx"),
+        ]
 
 
 class Schedule(models.Model):
@@ -22,6 +31,32 @@ class Schedule(models.Model):
         User, null=True, on_delete=models.CASCADE, related_name="schedule"
     )
     tag = models.ManyToManyField(Tag, related_name="schedule")
+    # 자동 생성된 복습 일정 식별 키 ("날짜:제목"), 직접 만든 일정은 null
+    review_key = models.CharField(null=True, blank=True, max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "review_key"], name="unique_schedule_review_key"
+            ),
+        ]
+        indexes = [
+            # 사용자별 기간 조회 (일정 목록, 챗봇, 복습 일정)
+            models.Index(fields=["user", "scheduled_date"], name="schedule_user_date_idx"),
+            # 마감 알림
+            models.Index(
+                fields=["deadline", "is_completed"], name="schedule_deadline_done_idx"
+            ),
+            # 오늘 일정 알림
+            models.Index(
+                fields=["scheduled_date", "is_completed"], name="schedule_date_done_idx"
+            ),
+            # 변경분 동기화
+            models.Index(
+                fields=["user", "updated_at", "id"], name="schedule_sync_idx"
+            ),
+        ]
 
 
 class TimeTable(models.Model):
@@ -41,3 +76,53 @@ class TimeTable(models.Model):
     day_of_week = models.CharField(null=True, max_length=3, choices=DAY_CHOICES)
     start_time = models.TimeField(null=True, auto_created=False, editable=True)
     end_time = models.TimeField(null=True, auto_created=False, editable=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 변경분 동기화
+            models.Index(fields=["user", "updated_at", "id"], name="timetable_sync_idx"),
+        ]
+
+
+class ScheduleDailyCount(models.Model):
+    """사용자별 날짜별 일정 수 (전체, 완료), 일정 생성/수정/삭제 시 함께 갱신"""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="schedule_daily_count"
+    )
+    date = models.DateField()
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"], name="unique_schedule_daily_count"
+            ),
+        ]
+
+
+class SyncTombstone(models.Model):
+    """삭제된 일정/태그/시간표 기록, 변경분 동기화에서 삭제 목록으로 전달"""
+
+    KIND_CHOICES = [
+        ("schedule", "schedule"),
+        ("tag", "tag"),
+        ("timetable", "timetable"),
+    ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="sync_tombstone"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_at", "id"], name="sync_tombstone_idx"
+            ),
+            models.Index(fields=["deleted_at"], name="sync_tombstone_deleted_idx"),
+        ]
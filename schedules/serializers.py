@@ -1,6 +1,15 @@
 from collections import defaultdict
+from django.db import transaction
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from schedules.models import Tag, Schedule, TimeTable
+from schedules.utils import (
+    count_schedule_changed,
+    count_schedules_created,
+    create_schedules,
+    get_schedule_state,
+)
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -12,11 +21,23 @@ class TagSerializer(serializers.ModelSerializer):
         }
 
 
+def prefetch_tags(schedules):
+    """일정 queryset에 태그를 미리 불러옴 (일정마다 태그 쿼리가 나가지 않도록), 태그는 id 순"""
+    return schedules.prefetch_related(
+        Prefetch("tag", queryset=Tag.objects.order_by("id"))
+    )
+
+
 class ScheduleListSerializer(serializers.ListSerializer):
     def create(self, validated_data):
         user = self.context["request"].user
         schedules = [Schedule(**item, user=user) for item in validated_data]
-        return Schedule.objects.bulk_create(schedules)
+        with transaction.atomic():
+            schedules = create_schedules(
+                schedules, need_ids=self.context.get("need_ids", False)
+            )
+            count_schedules_created(schedules)
+        return schedules
 
 
 class ScheduleSerializer(serializers.ModelSerializer):
@@ -24,7 +45,7 @@ class ScheduleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Schedule
-        fields = "__all__"
+        exclude = ["review_key", "updated_at"]
         extra_kwargs = {
             "content": {"required": False},
             "deadline": {"required": False},
@@ -46,7 +67,20 @@ class ScheduleSerializer(serializers.ModelSerializer):
         if user:
             validated_data["user"] = user
 
-        schedule = Schedule.objects.create(**validated_data)
+        with transaction.atomic():
+            schedule = Schedule.objects.create(**validated_data)
+            count_schedules_created([schedule])
+        return schedule
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            # 동시 수정 시 같은 변경이 두 번 집계되지 않도록 행을 잠근 뒤 수정 전 상태 확인
+            instance = get_object_or_404(
+                Schedule.objects.select_for_update(), pk=instance.pk
+            )
+            before = get_schedule_state(instance)
+            schedule = super().update(instance, validated_data)
+            count_schedule_changed(before, schedule)
         return schedule
 
 
@@ -54,7 +88,11 @@ class GroupedScheduleSerializer(serializers.Serializer):
     schedules = serializers.SerializerMethodField()
 
     def get_schedules(self, obj):
-        schedule_data = obj.order_by("scheduled_date")  # 날짜순 정렬
+        # queryset이면 날짜순 정렬, 이미 불러온 목록이면 날짜순으로 정렬되어 있다고 가정
+        if hasattr(obj, "order_by"):
+            schedule_data = prefetch_tags(obj.order_by("scheduled_date", "id"))
+        else:
+            schedule_data = obj
         serialized_data = ScheduleSerializer(schedule_data, many=True).data
 
         grouped_by_date = defaultdict(list)
@@ -66,7 +104,69 @@ class GroupedScheduleSerializer(serializers.Serializer):
         return grouped_by_date
 
 
+# ------------------------- 조회 전용 빠른 직렬화 (.values) ------------------------- #
+def _date_to_str(value):
+    return None if value is None else value.isoformat()
+
+
+def get_schedule_tags(schedules):
+    """일정 queryset의 일정별 태그 목록 {schedule_id: [{id, name, color}, ...]} (쿼리 1번)"""
+    through = Schedule.tag.through.objects.filter(
+        schedule_id__in=schedules.order_by().values("id")
+    )
+    tags = defaultdict(list)
+    for schedule_id, tag_id, name, color in through.order_by("tag_id").values_list(
+        "schedule_id", "tag_id", "tag__name", "tag__color"
+    ):
+        tags[schedule_id].append({"id": tag_id, "name": name, "color": color})
+    return tags
+
+
+def serialize_schedules(schedules):
+    """
+    ScheduleSerializer(many=True).data와 같은 결과를 모델 인스턴스 없이 생성 (조회 전용)
+    일정 .values() 1번 + 태그 1번, 필드 순서도 ScheduleSerializer와 같음
+    """
+    rows = list(
+        schedules.values(
+            "id",
+            "title",
+            "content",
+            "scheduled_date",
+            "deadline",
+            "is_completed",
+            "order_num",
+            "user_id",
+        )
+    )
+    tags = get_schedule_tags(schedules) if rows else {}
+    return [
+        {
+            "id": row["id"],
+            "tag": tags.get(row["id"], []),
+            "title": row["title"],
+            "content": row["content"],
+            "scheduled_date": _date_to_str(row["scheduled_date"]),
+            "deadline": _date_to_str(row["deadline"]),
+            "is_completed": row["is_completed"],
+            "order_num": row["order_num"],
+            "user": row["user_id"],
+        }
+        for row in rows
+    ]
+
+
+def group_schedules_by_date(items):
+    """serialize_schedules 결과(날짜순)를 GroupedScheduleSerializer와 같은 형태로 묶음"""
+    grouped_by_date = defaultdict(list)
+    for item in items:
+        item = dict(item)
+        date = item.pop("scheduled_date", None)
+        grouped_by_date[date].append(item)
+    return {"schedules": grouped_by_date}
+
+
 class TimeTableSerializer(serializers.ModelSerializer):
     class Meta:
         model = TimeTable
-        fields = "__all__"
+        exclude = ["updated_at"]
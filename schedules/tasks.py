@@ -1,17 +1,27 @@
+from collections import defaultdict
+from datetime import date
+import logging
 from math import ceil
+import time
 from django.db import transaction
 from django.utils import timezone
-from celery import shared_task
+from celery import chord, shared_task
 import pytz
 import random
 
-from users.models import User, StudyRoutine
+from users.models import StudyRoutine
 from schedules.models import Schedule, TimeTable
+from schedules.utils import prune_sync_tombstones, refresh_schedule_counts
 
 from rest_framework import decorators, response
 
 WEEKDAY_ORDER = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
 WEEKDAY_TO_INDEX = {d: i for i, d in enumerate(WEEKDAY_ORDER)}
+REVIEW_BATCH_SIZE = 1000
+REVIEW_SHARD_SIZE = 500  # shard 하나가 처리할 사용자 수
+REVIEW_SHARD_MAX_RETRIES = 3
+
+logger = logging.getLogger("schedulo")
 
 
 def get_monday_of_week(dt):
@@ -33,173 +43,255 @@ def get_week_dates(reference_dt):
     return dates
 
 
-def ensure_no_duplicate_and_create(user, title, content, scheduled_date):
-    exists = Schedule.objects.filter(
-        user=user, title=title, scheduled_date=scheduled_date
-    ).exists()
-    if not exists:
-        schedule = Schedule.objects.create(
-            user=user,
-            title=title,
-            content=content,
-            scheduled_date=scheduled_date,
-            deadline=scheduled_date,
+def get_review_key(title, scheduled_date):
+    """자동 생성 복습 일정의 고유 키 (사용자별 unique 제약)"""
+    return f"{scheduled_date.isoformat()}:{title}"
+
+
+def plan_review_schedules(review_type, timetables, week_dates, rng=random):
+    """
+    복습 유형과 시간표로 한 주 동안의 복습 일정 (제목, 내용, 날짜) 목록을 계산
+    timetables: (과목명, 요일) 튜플 리스트
+    rng: 과목 순서를 섞을 난수 생성기 (같은 시드면 같은 계획)
+    """
+    review_type = review_type.strip().upper()
+    plan = []
+
+    # 당일 복습
+    if review_type == "SAMEDAY":
+        # 과목 리스트의 각 요소에서 과목명, 요일 추출 -> 해당 요일에 해당 과목명으로 복습 일정 생성
+        for subject, day_of_week in timetables:
+            day_code = (day_of_week or "").strip().upper()
+            if day_code in week_dates:
+                plan.append((f"{subject} 복습", f"{subject} 복습 스케줄", week_dates[day_code]))
+        return plan
+
+    # CUSTOM 요일 처리 (e.g. MON WED FRI)
+    parts = [p.strip().upper() for p in review_type.split() if p.strip()]
+    custom_codes = [p for p in parts if p in WEEKDAY_ORDER]
+    if not custom_codes:
+        return plan
+
+    if not timetables:
+        subject_names = [f"복습{i}" for i in range(1, 5)]
+    else:
+        subject_names = [subject for subject, _ in timetables]
+
+    n_subjects = len(subject_names)
+    n_days = len(custom_codes)
+
+    # 과목 순서 랜덤
+    shuffled_subjects = subject_names[:]
+    rng.shuffle(shuffled_subjects)
+
+    # 요일별 배분: 기본 개수 + 나머지 처리
+    base_count = n_subjects // n_days
+    extra = n_subjects % n_days
+    day_distribution = [base_count + (1 if i < extra else 0) for i in range(n_days)]
+
+    subj_idx = 0
+    for day_idx, code in enumerate(custom_codes):
+        scheduled_date = week_dates[code]  # 요일에 맞는 날짜
+        for _ in range(day_distribution[day_idx]):  # 해당 요일의 배분 개수만큼 반복
+            subj = shuffled_subjects[subj_idx]
+            plan.append((f"{subj} 복습", f"{subj} 복습 스케줄", scheduled_date))
+            subj_idx += 1
+
+    return plan
+
+
+def build_weekly_review_schedules(week_dates, first_user_id=None, last_user_id=None):
+    """
+    사용자의 한 주 복습 일정을 일괄 생성 (first_user_id ~ last_user_id 범위, 생략 시 전체)
+    루틴/시간표/기존 일정을 각각 한 번의 쿼리로 불러와 메모리에서 계산한 뒤 bulk_create로 저장
+    같은 제목/날짜의 일정(직접 만든 일정 포함)이 이미 있으면 건너뛰고,
+    동시에 실행된 생성끼리의 중복은 (user, review_key) unique 제약으로 DB에서 무시
+    """
+    elapsed = {}
+    started = time.perf_counter()
+
+    user_filter = {}
+    if first_user_id is not None:
+        user_filter["user_id__gte"] = first_user_id
+    if last_user_id is not None:
+        user_filter["user_id__lte"] = last_user_id
+
+    # 1. 루틴, 시간표 일괄 조회 (사용자별 첫 번째 루틴 사용)
+    routines = {}
+    for user_id, review_type in (
+        StudyRoutine.objects.filter(user__isnull=False, **user_filter)
+        .order_by("user_id", "id")
+        .values_list("user_id", "review_type")
+    ):
+        routines.setdefault(user_id, review_type)
+    routines = {user_id: rt for user_id, rt in routines.items() if rt}
+
+    timetables = defaultdict(list)
+    for user_id, subject, day_of_week in (
+        TimeTable.objects.filter(user_id__in=routines.keys())
+        .order_by("user_id", "id")
+        .values_list("user_id", "subject", "day_of_week")
+    ):
+        timetables[user_id].append((subject, day_of_week))
+    elapsed["load"] = time.perf_counter() - started
+
+    # 2. 메모리에서 한 주 계획 계산
+    phase_started = time.perf_counter()
+    plan = []
+    monday = week_dates["MON"]
+    for user_id, review_type in routines.items():
+        try:
+            # 같은 주에 다시 실행해도 같은 배분이 나오도록 사용자/주 단위 시드 사용
+            rng = random.Random(f"{user_id}:{monday.isoformat()}")
+            for title, content, scheduled_date in plan_review_schedules(
+                review_type, timetables[user_id], week_dates, rng
+            ):
+                plan.append((user_id, title, content, scheduled_date))
+        except Exception as e:
+            logger.error(f"generate_weekly_review_schedules error for user {user_id}: {e}")
+    elapsed["plan"] = time.perf_counter() - phase_started
+
+    # 3. 이미 존재하는 (user, title, scheduled_date) 한 번에 조회
+    phase_started = time.perf_counter()
+    existing = set(
+        Schedule.objects.filter(
+            scheduled_date__range=[min(week_dates.values()), max(week_dates.values())],
+            title__endswith=" 복습",
+            **user_filter,
+        ).values_list("user_id", "title", "scheduled_date")
+    )
+    elapsed["lookup"] = time.perf_counter() - phase_started
+
+    # 4. 중복 제외 후 청크 단위 bulk_create, 동시 실행으로 생긴 (user, review_key) 충돌은 DB에서 무시
+    phase_started = time.perf_counter()
+    new_schedules = {}
+    for user_id, title, content, scheduled_date in plan:
+        if (user_id, title, scheduled_date) in existing:
+            continue
+        review_key = get_review_key(title, scheduled_date)
+        new_schedules.setdefault(
+            (user_id, review_key),
+            Schedule(
+                user_id=user_id,
+                title=title,
+                content=content,
+                scheduled_date=scheduled_date,
+                deadline=scheduled_date,
+                review_key=review_key,
+            ),
         )
-        schedule.save()
-        print(schedule)
+    with transaction.atomic():
+        Schedule.objects.bulk_create(
+            new_schedules.values(),
+            batch_size=REVIEW_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        # 실제로 추가된 행을 알 수 없으므로 날짜별 일정 수는 다시 집계
+        refresh_schedule_counts(list(routines), list(week_dates.values()))
+    elapsed["write"] = time.perf_counter() - phase_started
+    elapsed["total"] = time.perf_counter() - started
+
+    result = {
+        "first_user_id": first_user_id,
+        "last_user_id": last_user_id,
+        "users": len(routines),
+        "planned": len(plan),
+        "skipped": len(plan) - len(new_schedules),
+        "submitted": len(new_schedules),  # 동시 실행으로 이미 있던 행은 DB에서 무시됨
+        "elapsed": {phase: round(seconds, 3) for phase, seconds in elapsed.items()},
+    }
+    logger.info(f"📅 주간 복습 일정 생성 완료: {result}")
+    return result
+
+
+def get_current_week_dates():
+    seoul_tz = pytz.timezone("Asia/Seoul")
+    now_utc = timezone.now()
+    now_seoul = now_utc.astimezone(seoul_tz)
+    return get_week_dates(now_seoul)
+
+
+def get_review_user_shards(shard_size=REVIEW_SHARD_SIZE):
+    """복습 루틴이 있는 사용자 id를 shard_size 단위의 (시작 id, 끝 id) 범위로 분할"""
+    user_ids = list(
+        StudyRoutine.objects.filter(user__isnull=False)
+        .exclude(review_type__isnull=True)
+        .exclude(review_type="")
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    return [
+        (chunk[0], chunk[-1])
+        for chunk in (
+            user_ids[i : i + shard_size] for i in range(0, len(user_ids), shard_size)
+        )
+    ]
 
 
 @shared_task
 def generate_weekly_review_schedules():
-    seoul_tz = pytz.timezone("Asia/Seoul")
-    now_utc = timezone.now()
-    now_seoul = now_utc.astimezone(seoul_tz)
+    """사용자 id 범위별 shard 태스크로 나눠 chord로 실행"""
+    week_dates = {
+        code: d.isoformat() for code, d in get_current_week_dates().items()
+    }
+    shards = get_review_user_shards()
+    if not shards:
+        logger.info("📅 주간 복습 일정 생성 대상 사용자 없음")
+        return
+
+    logger.info(f"📅 주간 복습 일정 생성 시작: shard {len(shards)}개")
+    chord(
+        generate_weekly_review_schedules_shard.s(week_dates, first_id, last_id)
+        for first_id, last_id in shards
+    )(summarize_weekly_review_schedules.s())
+    return len(shards)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=REVIEW_SHARD_MAX_RETRIES,
+)
+def generate_weekly_review_schedules_shard(self, week_dates, first_user_id, last_user_id):
+    """shard 하나(사용자 id 범위)의 복습 일정 생성, 실패 시 해당 shard만 재시도"""
+    week_dates = {
+        code: date.fromisoformat(value) for code, value in week_dates.items()
+    }
+    return build_weekly_review_schedules(week_dates, first_user_id, last_user_id)
 
-    week_dates = get_week_dates(now_seoul)
-    users = User.objects.all()
 
-    for user in users:
-        try:
-            routine = StudyRoutine.objects.filter(user=user).first()
-            if not routine or not routine.review_type:
-                continue
-
-            tts = list(TimeTable.objects.filter(user=user))
-            if not tts:
-                subject_names = [f"복습{i}" for i in range(1, 5)]
-            else:
-                subject_names = [tt.subject for tt in tts]
-
-            review_type = routine.review_type.strip().upper()
-
-            # 당일 복습
-            if review_type == "SAMEDAY":
-                with transaction.atomic():
-                    # 과목 리스트의 각 요소에서 과목명, 요일 추출 -> 해당 요일에 해당 과목명으로 복습 일정 생성
-                    for tt in tts:
-                        day_code = (tt.day_of_week or "").strip().upper()
-                        if day_code in week_dates:
-                            scheduled_date = week_dates[day_code]
-                            title = f"{tt.subject} 복습"
-                            content = f"{tt.subject} 복습 스케줄"
-                            ensure_no_duplicate_and_create(
-                                user, title, content, scheduled_date
-                            )
-            else:
-                # CUSTOM 요일 처리 (e.g. MON WED FRI)
-                parts = [p.strip().upper() for p in review_type.split() if p.strip()]
-                custom_codes = [p for p in parts if p in WEEKDAY_ORDER]
-                if not custom_codes:
-                    continue
-
-                n_subjects = len(subject_names)
-                n_days = len(custom_codes)
-
-                # 과목 순서 랜덤
-                shuffled_subjects = subject_names[:]
-                random.shuffle(shuffled_subjects)
-
-                # 요일별 배분: 기본 개수 + 나머지 처리
-                base_count = n_subjects // n_days
-                extra = n_subjects % n_days
-                day_distribution = [
-                    base_count + (1 if i < extra else 0) for i in range(n_days)
-                ]
-
-                subj_idx = 0
-                with transaction.atomic():
-                    for day_idx, code in enumerate(custom_codes):
-                        scheduled_date = week_dates[code]  # 요일에 맞는 날짜
-                        for _ in range(
-                            day_distribution[day_idx]
-                        ):  # 해당 요일의 배분 개수만큼 반복
-                            subj = shuffled_subjects[subj_idx]
-                            title = f"{subj} 복습"
-                            content = f"{subj} 복습 스케줄"
-                            ensure_no_duplicate_and_create(
-                                user, title, content, scheduled_date
-                            )
-                            subj_idx += 1
+@shared_task
+def summarize_weekly_review_schedules(results):
+    """shard 결과 합산"""
+    summary = {
+        "shards": len(results),
+        "users": sum(r["users"] for r in results),
+        "planned": sum(r["planned"] for r in results),
+        "skipped": sum(r["skipped"] for r in results),
+        "submitted": sum(r["submitted"] for r in results),
+        "slowest_shard": max((r["elapsed"]["total"] for r in results), default=0),
+    }
+    logger.info(f"📅 주간 복습 일정 생성 shard 합산: {summary}")
+    return summary
 
-        except Exception as e:
-            print(f"generate_weekly_review_schedules error for user {user.pk}: {e}")
+
+@shared_task
+def prune_sync_tombstones_task():
+    """보관 기간이 지난 동기화용 삭제 기록 정리"""
+    deleted = prune_sync_tombstones()
+    logger.info(f"🗑️ 동기화 삭제 기록 {deleted}건 정리")
+    return deleted
 
 
 # API Test Version
 @decorators.api_view(["POST"])
 def generate_weekly_review_schedules_api_test(request):
-    seoul_tz = pytz.timezone("Asia/Seoul")
-    now_utc = timezone.now()
-    now_seoul = now_utc.astimezone(seoul_tz)
-
-    week_dates = get_week_dates(now_seoul)
-    users = User.objects.all()
-
-    for user in users:
-        try:
-            routine = StudyRoutine.objects.filter(user=user).first()
-            if not routine or not routine.review_type:
-                continue
-
-            tts = list(TimeTable.objects.filter(user=user))
-            if not tts:
-                subject_names = [f"복습{i}" for i in range(1, 5)]
-            else:
-                subject_names = [tt.subject for tt in tts]
-
-            review_type = routine.review_type.strip().upper()
-
-            # 당일 복습
-            if review_type == "SAMEDAY":
-                with transaction.atomic():
-                    # 과목 리스트의 각 요소에서 과목명, 요일 추출 -> 해당 요일에 해당 과목명으로 복습 일정 생성
-                    for tt in tts:
-                        day_code = (tt.day_of_week or "").strip().upper()
-                        if day_code in week_dates:
-                            scheduled_date = week_dates[day_code]
-                            title = f"{tt.subject} 복습"
-                            content = f"{tt.subject} 복습 스케줄"
-                            ensure_no_duplicate_and_create(
-                                user, title, content, scheduled_date
-                            )
-            else:
-                # CUSTOM 요일 처리 (e.g. MON WED FRI)
-                parts = [p.strip().upper() for p in review_type.split() if p.strip()]
-                custom_codes = [p for p in parts if p in WEEKDAY_ORDER]
-                if not custom_codes:
-                    continue
-
-                n_subjects = len(subject_names)
-                n_days = len(custom_codes)
-
-                # 과목 순서 랜덤
-                shuffled_subjects = subject_names[:]
-                random.shuffle(shuffled_subjects)
-
-                # 요일별 배분: 기본 개수 + 나머지 처리
-                base_count = n_subjects // n_days
-                extra = n_subjects % n_days
-                day_distribution = [
-                    base_count + (1 if i < extra else 0) for i in range(n_days)
-                ]
-
-                subj_idx = 0
-                with transaction.atomic():
-                    for day_idx, code in enumerate(custom_codes):
-                        scheduled_date = week_dates[code]  # 요일에 맞는 날짜
-                        for _ in range(
-                            day_distribution[day_idx]
-                        ):  # 해당 요일의 배분 개수만큼 반복
-                            subj = shuffled_subjects[subj_idx]
-                            title = f"{subj} 복습"
-                            content = f"{subj} 복습 스케줄"
-                            ensure_no_duplicate_and_create(
-                                user, title, content, scheduled_date
-                            )
-                            subj_idx += 1
-
-        except Exception as e:
-            print(f"generate_weekly_review_schedules error for user {user.pk}: {e}")
-            return response.Response({"status": "error", "message": str(e)})
+    try:
+        result = build_weekly_review_schedules(get_current_week_dates())
+    except Exception as e:
+        print(f"generate_weekly_review_schedules error: {e}")
+        return response.Response({"status": "error", "message": str(e)})
 
-    return response.Response({"status": "success"})
+    return response.Response({"status": "success", **result})
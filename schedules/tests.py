@@ -1,3 +1,1054 @@
+import re
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from chatbots import core_agent
+from schedules import tasks
+from schedules.models import Schedule, ScheduleDailyCount, Tag, TimeTable
+from schedules.serializers import (
+    GroupedScheduleSerializer,
+    ScheduleSerializer,
+    get_schedule_tags,
+    group_schedules_by_date,
+    prefetch_tags,
+    serialize_schedules,
+)
+from schedules.tasks import WEEKDAY_ORDER, build_weekly_review_schedules
+from schedules.utils import (
+    bump_schedule_version,
+    delete_schedules,
+    encode_sync_cursor,
+    resolve_tags,
+    tag_colors,
+)
+from users.models import StudyRoutine, User
+
+
+class ScheduleListQueryTest(TestCase):
+    """일정 조회 쿼리 수가 일정/태그 수와 관계없이 일정한지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tags = [
+            Tag.objects.create(name=f"tag{i}", user=self.user) for i in range(3)
+        ]
+        self.first = date.today() - timedelta(days=15)
+
+    def create_schedules(self, count):
+        # API를 거치지 않고 저장하므로 캐시된 조회 응답을 직접 비움
+        cache.clear()
+        schedules = Schedule.objects.bulk_create(
+            [
+                Schedule(
+                    title=f"일정{i}",
+                    scheduled_date=self.first + timedelta(days=i % 30),
+                    user=self.user,
+                )
+                for i in range(count)
+            ]
+        )
+        for schedule in schedules:
+            schedule.tag.set(self.tags[: schedule.id % 3 + 1])
+
+    def get_list(self, **params):
+        params.setdefault("first", self.first.isoformat())
+        params.setdefault("last", (self.first + timedelta(days=29)).isoformat())
+        return self.client.get("/schedules/list/", params)
+
+    def test_list_query_count_is_constant(self):
+        self.create_schedules(10)
+        with self.assertNumQueries(2):
+            response = self.get_list()
+        self.assertEqual(response.status_code, 200)
+
+        self.create_schedules(200)
+        with self.assertNumQueries(2):
+            response = self.get_list()
+        schedules = [
+            schedule
+            for items in response.data["schedules"].values()
+            for schedule in items
+        ]
+        self.assertEqual(len(schedules), 210)
+        self.assertTrue(all(schedule["tag"] for schedule in schedules))
+
+    def test_filtered_list_query_count(self):
+        self.create_schedules(50)
+        with self.assertNumQueries(2):
+            self.get_list(tag="tag2")
+        # 필터 결과가 없을 때만 기간 내 일정 존재 여부를 추가로 확인
+        with self.assertNumQueries(2):
+            response = self.get_list(title="없는 일정")
+        self.assertEqual(response.status_code, 200)
+
+    def test_empty_range(self):
+        with self.assertNumQueries(1):
+            response = self.get_list()
+        self.assertEqual(response.status_code, 204)
+
+
+class ScheduleSerializeRegressionTest(TestCase):
+    """serialize_schedules(.values) 결과가 기존 ScheduleSerializer 결과와 바이트 단위로 같은지"""
+
+    def setUp(self):
+        self.user = User.objects.create(email="render@test.com")
+        other = User.objects.create(email="render_other@test.com")
+        # 이름/생성 순서를 id 순서와 다르게 만들어 태그 정렬을 확인
+        zeta = Tag.objects.create(name="zeta", color="#ff0000", user=self.user)
+        alpha = Tag.objects.create(name="alpha", user=self.user)
+        mid = Tag.objects.create(name="mid", color="#00ff00", user=self.user)
+        today = date(2025, 1, 9)
+
+        first = Schedule.objects.create(
+            user=self.user,
+            title="두 태그",
+            content="내용",
+            scheduled_date=today,
+            deadline=today + timedelta(days=3),
+            order_num=2,
+        )
+        first.tag.add(mid, zeta)
+        second = Schedule.objects.create(
+            user=self.user, title="널 필드", scheduled_date=today, is_completed=True
+        )
+        second.tag.add(alpha)
+        Schedule.objects.create(
+            user=self.user, title="태그 없음", scheduled_date=today - timedelta(days=40)
+        )
+        third = Schedule.objects.create(user=self.user, title="날짜 없음", order_num=0)
+        third.tag.add(alpha, mid, zeta)
+        Schedule.objects.create(user=other, title="다른 사용자", scheduled_date=today)
+
+    def test_grouped_render_is_identical(self):
+        schedules = Schedule.objects.filter(user=self.user)
+        old = JSONRenderer().render(GroupedScheduleSerializer(schedules).data)
+        new = JSONRenderer().render(
+            group_schedules_by_date(
+                serialize_schedules(schedules.order_by("scheduled_date", "id"))
+            )
+        )
+        self.assertEqual(new, old)
+        self.assertIn(b'"deadline":null', new)
+        self.assertIn(b'"2025-01-12"', new)
+
+    def test_list_render_is_identical(self):
+        schedules = Schedule.objects.filter(user=self.user).order_by("-id")
+        old = JSONRenderer().render(
+            ScheduleSerializer(prefetch_tags(schedules), many=True).data
+        )
+        new = JSONRenderer().render(serialize_schedules(schedules))
+        self.assertEqual(new, old)
+
+    def test_empty_render_is_identical(self):
+        schedules = Schedule.objects.filter(user=self.user, title="없음")
+        self.assertEqual(
+            JSONRenderer().render(
+                group_schedules_by_date(serialize_schedules(schedules))
+            ),
+            JSONRenderer().render(GroupedScheduleSerializer(schedules).data),
+        )
+
+
+class ScheduleListCacheTest(TestCase):
+    """같은 기간 재조회는 캐시로 응답, 일정/태그가 바뀌면 새로 조회"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today().isoformat()
+
+    def get_list(self):
+        return self.client.get("/schedules/list/", {"first": self.today})
+
+    def create_schedule(self, title, tag):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/schedules/",
+                {"title": title, "scheduled_date": self.today, "tag": [tag]},
+                format="json",
+            )
+
+    def test_repeated_range_skips_database(self):
+        self.create_schedule("일정", "태그")
+        first = self.get_list()
+        with self.assertNumQueries(0):
+            second = self.get_list()
+        self.assertEqual(first.content, second.content)
+
+    def test_writes_invalidate_cache(self):
+        self.assertEqual(self.get_list().status_code, 204)
+        self.create_schedule("일정1", "태그")
+        response = self.get_list()
+        self.assertEqual(len(response.data["schedules"][self.today]), 1)
+        self.assertEqual(
+            response.data["schedules"][self.today][0]["tag"][0]["name"], "태그"
+        )
+
+        tag = Tag.objects.get(user=self.user, name="태그")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/schedules/tags/{tag.id}/", {"name": "새 태그"})
+        response = self.get_list()
+        self.assertEqual(
+            response.data["schedules"][self.today][0]["tag"][0]["name"], "새 태그"
+        )
+
+        schedule_id = response.data["schedules"][self.today][0]["id"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/schedules/{schedule_id}/")
+        self.assertEqual(self.get_list().status_code, 204)
+
+    def test_other_users_are_not_invalidated(self):
+        other = User.objects.create(email="other@test.com")
+        self.create_schedule("일정", "태그")
+        self.get_list()
+        with self.captureOnCommitCallbacks(execute=True):
+            Schedule.objects.create(title="다른 사용자", user=other)
+            bump_schedule_version(other.id)
+        with self.assertNumQueries(0):
+            self.get_list()
+
+
+class ScheduleQueryPlanTest(TestCase):
+    """주요 일정 쿼리가 인덱스를 타는지 EXPLAIN으로 확인 (전체 테이블 스캔이면 실패)"""
+
+    # DB별 전체 테이블 스캔 표시
+    FULL_SCAN_PATTERNS = {
+        "sqlite": r"\bSCAN\b",
+        "mysql": r"\bALL\b",
+        "postgresql": r"Seq Scan",
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = date.today()
+        users = [User.objects.create(email=f"plan{i}@test.com") for i in range(20)]
+        cls.user = users[0]
+        tags = {
+            user.id: [
+                Tag.objects.create(name=f"tag{i}", user=user) for i in range(10)
+            ]
+            for user in users
+        }
+        schedules = Schedule.objects.bulk_create(
+            [
+                Schedule(
+                    title=f"일정{i}",
+                    scheduled_date=cls.today + timedelta(days=i % 60 - 30),
+                    deadline=cls.today + timedelta(days=i % 45 - 15),
+                    is_completed=i % 3 == 0,
+                    user=users[i % len(users)],
+                )
+                for i in range(2000)
+            ]
+        )
+        Schedule.tag.through.objects.bulk_create(
+            [
+                Schedule.tag.through(schedule_id=schedule.id, tag_id=tag.id)
+                for schedule in schedules
+                for tag in tags[schedule.user_id][: schedule.id % 3 + 1]
+            ]
+        )
+        # 통계 정보를 갱신해 실제 데이터 분포로 실행 계획을 세우도록
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertNoFullScan(self, queryset):
+        pattern = self.FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            self.skipTest(f"{connection.vendor}의 실행 계획 형식은 확인하지 않음")
+        plan = queryset.explain()
+        self.assertIsNone(
+            re.search(pattern, plan),
+            f"전체 테이블 스캔 발생:\n{queryset.query}\n{plan}",
+        )
+
+    def test_user_date_range(self):
+        self.assertNoFullScan(
+            Schedule.objects.filter(
+                user=self.user,
+                scheduled_date__range=[self.today, self.today + timedelta(days=30)],
+            ).order_by("scheduled_date", "id")
+        )
+
+    def test_user_single_date(self):
+        self.assertNoFullScan(
+            Schedule.objects.filter(user=self.user, scheduled_date=self.today)
+        )
+
+    def test_user_date_range_with_tag(self):
+        self.assertNoFullScan(
+            Schedule.objects.filter(
+                user=self.user,
+                scheduled_date__range=[self.today, self.today + timedelta(days=30)],
+                tag__user=self.user,
+                tag__name="tag1",
+            )
+        )
+
+    def test_schedule_tags(self):
+        schedules = Schedule.objects.filter(user=self.user, scheduled_date=self.today)
+        self.assertNoFullScan(
+            Schedule.tag.through.objects.filter(
+                schedule_id__in=schedules.values("id")
+            )
+        )
+        get_schedule_tags(schedules)
+
+    def test_today_notification(self):
+        self.assertNoFullScan(
+            Schedule.objects.filter(scheduled_date=self.today, is_completed=False)
+            .values_list("user_id", "title")
+            .distinct()
+        )
+
+    def test_deadline_notification(self):
+        self.assertNoFullScan(
+            Schedule.objects.filter(
+                deadline=self.today + timedelta(days=1), is_completed=False
+            ).values("user_id", "title")
+        )
+
+
+class ScheduleETagTest(TestCase):
+    """바뀌지 않은 목록 조회는 ETag로 304 응답"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today().isoformat()
+        Schedule.objects.create(
+            title="일정", scheduled_date=date.today(), user=self.user
+        )
+
+    def assertNotModified(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        return etag
+
+    def test_schedule_list(self):
+        etag = self.assertNotModified("/schedules/list/", {"first": self.today})
+        other = self.client.get(
+            "/schedules/list/", {"first": self.today, "title": "일정"}
+        )
+        self.assertNotEqual(other["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/schedules/",
+                {"title": "새 일정", "scheduled_date": self.today},
+                format="json",
+            )
+        response = self.client.get(
+            "/schedules/list/", {"first": self.today}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["schedules"][self.today]), 2)
+
+    def test_tags(self):
+        etag = self.assertNotModified("/schedules/tags/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/schedules/tags/", {"name": "태그"})
+        response = self.client.get("/schedules/tags/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_timetables(self):
+        etag = self.assertNotModified("/schedules/timetables/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/schedules/timetables/",
+                {
+                    "subject": "과목",
+                    "day_of_week": "mon",
+                    "start_time": "09:00",
+                    "end_time": "10:00",
+                },
+            )
+        response = self.client.get("/schedules/timetables/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+
+@mock.patch("schedules.utils.SYNC_SETTLE_SECONDS", 0)
+class ScheduleSyncTest(TestCase):
+    """커서 이후 변경분(생성/수정/삭제)만 전달"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tag = Tag.objects.create(name="태그", user=self.user)
+        for i in range(5):
+            schedule = Schedule.objects.create(
+                title=f"일정{i}", scheduled_date=date.today(), user=self.user
+            )
+            schedule.tag.set([self.tag])
+        TimeTable.objects.create(subject="과목", day_of_week="mon", user=self.user)
+        other = User.objects.create(email="other@test.com")
+        Schedule.objects.create(title="다른 사용자", user=other)
+
+    def sync(self, cursor=None, limit=None):
+        params = {}
+        if cursor:
+            params["cursor"] = cursor
+        if limit:
+            params["limit"] = limit
+        response = self.client.get("/schedules/sync/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def sync_all(self, cursor=None, limit=None):
+        pages = []
+        while True:
+            data = self.sync(cursor, limit)
+            pages.append(data)
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                return pages, cursor
+
+    def test_initial_load_is_paginated(self):
+        pages, _ = self.sync_all(limit=2)
+        schedules = [item for page in pages for item in page["schedules"]]
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(len(schedules), 5)
+        self.assertEqual(len({item["id"] for item in schedules}), 5)
+        self.assertEqual(schedules[0]["tag"], [self.tag.id])
+        self.assertEqual(len(pages[0]["tags"]), 1)
+        self.assertEqual(len(pages[0]["timetables"]), 1)
+
+    def test_only_changes_since_cursor(self):
+        _, cursor = self.sync_all()
+        data = self.sync(cursor)
+        self.assertEqual(
+            (data["schedules"], data["tags"], data["timetables"], data["deleted"]),
+            ([], [], [], []),
+        )
+
+        schedule = Schedule.objects.filter(user=self.user).first()
+        self.client.put(
+            f"/schedules/{schedule.id}/",
+            {"title": "수정", "scheduled_date": date.today().isoformat()},
+            format="json",
+        )
+        deleted = Schedule.objects.filter(user=self.user).last()
+        self.client.delete(f"/schedules/{deleted.id}/")
+        self.client.delete(f"/schedules/tags/{self.tag.id}/")
+
+        data = self.sync(cursor)
+        self.assertEqual([item["title"] for item in data["schedules"]], ["수정"])
+        self.assertEqual(
+            data["deleted"],
+            [{"kind": "schedule", "id": deleted.id}, {"kind": "tag", "id": self.tag.id}],
+        )
+        self.assertEqual(self.sync(data["cursor"])["deleted"], [])
+
+    def test_tag_renamed_by_chatbot(self):
+        _, cursor = self.sync_all()
+        core_agent.update_tag(self.user.id, self.tag.id, "새 이름")
+
+        data = self.sync(cursor)
+        self.assertEqual(
+            [(item["id"], item["name"]) for item in data["tags"]],
+            [(self.tag.id, "새 이름")],
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/schedules/sync/", {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_expired_cursor(self):
+        old = (timezone.now() - timedelta(days=365), 0)
+        cursor = encode_sync_cursor(
+            dict.fromkeys(["schedule", "tag", "timetable", "deleted"], old)
+        )
+        response = self.client.get("/schedules/sync/", {"cursor": cursor})
+        self.assertEqual(response.status_code, 410)
+
+
+class ScheduleListPaginationTest(TestCase):
+    """태그/시간표 커서 페이지네이션, 일정 조회 기간 제한"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Tag.objects.bulk_create(
+            [Tag(name=f"태그{i}", user=self.user) for i in range(25)]
+        )
+
+    def test_tags_without_cursor_return_full_list(self):
+        response = self.client.get("/schedules/tags/")
+        self.assertEqual(len(response.data), 25)
+
+    def test_tags_cursor_pages(self):
+        names = []
+        url = "/schedules/tags/?page_size=10"
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data["results"]), 10)
+            names += [tag["name"] for tag in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(names, [f"태그{i}" for i in range(25)])
+
+    def test_schedule_list_range_cap(self):
+        first = date.today()
+        response = self.client.get(
+            "/schedules/list/",
+            {
+                "first": first.isoformat(),
+                "last": (first + timedelta(days=400)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ResolveTagsTest(TestCase):
+    """태그 이름 수와 관계없이 일정한 쿼리 수로 조회/생성"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        Tag.objects.create(name="기존", user=self.user, color=tag_colors[0])
+
+    def test_constant_queries(self):
+        names = ["기존"] + [f"새 태그{i}" for i in range(30)] + ["기존"]
+        with self.assertNumQueries(3):
+            tags = resolve_tags(self.user, names)
+        self.assertEqual([tag.name for tag in tags], list(dict.fromkeys(names)))
+        self.assertTrue(all(tag.id for tag in tags))
+        self.assertEqual(tags[1].color, tag_colors[1])
+        self.assertEqual(tags[2].color, tag_colors[2])
+
+        with self.assertNumQueries(1):
+            resolve_tags(self.user, names)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 31)
+
+    def test_bulk_create_with_tags(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        today = date.today().isoformat()
+        response = client.post(
+            "/schedules/bulk/",
+            [
+                {"title": "일정1", "scheduled_date": today, "tag": ["기존", "새 태그"]},
+                {"title": "일정2", "scheduled_date": today},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [tag["name"] for tag in response.data[0]["tag"]], ["기존", "새 태그"]
+        )
+        self.assertEqual(response.data[1]["tag"], [])
+
+
+class ScheduleImportTest(TestCase):
+    """태그 포함 대량 가져오기, 잘못된 항목만 건너뜀"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today().isoformat()
+
+    def test_import_with_tags_and_errors(self):
+        items = [
+            {"title": f"일정{i}", "scheduled_date": self.today, "tag": [f"태그{i % 3}"]}
+            for i in range(1200)
+        ]
+        items[5] = {"title": "날짜 없음"}
+        items[700] = {"title": "x" * 31, "scheduled_date": self.today}
+        response = self.client.post("/schedules/import/", items, format="json")
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["created"], 1198)
+        self.assertEqual([e["index"] for e in response.data["errors"]], [5, 700])
+        self.assertIn("scheduled_date", response.data["errors"][0]["errors"])
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(
+            Schedule.tag.through.objects.filter(
+                schedule__user=self.user, tag__name="태그0"
+            ).count(),
+            400,
+        )
+        schedule = Schedule.objects.get(id=response.data["ids"][0])
+        self.assertEqual(schedule.title, "일정0")
+        self.assertEqual(
+            self.user.schedule_daily_count.get(date=self.today).total, 1198
+        )
+
+    def test_all_invalid(self):
+        response = self.client.post(
+            "/schedules/import/", [{"title": 1}], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+
+    def test_query_count_does_not_grow_per_item(self):
+        def count_queries(n):
+            items = [
+                {"title": f"일정{i}", "scheduled_date": self.today, "tag": [f"태그{n}"]}
+                for i in range(n)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post("/schedules/import/", items, format="json")
+            return len(queries)
+
+        self.assertEqual(count_queries(20), count_queries(400))
+
+    def test_ids_without_returning_rows(self):
+        # 생성된 id를 돌려주지 않는 DB(MySQL)에서도 같은 날짜의 같은 제목을 입력 순서대로 구분
+        items = [
+            {"title": "같은 제목", "scheduled_date": self.today, "tag": [name]}
+            for name in ["가", "나", "다"]
+        ]
+        with mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            response = self.client.post("/schedules/import/", items, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [
+                Schedule.objects.get(id=schedule_id).tag.get().name
+                for schedule_id in response.data["ids"]
+            ],
+            ["가", "나", "다"],
+        )
+
+
+class ScheduleBulkPatchTest(TestCase):
+    """완료 여부, 순서, 날짜 일괄 수정"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today()
+        self.schedules = [
+            Schedule.objects.create(
+                title=f"일정{i}", scheduled_date=self.today, order_num=i, user=self.user
+            )
+            for i in range(50)
+        ]
+        ScheduleDailyCount.objects.create(user=self.user, date=self.today, total=50)
+        other = User.objects.create(email="other@test.com")
+        self.other_schedule = Schedule.objects.create(title="남의 일정", user=other)
+
+    def test_patch_many(self):
+        tomorrow = self.today + timedelta(days=1)
+        items = [
+            {"id": schedule.id, "is_completed": True, "order_num": 50 - i}
+            for i, schedule in enumerate(self.schedules)
+        ]
+        items[0] = {"id": self.schedules[0].id, "scheduled_date": tomorrow.isoformat()}
+        items[1] = {"id": self.schedules[1].id, "order_num": 1}  # 변경 없음
+
+        # 조회 1번 + bulk_update 1번 + 날짜별 일정 수 (날짜 2개) + savepoint
+        with self.assertNumQueries(11):
+            response = self.client.patch("/schedules/bulk/", items, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["updated"]), 49)
+        self.assertEqual(
+            response.data["updated"][0],
+            {"id": self.schedules[0].id, "scheduled_date": tomorrow.isoformat()},
+        )
+        self.assertEqual(
+            response.data["updated"][1],
+            {"id": self.schedules[2].id, "is_completed": True, "order_num": 48},
+        )
+
+        counts = {
+            count.date: (count.total, count.completed)
+            for count in ScheduleDailyCount.objects.filter(user=self.user)
+        }
+        self.assertEqual(counts, {self.today: (49, 48), tomorrow: (1, 0)})
+        self.assertEqual(
+            Schedule.objects.get(id=self.schedules[3].id).order_num, 47
+        )
+
+    def test_errors_do_not_abort(self):
+        response = self.client.patch(
+            "/schedules/bulk/",
+            [
+                {"id": self.schedules[0].id, "is_completed": True},
+                {"id": self.other_schedule.id, "is_completed": True},
+                {"id": self.schedules[1].id, "order_num": "첫번째"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([e["index"] for e in response.data["errors"]], [1, 2])
+        self.assertTrue(Schedule.objects.get(id=self.schedules[0].id).is_completed)
+        self.other_schedule.refresh_from_db()
+        self.assertFalse(self.other_schedule.is_completed)
+
+
+class ScheduleDailyCountTest(TestCase):
+    """날짜별 일정 수 (점수 계산에 사용) 가 일정 생성/수정/삭제와 일치하는지"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="test@test.com")
+        self.today = date.today()
+
+    def counts(self):
+        return {
+            count.date: (count.total, count.completed)
+            for count in ScheduleDailyCount.objects.filter(user=self.user)
+        }
+
+    def create(self, **fields):
+        serializer = ScheduleSerializer(
+            data={"title": "일정", "scheduled_date": self.today, **fields},
+            context={"request": {"user": self.user}},
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(user=self.user)
+
+    def update(self, instance, **fields):
+        serializer = ScheduleSerializer(instance, data=fields, partial=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_update_with_stale_instance(self):
+        schedule = self.create()
+        stale = Schedule.objects.get(id=schedule.id)
+        self.update(schedule, is_completed=True)
+
+        # 이미 완료된 일정을 오래된 인스턴스로 다시 완료 처리해도 한 번만 집계
+        self.update(stale, is_completed=True)
+        self.assertEqual(self.counts(), {self.today: (1, 1)})
+
+    def test_delete_twice(self):
+        schedule = self.create(is_completed=True)
+        first = Schedule.objects.filter(id=schedule.id)
+        second = Schedule.objects.filter(id=schedule.id)
+        self.assertEqual(delete_schedules(first), 1)
+        self.assertEqual(delete_schedules(second), 0)
+        self.assertEqual(self.counts(), {self.today: (0, 0)})
+
+    def assert_counts_match_schedules(self):
+        # 증감으로 갱신한 값이 일정 테이블에서 다시 센 값과 같은지
+        expected = {}
+        for scheduled_date, is_completed in Schedule.objects.filter(
+            user=self.user
+        ).values_list("scheduled_date", "is_completed"):
+            total, completed = expected.get(scheduled_date, (0, 0))
+            expected[scheduled_date] = (total + 1, completed + is_completed)
+        counts = {day: count for day, count in self.counts().items() if count[0]}
+        self.assertEqual(counts, expected)
+
+    def test_views(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        day, next_day = date(2026, 10, 10), date(2026, 10, 11)
+
+        response = client.post(
+            "/schedules/",
+            {"title": "a", "scheduled_date": day.isoformat(), "tag": ["x"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        schedule_id = response.data["id"]
+        response = client.post(
+            "/schedules/bulk/",
+            [
+                {"title": "b", "scheduled_date": day.isoformat(), "is_completed": True},
+                {"title": "c", "scheduled_date": next_day.isoformat()},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.counts(), {day: (2, 1), next_day: (1, 0)})
+
+        # 날짜 이동 + 완료
+        response = client.put(
+            f"/schedules/{schedule_id}/",
+            {
+                "title": "a",
+                "scheduled_date": next_day.isoformat(),
+                "is_completed": True,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counts(), {day: (1, 1), next_day: (2, 1)})
+
+        # 완료 취소
+        response = client.put(
+            f"/schedules/{schedule_id}/",
+            {
+                "title": "a",
+                "scheduled_date": next_day.isoformat(),
+                "is_completed": False,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counts(), {day: (1, 1), next_day: (2, 0)})
+        self.assert_counts_match_schedules()
+
+        client.delete(f"/schedules/{schedule_id}/")
+        self.assertEqual(self.counts(), {day: (1, 1), next_day: (1, 0)})
+        ids = list(Schedule.objects.values_list("id", flat=True))
+        client.delete("/schedules/", {"ids": ids}, format="json")
+        self.assertEqual(self.counts(), {day: (0, 0), next_day: (0, 0)})
+
+    def test_chatbot(self):
+        day, moved = date(2026, 10, 10), date(2026, 10, 12)
+        result = core_agent.create_schedule(
+            self.user.id, "일정", day.isoformat(), tags=["a"]
+        )
+        schedule_id = result["data"]["id"]
+        core_agent.create_schedule(self.user.id, "일정2", day.isoformat())
+        self.assertEqual(self.counts(), {day: (2, 0)})
+
+        core_agent.update_schedule(
+            self.user.id,
+            schedule_id,
+            scheduled_date=moved.isoformat(),
+            is_completed=True,
+        )
+        self.assertEqual(self.counts(), {day: (1, 0), moved: (1, 1)})
+        self.assert_counts_match_schedules()
+
+        core_agent.delete_schedules(schedule_id)
+        self.assertEqual(self.counts(), {day: (1, 0), moved: (0, 0)})
+
+    def test_weekly_review_rerun(self):
+        # 복습 일정은 충돌을 무시하고 저장하므로 해당 날짜를 다시 집계
+        monday = date(2026, 10, 12)
+        week = {
+            code: monday + timedelta(days=i) for i, code in enumerate(WEEKDAY_ORDER)
+        }
+        StudyRoutine.objects.create(user=self.user, review_type="MON WED")
+        core_agent.create_schedule(
+            self.user.id, "일정", monday.isoformat(), is_completed=True
+        )
+
+        build_weekly_review_schedules(week)
+        build_weekly_review_schedules(week)
+        self.assertEqual(self.counts(), {monday: (3, 1), week["WED"]: (2, 0)})
+        self.assert_counts_match_schedules()
+
+
+class WeeklyReviewScheduleTest(TestCase):
+    """주간 복습 일정 일괄 생성 결과와 쿼리 수"""
+
+    def setUp(self):
+        self.monday = date(2026, 10, 12)
+        self.week = {
+            code: self.monday + timedelta(days=i)
+            for i, code in enumerate(WEEKDAY_ORDER)
+        }
+
+    def create_user(self, email, review_type, timetables=()):
+        user = User.objects.create(email=email)
+        StudyRoutine.objects.create(user=user, review_type=review_type)
+        for subject, day_of_week in timetables:
+            TimeTable.objects.create(
+                user=user, subject=subject, day_of_week=day_of_week
+            )
+        return user
+
+    def reviews(self, user):
+        return sorted(
+            Schedule.objects.filter(user=user).values_list("title", "scheduled_date")
+        )
+
+    def test_sameday_and_custom_days(self):
+        sameday = self.create_user(
+            "a@test.com", "SAMEDAY", [("수학", "mon"), ("수학", "mon"), ("영어", "tue")]
+        )
+        custom = self.create_user("b@test.com", "MON WED")
+
+        result = build_weekly_review_schedules(self.week)
+        self.assertEqual((result["users"], result["planned"]), (2, 7))
+
+        # 같은 날 같은 과목은 하나만
+        self.assertEqual(
+            self.reviews(sameday),
+            [("수학 복습", self.week["MON"]), ("영어 복습", self.week["TUE"])],
+        )
+        # 시간표가 없으면 복습1~4를 지정한 요일에 나눠 배치
+        reviews = self.reviews(custom)
+        self.assertEqual(
+            sorted(title for title, _ in reviews),
+            [f"복습{i} 복습" for i in range(1, 5)],
+        )
+        self.assertEqual(
+            sorted(day for _, day in reviews),
+            [self.week["MON"]] * 2 + [self.week["WED"]] * 2,
+        )
+
+    def test_same_plan_for_same_week(self):
+        timetables = [(f"과목{i}", "mon") for i in range(6)]
+        user = self.create_user("a@test.com", "MON WED FRI", timetables)
+        build_weekly_review_schedules(self.week)
+        first = self.reviews(user)
+
+        Schedule.objects.all().delete()
+        build_weekly_review_schedules(self.week)
+        self.assertEqual(self.reviews(user), first)
+
+    def test_query_count_does_not_grow_per_user(self):
+        for i in range(2):
+            self.create_user(f"{i}@test.com", "SAMEDAY", [("수학", "mon")])
+        with CaptureQueriesContext(connection) as few:
+            build_weekly_review_schedules(self.week)
+
+        Schedule.objects.all().delete()
+        for i in range(2, 30):
+            self.create_user(f"{i}@test.com", "SAMEDAY", [("수학", "mon")])
+        with CaptureQueriesContext(connection) as many:
+            build_weekly_review_schedules(self.week)
+        self.assertEqual(Schedule.objects.count(), 30)
+        self.assertEqual(len(many), len(few))
+
+
+class WeeklyReviewShardTest(TestCase):
+    """사용자 id 범위 shard로 나눠 생성해도 전체 실행과 같은 결과"""
+
+    def setUp(self):
+        self.users = [User.objects.create(email=f"{i}@test.com") for i in range(5)]
+        for user in self.users[:4]:
+            StudyRoutine.objects.create(user=user, review_type="MON")
+        # 루틴이 여러 개여도 사용자는 한 번만
+        StudyRoutine.objects.create(user=self.users[0], review_type="TUE")
+        StudyRoutine.objects.create(user=self.users[4], review_type="")
+        monday = date(2026, 10, 12)
+        self.week = {
+            code: (monday + timedelta(days=i)).isoformat()
+            for i, code in enumerate(WEEKDAY_ORDER)
+        }
+
+    def test_shards(self):
+        ids = [user.id for user in self.users]
+        shards = tasks.get_review_user_shards(shard_size=3)
+        self.assertEqual(shards, [(ids[0], ids[2]), (ids[3], ids[3])])
+
+        results = [
+            tasks.generate_weekly_review_schedules_shard.apply(
+                args=(self.week, first_id, last_id)
+            ).get()
+            for first_id, last_id in shards
+        ]
+        self.assertEqual([result["users"] for result in results], [3, 1])
+        summary = tasks.summarize_weekly_review_schedules(results)
+        self.assertEqual(
+            {key: summary[key] for key in ("shards", "users", "planned", "submitted")},
+            {"shards": 2, "users": 4, "planned": 16, "submitted": 16},
+        )
+        self.assertEqual(Schedule.objects.count(), 16)
+        self.assertFalse(Schedule.objects.filter(user=self.users[4]).exists())
+
+    def test_dispatch_one_task_per_shard(self):
+        shards = [
+            (self.users[0].id, self.users[1].id),
+            (self.users[2].id, self.users[3].id),
+        ]
+        with mock.patch.object(
+            tasks, "get_review_user_shards", return_value=shards
+        ), mock.patch.object(tasks, "chord") as chord:
+            self.assertEqual(tasks.generate_weekly_review_schedules(), 2)
+        header = list(chord.call_args.args[0])
+        self.assertEqual([tuple(signature.args[1:]) for signature in header], shards)
+        chord.return_value.assert_called_once()
+
+
+class WeeklyReviewIdempotencyTest(TestCase):
+    """같은 주에 다시 실행하거나 shard가 겹쳐도 복습 일정이 중복되지 않는지"""
+
+    def setUp(self):
+        monday = date(2026, 10, 12)
+        self.week = {
+            code: monday + timedelta(days=i) for i, code in enumerate(WEEKDAY_ORDER)
+        }
+        self.users = [User.objects.create(email=f"{i}@test.com") for i in range(3)]
+        for user in self.users:
+            StudyRoutine.objects.create(user=user, review_type="MON WED")
+            TimeTable.objects.create(user=user, subject="수학", day_of_week="mon")
+            TimeTable.objects.create(user=user, subject="영어", day_of_week="tue")
+            TimeTable.objects.create(user=user, subject="과학", day_of_week="wed")
+
+    def snapshot(self):
+        return sorted(
+            Schedule.objects.values_list(
+                "user_id", "title", "scheduled_date", "review_key"
+            )
+        )
+
+    def test_rerun_is_noop(self):
+        build_weekly_review_schedules(self.week)
+        first = self.snapshot()
+        self.assertEqual(len(first), 9)
+
+        result = build_weekly_review_schedules(self.week)
+        self.assertEqual((result["skipped"], result["submitted"]), (9, 0))
+        self.assertEqual(self.snapshot(), first)
+
+    def test_overlapping_shards(self):
+        ids = [user.id for user in self.users]
+        build_weekly_review_schedules(self.week, ids[0], ids[1])
+        build_weekly_review_schedules(self.week, ids[1], ids[2])
+        build_weekly_review_schedules(self.week)
+        self.assertEqual(Schedule.objects.count(), 9)
+
+    def test_completed_review_is_kept(self):
+        build_weekly_review_schedules(self.week)
+        review = Schedule.objects.filter(user=self.users[0]).first()
+        review.is_completed = True
+        review.save()
+
+        build_weekly_review_schedules(self.week)
+        review.refresh_from_db()
+        self.assertTrue(review.is_completed)
+        self.assertEqual(Schedule.objects.count(), 9)
+
+    def test_manual_schedule_with_same_title(self):
+        # 같은 제목/날짜의 일정을 직접 만들어 두었으면 복습 일정을 따로 만들지 않음
+        user = User.objects.create(email="sameday@test.com")
+        StudyRoutine.objects.create(user=user, review_type="SAMEDAY")
+        TimeTable.objects.create(user=user, subject="수학", day_of_week="mon")
+        manual = Schedule.objects.create(
+            user=user, title="수학 복습", scheduled_date=self.week["MON"]
+        )
+
+        result = build_weekly_review_schedules(self.week)
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(
+            list(Schedule.objects.filter(user=user).values_list("id", "review_key")),
+            [(manual.id, None)],
+        )
 
-# Create your tests here.
+    def test_unique_review_key(self):
+        build_weekly_review_schedules(self.week)
+        review = Schedule.objects.filter(user=self.users[0]).first()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Schedule.objects.create(
+                user=self.users[0], title=review.title, review_key=review.review_key
+            )
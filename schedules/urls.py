@@ -10,7 +10,9 @@ urlpatterns = [
     path("", views.ScheduleCreateAPIView.as_view()),
     path("<int:schedule_id>/", views.ScheduleRetrieveUpdateDestroyAPIView.as_view()),
     path("bulk/", views.ScheduleBulkCreateAPIView.as_view()),
+    path("import/", views.schedules_import_api_view),
     path("list/", views.schedules_list_api_view),
+    path("sync/", views.schedules_sync_api_view),
     # TimeTable
     path("timetables/", views.TimeTableListCreateAPIView.as_view()),
     path(
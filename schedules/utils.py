@@ -0,0 +1,688 @@
+import base64
+import json
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from schedules.models import (
+    Schedule,
+    ScheduleDailyCount,
+    SyncTombstone,
+    Tag,
+    TimeTable,
+)
+
+
+def bulk_upsert(model, objs, unique_fields, update_fields, batch_size=1000):
+    """
+    unique 제약 충돌 시 update_fields를 덮어쓰는 bulk_create
+    MySQL은 충돌 대상 컬럼을 지정할 수 없으므로 unique_fields 생략
+    """
+    if not connection.features.supports_update_conflicts_with_target:
+        unique_fields = None
+    return model.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+tag_colors = [
+    "#CFE6D6",
+    "#FFEDA4",
+    "#FDD0EB",
+    "#E0CFE6",
+    "#BDC49E",
+    "#F7D5AB",
+    "#C3E1FF",
+    "#D9D4C1",
+    "#F5CDCD",
+]
+
+
+# ------------------------------- 일정 캐시 버전 ------------------------------- #
+SCHEDULE_VERSION_KEY = "schedules:version:{user_id}"
+
+
+def get_schedule_version(user_id):
+    """사용자 일정/태그/시간표가 바뀔 때마다 달라지는 값, 조회 응답 캐시 키와 ETag에 사용"""
+    key = SCHEDULE_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_schedule_version(*user_ids):
+    """
+    사용자별 일정 캐시 무효화 (이전 버전 키는 timeout으로 만료)
+    트랜잭션 안이면 커밋 후에 반영해, 커밋 전 데이터가 새 버전으로 캐시되지 않도록
+    """
+    keys = [
+        SCHEDULE_VERSION_KEY.format(user_id=user_id)
+        for user_id in set(user_ids)
+        if user_id is not None
+    ]
+    if keys:
+        transaction.on_commit(
+            lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), timeout=None)
+        )
+
+
+# ------------------------------- 태그 ------------------------------- #
+def resolve_tags(user, names):
+    """
+    태그 이름 목록 -> Tag 목록 (이름 순서 유지, 중복 제거), 없는 태그는 색상을 정해 생성
+    이름 수와 관계없이 조회 1번 + (새 태그가 있으면) 개수 1번, 일괄 생성 1번
+    """
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        return []
+
+    tags = {tag.name: tag for tag in Tag.objects.filter(user=user, name__in=names)}
+    new_names = [name for name in names if name not in tags]
+    if new_names:
+        # 새 태그 색상은 기존 태그 수 다음 순서부터
+        order = Tag.objects.filter(user=user).count()
+        created = Tag.objects.bulk_create(
+            [
+                Tag(
+                    name=name,
+                    user=user,
+                    color=tag_colors[(order + index) % len(tag_colors)],
+                )
+                for index, name in enumerate(new_names)
+            ]
+        )
+        if created and created[0].pk is None:
+            # 생성된 id를 돌려주지 않는 DB(MySQL)는 다시 조회
+            created = Tag.objects.filter(user=user, name__in=new_names)
+        tags.update((tag.name, tag) for tag in created)
+        bump_schedule_version(user.id)
+
+    return [tags[name] for name in names]
+
+
+def set_schedule_tags(user, schedule_tags):
+    """
+    (일정, 태그 이름 목록) 목록의 태그를 한 번에 연결 (기존 연결은 교체)
+    일정은 id가 있어야 함
+    """
+    schedule_tags = [(schedule, names or []) for schedule, names in schedule_tags]
+    if not schedule_tags:
+        return
+    tags = {
+        tag.name: tag
+        for tag in resolve_tags(
+            user, [name for _, names in schedule_tags for name in names]
+        )
+    }
+    through = Schedule.tag.through
+    through.objects.filter(
+        schedule_id__in=[schedule.id for schedule, _ in schedule_tags]
+    ).delete()
+    through.objects.bulk_create(
+        [
+            through(schedule_id=schedule.id, tag_id=tags[name].id)
+            for schedule, names in schedule_tags
+            for name in dict.fromkeys(name for name in names if name)
+        ],
+        batch_size=1000,
+    )
+    bump_schedule_version(user.id)
+
+
+# ------------------------------- 삭제 기록 ------------------------------- #
+def record_deletions(kind, rows):
+    """삭제한 (user_id, id) 목록을 변경분 동기화용 삭제 기록으로 저장"""
+    SyncTombstone.objects.bulk_create(
+        [
+            SyncTombstone(user_id=user_id, kind=kind, object_id=object_id)
+            for user_id, object_id in rows
+            if user_id is not None
+        ],
+        batch_size=1000,
+    )
+
+
+def delete_with_tombstones(kind, queryset):
+    """queryset 삭제 + 삭제 기록 저장 (태그, 시간표), 삭제한 개수 반환"""
+    with transaction.atomic():
+        rows = list(queryset.values_list("user_id", "id"))
+        queryset.filter(id__in=[object_id for _, object_id in rows]).delete()
+        record_deletions(kind, rows)
+    return len(rows)
+
+
+# ------------------------------- 날짜별 일정 수 ------------------------------- #
+def get_schedule_state(schedule):
+    """날짜별 일정 수 계산에 필요한 (user_id, 날짜, 완료 여부)"""
+    scheduled_date = schedule.scheduled_date
+    if isinstance(scheduled_date, str):
+        scheduled_date = date.fromisoformat(scheduled_date)
+    return schedule.user_id, scheduled_date, bool(schedule.is_completed)
+
+
+def _add_state(deltas, state, sign):
+    user_id, scheduled_date, is_completed = state
+    if user_id is None or scheduled_date is None:
+        return
+    delta = deltas[(user_id, scheduled_date)]
+    delta[0] += sign
+    if is_completed:
+        delta[1] += sign
+
+
+def apply_schedule_count_deltas(deltas):
+    """
+    (user_id, 날짜) -> [전체 증감, 완료 증감] 을 날짜별 일정 수에 반영
+    일정 생성/삭제가 모두 거쳐가므로 일정 캐시 버전도 함께 갱신
+    """
+    bump_schedule_version(*(user_id for user_id, _ in deltas))
+    with transaction.atomic():
+        for (user_id, scheduled_date), (total, completed) in deltas.items():
+            if not total and not completed:
+                continue
+            counts = ScheduleDailyCount.objects.filter(
+                user_id=user_id, date=scheduled_date
+            )
+            changes = {
+                "total": F("total") + total,
+                "completed": F("completed") + completed,
+            }
+            if counts.update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    ScheduleDailyCount.objects.create(
+                        user_id=user_id,
+                        date=scheduled_date,
+                        total=total,
+                        completed=completed,
+                    )
+            except IntegrityError:
+                # 동시에 다른 요청이 먼저 생성한 경우
+                counts.update(**changes)
+
+
+def count_schedules_created(schedules):
+    deltas = defaultdict(lambda: [0, 0])
+    for schedule in schedules:
+        _add_state(deltas, get_schedule_state(schedule), 1)
+    apply_schedule_count_deltas(deltas)
+
+
+def count_schedules_deleted(states):
+    """삭제 전 (user_id, 날짜, 완료 여부) 목록을 받아 반영"""
+    deltas = defaultdict(lambda: [0, 0])
+    for state in states:
+        _add_state(deltas, state, -1)
+    apply_schedule_count_deltas(deltas)
+
+
+def count_schedule_changed(before, schedule):
+    """수정 전 상태와 수정된 일정을 비교해 날짜 이동, 완료 여부 변경 반영"""
+    count_schedules_changed([(before, schedule)])
+
+
+def count_schedules_changed(changes):
+    """(수정 전 상태, 수정된 일정) 목록을 한 번에 반영"""
+    bump_schedule_version(*(schedule.user_id for _, schedule in changes))
+    deltas = defaultdict(lambda: [0, 0])
+    for before, schedule in changes:
+        after = get_schedule_state(schedule)
+        if before == after:
+            continue
+        _add_state(deltas, before, -1)
+        _add_state(deltas, after, 1)
+    if deltas:
+        apply_schedule_count_deltas(deltas)
+
+
+def delete_schedules(schedules):
+    """일정 queryset 삭제 + 날짜별 일정 수, 삭제 기록 반영"""
+    ids = list(schedules.values_list("id", flat=True))
+    with transaction.atomic():
+        # 행을 잠가 동시에 같은 일정을 삭제해도 실제로 삭제한 행만 집계
+        rows = list(
+            Schedule.objects.select_for_update()
+            .filter(id__in=ids)
+            .values_list("id", "user_id", "scheduled_date", "is_completed")
+        )
+        Schedule.objects.filter(id__in=[row[0] for row in rows]).delete()
+        count_schedules_deleted([row[1:] for row in rows])
+        record_deletions("schedule", [(row[1], row[0]) for row in rows])
+    return len(rows)
+
+
+def refresh_schedule_counts(user_ids, dates):
+    """
+    대량 저장(ignore_conflicts 등)으로 증감을 알 수 없을 때
+    해당 사용자/날짜의 일정 수를 일정 테이블에서 다시 집계
+    """
+    if not user_ids or not dates:
+        return
+    bump_schedule_version(*user_ids)
+    rows = (
+        Schedule.objects.filter(user_id__in=user_ids, scheduled_date__in=dates)
+        .values("user_id", "scheduled_date")
+        .annotate(total=Count("id"), completed=Count("id", filter=Q(is_completed=True)))
+        .order_by()
+    )
+    bulk_upsert(
+        ScheduleDailyCount,
+        [
+            ScheduleDailyCount(
+                user_id=row["user_id"],
+                date=row["scheduled_date"],
+                total=row["total"],
+                completed=row["completed"],
+            )
+            for row in rows
+        ],
+        unique_fields=["user", "date"],
+        update_fields=["total", "completed"],
+    )
+
+
+# ------------------------------- 일정 대량 가져오기 ------------------------------- #
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ITEMS = 10000
+
+# 필드: (필수 여부, 최대 길이)
+IMPORT_TEXT_FIELDS = {"title": (True, 30), "content": (False, 100)}
+IMPORT_DATE_FIELDS = {"scheduled_date": True, "deadline": False}
+IMPORT_TAG_MAX_LENGTH = 30
+
+
+def validate_import_item(item):
+    """
+    가져오기 항목 하나 검사 (ScheduleSerializer 필드 규칙 + 제목/날짜 필수, 직렬화기 생성 없이)
+    반환: (일정 필드, 태그 이름 목록, 오류)
+    """
+    if not isinstance(item, dict):
+        return None, None, {"non_field_errors": ["객체여야 합니다."]}
+
+    fields = {}
+    errors = {}
+    for name, (required, max_length) in IMPORT_TEXT_FIELDS.items():
+        value = item.get(name)
+        if value is None:
+            if required:
+                errors[name] = ["필수 항목입니다."]
+            continue
+        if not isinstance(value, str):
+            errors[name] = ["문자열이어야 합니다."]
+        elif len(value) > max_length:
+            errors[name] = [f"{max_length}자 이하여야 합니다."]
+        else:
+            fields[name] = value
+
+    for name, required in IMPORT_DATE_FIELDS.items():
+        value = item.get(name)
+        if value is None:
+            if required:
+                errors[name] = ["필수 항목입니다."]
+            continue
+        try:
+            fields[name] = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            errors[name] = ["YYYY-MM-DD 형식이어야 합니다."]
+
+    is_completed = item.get("is_completed", False)
+    if isinstance(is_completed, bool):
+        fields["is_completed"] = is_completed
+    else:
+        errors["is_completed"] = ["true/false 여야 합니다."]
+
+    order_num = item.get("order_num")
+    if order_num is not None:
+        if isinstance(order_num, int) and not isinstance(order_num, bool):
+            fields["order_num"] = order_num
+        else:
+            errors["order_num"] = ["정수여야 합니다."]
+
+    tags = item.get("tag") or []
+    if not isinstance(tags, list) or not all(
+        isinstance(name, str) and 0 < len(name) <= IMPORT_TAG_MAX_LENGTH
+        for name in tags
+    ):
+        errors["tag"] = [f"{IMPORT_TAG_MAX_LENGTH}자 이하 태그 이름 목록이어야 합니다."]
+
+    if errors:
+        return None, None, errors
+    return fields, tags, None
+
+
+def create_schedules(schedules, need_ids=True):
+    """
+    일정 여러 개 생성 (일정 생성 API, 대량 가져오기 공용)
+    생성된 id를 돌려주지 않는 DB(MySQL)는 id가 필요할 때만 하나씩 저장
+    """
+    if need_ids and not connection.features.can_return_rows_from_bulk_insert:
+        for schedule in schedules:
+            schedule.save()
+        return schedules
+    return Schedule.objects.bulk_create(schedules)
+
+
+def bulk_import_schedules(user, items, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    일정 대량 가져오기, 항목을 차례로 검사하며 chunk_size개씩 저장 (chunk마다 트랜잭션)
+    잘못된 항목은 건너뛰고 오류 목록에 기록
+    반환: {"created": 생성 수, "ids": 생성된 id (입력 순서), "errors": [{"index", "errors"}]}
+    """
+    ids = []
+    errors = []
+
+    def flush(chunk):
+        with transaction.atomic():
+            schedules = create_schedules(
+                [Schedule(user=user, **fields) for _, fields, _ in chunk]
+            )
+            count_schedules_created(schedules)
+            tags = {
+                tag.name: tag.id
+                for tag in resolve_tags(
+                    user, [name for _, _, names in chunk for name in names]
+                )
+            }
+            through = Schedule.tag.through
+            through.objects.bulk_create(
+                [
+                    through(schedule_id=schedule.id, tag_id=tags[name])
+                    for schedule, (_, _, names) in zip(schedules, chunk)
+                    for name in dict.fromkeys(names)
+                ],
+                batch_size=1000,
+            )
+        ids.extend(schedule.id for schedule in schedules)
+
+    chunk = []
+    for index, item in enumerate(items):
+        fields, tags, item_errors = validate_import_item(item)
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+            continue
+        chunk.append((index, fields, tags))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    return {"created": len(ids), "ids": ids, "errors": errors}
+
+
+# ------------------------------- 일정 일괄 수정 ------------------------------- #
+BULK_PATCH_MAX_ITEMS = 1000
+
+
+def validate_patch_item(item):
+    """일괄 수정 항목 하나 검사, 반환: (id, 바꿀 필드, 오류)"""
+    if not isinstance(item, dict):
+        return None, None, {"non_field_errors": ["객체여야 합니다."]}
+
+    schedule_id = item.get("id")
+    if not isinstance(schedule_id, int) or isinstance(schedule_id, bool):
+        return None, None, {"id": ["정수 id가 필요합니다."]}
+
+    fields = {}
+    errors = {}
+    if "is_completed" in item:
+        if isinstance(item["is_completed"], bool):
+            fields["is_completed"] = item["is_completed"]
+        else:
+            errors["is_completed"] = ["true/false 여야 합니다."]
+    if "order_num" in item:
+        value = item["order_num"]
+        if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+            fields["order_num"] = value
+        else:
+            errors["order_num"] = ["정수여야 합니다."]
+    for name in ("scheduled_date", "deadline"):
+        if name not in item:
+            continue
+        value = item[name]
+        try:
+            fields[name] = None if value is None else date.fromisoformat(value)
+        except (TypeError, ValueError):
+            errors[name] = ["YYYY-MM-DD 형식이어야 합니다."]
+
+    if errors:
+        return schedule_id, None, errors
+    if not fields:
+        return schedule_id, None, {"non_field_errors": ["수정할 필드가 없습니다."]}
+    return schedule_id, fields, None
+
+
+def bulk_patch_schedules(user, items):
+    """
+    완료 여부, 순서, 날짜 일괄 수정 (트랜잭션 하나, bulk_update 한 번)
+    반환: {"updated": [{"id", 바뀐 필드만}], "errors": [{"index", "id", "errors"}]}
+    """
+    changes = {}
+    errors = []
+    for index, item in enumerate(items):
+        schedule_id, fields, item_errors = validate_patch_item(item)
+        if item_errors:
+            errors.append({"index": index, "id": schedule_id, "errors": item_errors})
+            continue
+        # 같은 id가 여러 번 오면 뒤의 값으로 덮어씀
+        changes.setdefault(schedule_id, {}).update(fields)
+
+    if not changes:
+        return {"updated": [], "errors": errors}
+
+    with transaction.atomic():
+        schedules = {
+            schedule.id: schedule
+            for schedule in Schedule.objects.select_for_update().filter(
+                user=user, id__in=list(changes)
+            )
+        }
+        for index, item in enumerate(items):
+            schedule_id = item.get("id") if isinstance(item, dict) else None
+            if schedule_id in changes and schedule_id not in schedules:
+                errors.append(
+                    {"index": index, "id": schedule_id, "errors": {"id": ["일정이 없습니다."]}}
+                )
+
+        updated = []
+        changed = []
+        update_fields = {"updated_at"}
+        now = timezone.now()
+        for schedule_id, fields in changes.items():
+            schedule = schedules.get(schedule_id)
+            if schedule is None:
+                continue
+            diff = {
+                name: value
+                for name, value in fields.items()
+                if getattr(schedule, name) != value
+            }
+            if not diff:
+                continue
+            before = get_schedule_state(schedule)
+            for name, value in diff.items():
+                setattr(schedule, name, value)
+            schedule.updated_at = now
+            update_fields.update(diff)
+            changed.append((before, schedule))
+            updated.append(
+                {
+                    "id": schedule_id,
+                    **{
+                        name: value.isoformat() if hasattr(value, "isoformat") else value
+                        for name, value in diff.items()
+                    },
+                }
+            )
+
+        if changed:
+            Schedule.objects.bulk_update(
+                [schedule for _, schedule in changed],
+                sorted(update_fields),
+                batch_size=1000,
+            )
+            count_schedules_changed(changed)
+
+    errors.sort(key=lambda error: error["index"])
+    return {"updated": updated, "errors": errors}
+
+
+# ------------------------------- 변경분 동기화 ------------------------------- #
+# 커밋이 늦게 끝난 변경을 놓치지 않도록, 목록 끝까지 받은 종류의 커서는 이 시간만큼 뒤에 둠
+# (이 구간의 변경은 다음 동기화에서 한 번 더 전달될 수 있으므로 클라이언트는 id 기준으로 덮어씀)
+SYNC_SETTLE_SECONDS = 5
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+SYNC_KINDS = {
+    # 종류: (모델, 시간 필드, 전달할 필드)
+    "schedule": (
+        Schedule,
+        "updated_at",
+        [
+            "id",
+            "title",
+            "content",
+            "scheduled_date",
+            "deadline",
+            "is_completed",
+            "order_num",
+            "updated_at",
+        ],
+    ),
+    "tag": (Tag, "updated_at", ["id", "name", "color", "updated_at"]),
+    "timetable": (
+        TimeTable,
+        "updated_at",
+        ["id", "subject", "day_of_week", "start_time", "end_time", "updated_at"],
+    ),
+    "deleted": (SyncTombstone, "deleted_at", ["id", "kind", "object_id", "deleted_at"]),
+}
+
+
+class SyncCursorError(ValueError):
+    pass
+
+
+class SyncCursorExpired(SyncCursorError):
+    pass
+
+
+def encode_sync_cursor(positions):
+    """종류별 마지막 위치 {kind: (시각, id)} -> 문자열"""
+    payload = {
+        kind: [moment.isoformat(), object_id]
+        for kind, (moment, object_id) in positions.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_sync_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        positions = {
+            kind: (datetime.fromisoformat(payload[kind][0]), int(payload[kind][1]))
+            for kind in SYNC_KINDS
+        }
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        raise SyncCursorError(f"잘못된 커서입니다: {e}")
+    if any(timezone.is_naive(moment) for moment, _ in positions.values()):
+        raise SyncCursorError("잘못된 커서입니다: 시간대 정보 없음")
+    return positions
+
+
+def _to_json_rows(rows):
+    """values() 결과의 날짜/시간 값을 문자열로"""
+    return [
+        {
+            key: value.isoformat() if hasattr(value, "isoformat") else value
+            for key, value in row.items()
+        }
+        for row in rows
+    ]
+
+
+def get_sync_changes(user_id, cursor=None, limit=500):
+    """
+    커서 이후 생성/수정된 일정, 태그, 시간표와 삭제 기록 (종류별 (시각, id) 순서로 최대 limit개)
+    커서가 없으면 전체 목록부터 시작 (삭제 기록은 지금부터)
+    일정의 태그는 id 목록으로만 전달 (태그 정보는 태그 변경분으로 전달)
+    """
+    now = timezone.now()
+    settled = (now - timedelta(seconds=SYNC_SETTLE_SECONDS), 0)
+    if cursor:
+        positions = decode_sync_cursor(cursor)
+        retention = now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+        if positions["deleted"][0] < retention:
+            raise SyncCursorExpired("삭제 기록 보관 기간이 지났습니다. 전체를 다시 받아야 합니다.")
+    else:
+        epoch = (datetime(1970, 1, 1, tzinfo=dt_timezone.utc), 0)
+        positions = {kind: epoch for kind in SYNC_KINDS}
+        positions["deleted"] = settled
+
+    changes = {}
+    next_positions = {}
+    has_more = False
+    for kind, (model, time_field, fields) in SYNC_KINDS.items():
+        moment, last_id = positions[kind]
+        rows = list(
+            model.objects.filter(user_id=user_id)
+            .filter(
+                Q(**{f"{time_field}__gt": moment})
+                | Q(**{time_field: moment, "id__gt": last_id})
+            )
+            .order_by(time_field, "id")
+            .values(*fields)[: limit + 1]
+        )
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+            next_positions[kind] = (rows[-1][time_field], rows[-1]["id"])
+        else:
+            # 끝까지 받았으면 커밋이 늦은 변경을 위해 커서를 settled 이후로 넘기지 않음
+            last = (rows[-1][time_field], rows[-1]["id"]) if rows else positions[kind]
+            next_positions[kind] = max(positions[kind], min(last, settled))
+        changes[kind] = rows
+
+    if changes["schedule"]:
+        tag_ids = defaultdict(list)
+        for schedule_id, tag_id in (
+            Schedule.tag.through.objects.filter(
+                schedule_id__in=[row["id"] for row in changes["schedule"]]
+            )
+            .order_by("tag_id")
+            .values_list("schedule_id", "tag_id")
+        ):
+            tag_ids[schedule_id].append(tag_id)
+        for row in changes["schedule"]:
+            row["tag"] = tag_ids.get(row["id"], [])
+
+    return {
+        "schedules": _to_json_rows(changes["schedule"]),
+        "tags": _to_json_rows(changes["tag"]),
+        "timetables": _to_json_rows(changes["timetable"]),
+        "deleted": [
+            {"kind": row["kind"], "id": row["object_id"]} for row in changes["deleted"]
+        ],
+        "cursor": encode_sync_cursor(next_positions),
+        "has_more": has_more,
+    }
+
+
+def prune_sync_tombstones():
+    """보관 기간이 지난 삭제 기록 정리"""
+    expired = timezone.now() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = SyncTombstone.objects.filter(deleted_at__lt=expired).delete()
+    return deleted
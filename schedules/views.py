@@ -1,33 +1,91 @@
+import hashlib
 from datetime import datetime
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import generics
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
+from config.pagination import OptionalCursorPagination
 from schedules.models import Tag, Schedule, TimeTable
 from schedules.serializers import (
     TagSerializer,
     ScheduleSerializer,
-    GroupedScheduleSerializer,
     TimeTableSerializer,
+    group_schedules_by_date,
+    serialize_schedules,
+)
+from schedules.utils import (
+    BULK_PATCH_MAX_ITEMS,
+    IMPORT_MAX_ITEMS,
+    SyncCursorError,
+    SyncCursorExpired,
+    bulk_import_schedules,
+    bulk_patch_schedules,
+    bump_schedule_version,
+    delete_schedules,
+    delete_with_tombstones,
+    get_schedule_version,
+    get_sync_changes,
+    resolve_tags,
+    set_schedule_tags,
+    tag_colors,
 )
 from users.models import User
 
-tag_colors = [
-    "#CFE6D6",
-    "#FFEDA4",
-    "#FDD0EB",
-    "#E0CFE6",
-    "#BDC49E",
-    "#F7D5AB",
-    "#C3E1FF",
-    "#D9D4C1",
-    "#F5CDCD",
-]
+SCHEDULE_LIST_CACHE_TIMEOUT = 60 * 60
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 1000
+# 한 번에 조회할 수 있는 최대 기간 (일)
+SCHEDULE_LIST_MAX_DAYS = 366
+
+
+def get_schedule_etag(request, name, *params):
+    """
+    사용자 일정 캐시 버전 + 조회 조건으로 만든 ETag
+    버전은 캐시 조회 한 번이므로 DB 조회, 직렬화 전에 변경 여부 확인 가능
+    """
+    params = hashlib.md5(
+        "|".join(map(str, (request.get_full_path(), *params))).encode()
+    ).hexdigest()
+    return quote_etag(
+        f"{name}-{request.user.id}-{get_schedule_version(request.user.id)}-{params}"
+    )
+
+
+def is_not_modified(request, etag):
+    """If-None-Match에 같은 ETag가 있는지 (W/ 약한 비교는 하지 않음)"""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag in etags
+
+
+def not_modified_response(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+class ETagListMixin:
+    """목록 조회에 ETag 적용, 바뀌지 않았으면 304 (etag_name: ETag 구분용 이름)"""
+
+    etag_name = None
+
+    def list(self, request, *args, **kwargs):
+        etag = get_schedule_etag(request, self.etag_name)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
 
 
 # Tag 조회, 생성
-class TagListCreateAPIView(generics.ListCreateAPIView):
+class TagListCreateAPIView(ETagListMixin, generics.ListCreateAPIView):
     serializer_class = TagSerializer
+    pagination_class = OptionalCursorPagination
+    etag_name = "tags"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -47,6 +105,7 @@ class TagListCreateAPIView(generics.ListCreateAPIView):
         serializer.save(
             user=self.request.user, color=tag_colors[order % len(tag_colors)]
         )
+        bump_schedule_version(self.request.user.id)
 
     def get_queryset(self):
         return Tag.objects.filter(user=self.request.user)
@@ -60,6 +119,11 @@ class TagRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     def perform_update(self, serializer):
         serializer.save(user=self.request.user)
+        bump_schedule_version(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        delete_with_tombstones("tag", Tag.objects.filter(id=instance.id))
+        bump_schedule_version(self.request.user.id)
 
     def get_queryset(self):
         return Tag.objects.filter(user=self.request.user)
@@ -75,18 +139,10 @@ class ScheduleCreateAPIView(generics.CreateAPIView):
 
         serializer = self.get_serializer(data=data)
         if serializer.is_valid():
-            schedule = serializer.save(user=request.user)
-            tag_instances = []
-            for tag_name in tag:
-                tag_instance, created = Tag.objects.get_or_create(
-                    name=tag_name, user=request.user
-                )
-                if created:
-                    order = Tag.objects.filter(user=self.request.user).count()
-                    tag_instance.color = tag_colors[order % len(tag_colors)]
-                    tag_instance.save()
-                tag_instances.append(tag_instance)
-            schedule.tag.set(tag_instances)
+            # 태그까지 저장된 뒤(커밋 시점)에 일정 캐시 버전이 갱신되도록
+            with transaction.atomic():
+                schedule = serializer.save(user=request.user)
+                schedule.tag.set(resolve_tags(request.user, tag))
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -97,8 +153,7 @@ class ScheduleCreateAPIView(generics.CreateAPIView):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
         schedules = Schedule.objects.filter(id__in=ids, user=request.user)
-        if schedules.exists():
-            schedules.delete()
+        delete_schedules(schedules)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def get_queryset(self):
@@ -112,18 +167,78 @@ class ScheduleBulkCreateAPIView(generics.CreateAPIView):
     def create(self, request):
         serializer = self.get_serializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        with transaction.atomic():
+            self.perform_create(serializer)
+            # 항목별 "tag" 이름 목록을 한 번에 연결
+            schedule_tags = [
+                (schedule, item.get("tag"))
+                for schedule, item in zip(serializer.instance, request.data)
+                if isinstance(item, dict) and item.get("tag")
+            ]
+            set_schedule_tags(request.user, schedule_tags)
         headers = self.get_success_headers(serializer.data)
         return Response(
             serializer.data, status=status.HTTP_201_CREATED, headers=headers
         )
 
+    # 완료 여부, 순서, 날짜 일괄 수정 (바뀐 필드만 반환)
+    def patch(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"message": "수정할 일정 목록이 필요합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > BULK_PATCH_MAX_ITEMS:
+            return Response(
+                {"message": f"한 번에 최대 {BULK_PATCH_MAX_ITEMS}개까지 수정할 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result = bulk_patch_schedules(request.user, items)
+        if result["errors"]:
+            code = (
+                status.HTTP_207_MULTI_STATUS
+                if len(result["errors"]) < len(items)
+                else status.HTTP_400_BAD_REQUEST
+            )
+            return Response(result, status=code)
+        return Response(result, status=status.HTTP_200_OK)
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context["request"] = self.request
+        # 태그를 연결하려면 생성된 일정 id가 필요
+        context["need_ids"] = isinstance(self.request.data, list) and any(
+            isinstance(item, dict) and item.get("tag") for item in self.request.data
+        )
         return context
 
 
+# Schedule 대량 가져오기 (태그 포함)
+@api_view(["POST"])
+def schedules_import_api_view(request):
+    items = request.data
+    if isinstance(items, dict):
+        items = items.get("schedules")
+    if not isinstance(items, list) or not items:
+        return Response(
+            {"message": "일정 목록이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(items) > IMPORT_MAX_ITEMS:
+        return Response(
+            {"message": f"한 번에 최대 {IMPORT_MAX_ITEMS}개까지 가져올 수 있습니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    result = bulk_import_schedules(request.user, items)
+    if not result["created"]:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    if result["errors"]:
+        return Response(result, status=status.HTTP_207_MULTI_STATUS)
+    return Response(result, status=status.HTTP_201_CREATED)
+
+
 # Schedule 조회
 @api_view(["GET"])
 def schedules_list_api_view(request):
@@ -135,6 +250,11 @@ def schedules_list_api_view(request):
     if first and last:
         first_date_instance = datetime.strptime(first, "%Y-%m-%d").date()
         last_date_instance = datetime.strptime(last, "%Y-%m-%d").date()
+        if (last_date_instance - first_date_instance).days >= SCHEDULE_LIST_MAX_DAYS:
+            return Response(
+                {"message": f"조회 기간은 최대 {SCHEDULE_LIST_MAX_DAYS}일입니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         schedules = Schedule.objects.filter(
             user=request.user,
             scheduled_date__range=[first_date_instance, last_date_instance],
@@ -147,21 +267,69 @@ def schedules_list_api_view(request):
     else:
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
-    if not schedules.exists():
-        return Response(data={"schedules": {}}, status=status.HTTP_204_NO_CONTENT)
+    # 같은 조회 조건이면 일정/태그가 바뀌기 전까지 캐시된 응답 사용
+    # (지연된 일정이 오늘 날짜에 따라 달라지므로 오늘 날짜도 키에 포함)
+    today = datetime.now().date().isoformat()
+    etag = get_schedule_etag(request, "schedules", today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
 
+    cache_key = f"schedules:list:{etag}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        data, status_code = cached
+        return Response(data=data, status=status_code, headers={"ETag": etag})
+
+    filtered = schedules
     if title:
-        schedules = schedules.filter(title__icontains=title)
+        filtered = filtered.filter(title__icontains=title)
     if tag:
-        schedules = schedules.filter(tag__name=tag)
+        filtered = filtered.filter(tag__user=request.user, tag__name=tag)
+
+    # 모델 인스턴스 없이 .values()로 직렬화, 전체 목록과 지연된 일정 목록에 함께 사용
+    items = serialize_schedules(filtered.order_by("scheduled_date", "id"))
+    if not items and (not (title or tag) or not schedules.exists()):
+        data = {"schedules": {}}
+        cache.set(
+            cache_key,
+            (data, status.HTTP_204_NO_CONTENT),
+            timeout=SCHEDULE_LIST_CACHE_TIMEOUT,
+        )
+        return Response(
+            data=data, status=status.HTTP_204_NO_CONTENT, headers={"ETag": etag}
+        )
 
-    serializer = GroupedScheduleSerializer(schedules)
-    delayed_schedules = schedules.filter(
-        scheduled_date__lt=datetime.now().date(), is_completed=False
+    data = group_schedules_by_date(items)
+    data["delayed_schedules"] = sorted(
+        (
+            item
+            for item in items
+            if item["scheduled_date"] < today and not item["is_completed"]
+        ),
+        key=lambda item: item["id"],
     )
-    delayed_serializer = ScheduleSerializer(delayed_schedules, many=True)
-    data = serializer.data
-    data["delayed_schedules"] = delayed_serializer.data
+    cache.set(cache_key, (data, status.HTTP_200_OK), timeout=SCHEDULE_LIST_CACHE_TIMEOUT)
+    return Response(data, headers={"ETag": etag})
+
+
+# 변경분 동기화
+@api_view(["GET"])
+def schedules_sync_api_view(request):
+    try:
+        limit = min(int(request.GET.get("limit", SYNC_PAGE_SIZE)), SYNC_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response(
+            {"message": "limit은 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        data = get_sync_changes(
+            request.user.id, request.GET.get("cursor"), max(limit, 1)
+        )
+    except SyncCursorExpired as e:
+        return Response({"message": str(e)}, status=status.HTTP_410_GONE)
+    except SyncCursorError as e:
+        return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     return Response(data)
 
 
@@ -178,22 +346,17 @@ class ScheduleRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
 
         serializer = self.get_serializer(instance, data=request.data, partial=False)
         if serializer.is_valid():
-            schedule = serializer.save(user=request.user)
-            tag_instances = []
-            for tag_name in tag:
-                tag_instance, created = Tag.objects.get_or_create(
-                    name=tag_name, user=request.user
-                )
-                if created:
-                    order = Tag.objects.filter(user=self.request.user).count()
-                    tag_instance.color = tag_colors[order % len(tag_colors)]
-                    tag_instance.save()
-                tag_instances.append(tag_instance)
-            schedule.tag.set(tag_instances)
+            # 태그까지 저장된 뒤(커밋 시점)에 일정 캐시 버전이 갱신되도록
+            with transaction.atomic():
+                schedule = serializer.save(user=request.user)
+                schedule.tag.set(resolve_tags(request.user, tag))
 
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def perform_destroy(self, instance):
+        delete_schedules(Schedule.objects.filter(id=instance.id))
+
     def get_queryset(self):
         return Schedule.objects.filter(user=self.request.user)
 
@@ -202,17 +365,19 @@ class ScheduleRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
 def schedule_delete_api_view(request):
     ids = request.data.get("ids", None)
     schedules = Schedule.objects.filter(id__in=ids, user=request.user)
-    if schedules.exists():
-        schedules.delete()
+    delete_schedules(schedules)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 # TimeTable 조회, 생성, 수정
-class TimeTableListCreateAPIView(generics.ListCreateAPIView):
+class TimeTableListCreateAPIView(ETagListMixin, generics.ListCreateAPIView):
     serializer_class = TimeTableSerializer
+    pagination_class = OptionalCursorPagination
+    etag_name = "timetables"
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        bump_schedule_version(self.request.user.id)
 
     def get_queryset(self):
         return TimeTable.objects.filter(user=self.request.user)
@@ -223,5 +388,13 @@ class TimeTableRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIVie
     lookup_field = "id"
     lookup_url_kwarg = "timetable_id"
 
+    def perform_update(self, serializer):
+        serializer.save()
+        bump_schedule_version(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        delete_with_tombstones("timetable", TimeTable.objects.filter(id=instance.id))
+        bump_schedule_version(self.request.user.id)
+
     def get_queryset(self):
         return TimeTable.objects.filter(user=self.request.user)
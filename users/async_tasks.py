@@ -1,97 +1,38 @@
 from celery import shared_task
+from celery.signals import worker_process_init, worker_process_shutdown
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import tempfile
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from users.utils import (
-    check_error,
-    get_courses,
-    get_events,
-    get_syllabus,
-    login_attempt,
-    save_to_timetable,
-)
+from users.crawlers import LoginError, driver_pool, fetch_syllabi, get_crawler
+from users.utils import get_events, save_to_timetable
 from schedules.models import TimeTable
+from schedules.utils import bump_schedule_version, delete_with_tombstones
 from notifications.utils import send_multi_channel
-import shutil
-from contextlib import contextmanager
 
 User = get_user_model()
 logger = logging.getLogger("schedulo")
-import os
 
 
-# ChromeDriver 경로 설정 (Windows 환경에 맞게 조정)
-CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER")
-
-# ChromeDriver 존재 확인
-if CHROMEDRIVER_PATH and not os.path.exists(CHROMEDRIVER_PATH):
-    logger.warning(
-        f"ChromeDriver not found at {CHROMEDRIVER_PATH}, using ChromeDriverManager"
-    )
-    CHROMEDRIVER_PATH = None  # ChromeDriverManager 사용
+# ------------------------------- Chrome 풀 ------------------------------- #
+@worker_process_init.connect
+def warm_up_driver_pool(**kwargs):
+    """
+    Chrome 재사용은 Celery 워커 프로세스에서만 (웹 프로세스는 쓸 때마다 실행 후 종료)
+    Selenium 크롤러를 사용하는 워커는 시작할 때 Chrome을 미리 실행
+    """
+    driver_pool.pooled = True
+    if settings.CRAWLER_BACKEND != "selenium":
+        return
+    try:
+        driver_pool.warm_up()
+    except Exception as e:
+        logger.error(f"Chrome 풀 준비 실패: {e}")
 
 
-# chromedriver 설정 함수
-@contextmanager
-def get_driver():
-    tmpdir = None
-    try:
-        # Windows 환경에서는 XDG_RUNTIME_DIR 설정 생략
-        if os.name != "nt":  # Unix/Linux 환경에서만
-            runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp/chrome-runtime"
-            os.makedirs(runtime_dir, exist_ok=True)
-            os.chmod(runtime_dir, 0o700)  # 디렉토리 권한 설정
-            os.environ["XDG_RUNTIME_DIR"] = runtime_dir
-
-        tmpdir = tempfile.mkdtemp(prefix="chrome-profile-")  # 요청별 고유 디렉토리
-        data_path = os.path.join(tmpdir, "data")
-        cache_path = os.path.join(tmpdir, "cache")
-
-        options = Options()
-        options.add_argument("--headless=new")  # Headless 모드 설정
-        options.add_argument("--lang=ko-KR")
-
-        # Windows 환경에 맞는 옵션
-        if os.name == "nt":  # Windows
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-gpu")
-            options.add_argument(f"--user-data-dir={tmpdir}")
-        else:  # Unix/Linux
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-gpu")
-            options.add_argument(f"--user-data-dir={tmpdir}")
-            options.add_argument(f"--data-path={data_path}")
-            options.add_argument(f"--disk-cache-dir={cache_path}")
-            options.add_argument("--remote-debugging-port=9222")
-
-        # ChromeDriver 경로에 따라 Service 설정
-        if CHROMEDRIVER_PATH:
-            service = Service(executable_path=CHROMEDRIVER_PATH)
-        else:
-            service = Service(executable_path=ChromeDriverManager().install())
-
-        driver = None
-        try:
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.set_page_load_timeout(30)
-            yield driver
-        finally:
-            try:
-                if driver:
-                    driver.quit()
-            except Exception:
-                pass
-    finally:
-        # 4. tmpdir이 유효할 경우에만 삭제
-        if tmpdir and os.path.exists(tmpdir):
-            shutil.rmtree(tmpdir, ignore_errors=True)
+@worker_process_shutdown.connect
+def close_driver_pool(**kwargs):
+    driver_pool.close()
 
 
 @shared_task(bind=True)
@@ -110,26 +51,15 @@ def crawl_timetable_task(self, user_id):
 
         logger.info(f"시간표 크롤링 시작 - 사용자: {user.username} (ID: {user_id})")
 
-        # WebDriver 설정
-        with get_driver() as driver:
-            try:
-                # 태스크 상태 업데이트
-                self.update_state(
-                    state="PROGRESS",
-                    meta={"status": "eCampus 로그인 중...", "progress": 20},
-                )
-
-                # eCampus 로그인
-                login_attempt(driver, student_id, student_password)
-                if check_error(driver):
-                    error_msg = "로그인 실패: 학번 또는 비밀번호가 잘못되었습니다."
-                    logger.error(f"로그인 실패 - 사용자: {user.username}")
-                    return {
-                        "status": "FAILURE",
-                        "message": error_msg,
-                        "error": error_msg,
-                    }
+        # 태스크 상태 업데이트
+        self.update_state(
+            state="PROGRESS",
+            meta={"status": "eCampus 로그인 중...", "progress": 20},
+        )
 
+        # eCampus 로그인 (CRAWLER_BACKEND에 따라 HTTP 또는 Chrome)
+        with get_crawler(student_id, student_password) as crawler:
+            try:
                 logger.info("✅ 로그인 성공!")
 
                 # 태스크 상태 업데이트
@@ -139,7 +69,7 @@ def crawl_timetable_task(self, user_id):
                 )
 
                 # 과목 불러오기
-                courses = get_courses(driver)
+                courses = crawler.get_courses()
                 if not courses:
                     error_msg = "과목 정보를 찾을 수 없습니다."
                     logger.warning(f"과목 정보 없음 - 사용자: {user.username}")
@@ -155,13 +85,15 @@ def crawl_timetable_task(self, user_id):
                     meta={"status": "시간표 정보를 파싱하는 중...", "progress": 60},
                 )
 
+                # 시간표 데이터 조회 (캐시에 없는 과목만 강의 계획서를 동시에 요청)
+                syllabi = fetch_syllabi(
+                    crawler, [course_id for _, course_id in courses]
+                )
+
                 courses_data = []
                 logger.debug("\n📚 수강 중인 과목 목록:")
                 for course_title, course_id in courses:
-                    # 시간표 데이터 조회
-                    course_name, course_time, schedules = get_syllabus(
-                        driver, course_id
-                    )
+                    course_name, course_time, schedules = syllabi[course_id]
                     display_name = (
                         course_name if course_name != "정보 없음" else course_title
                     )
@@ -185,7 +117,10 @@ def crawl_timetable_task(self, user_id):
 
                     # 기존 시간표 데이터 삭제 (크롤링 성공 후에만)
                     deleted_count = TimeTable.objects.filter(user=user).count()
-                    TimeTable.objects.filter(user=user).delete()
+                    delete_with_tombstones(
+                        "timetable", TimeTable.objects.filter(user=user)
+                    )
+                    bump_schedule_version(user.id)
                     logger.info(
                         f"🗑️ 기존 시간표 데이터 {deleted_count}개 삭제 완료 - 사용자: {user.username}"
                     )
@@ -275,6 +210,11 @@ def crawl_timetable_task(self, user_id):
         logger.error(error_msg)
         return {"status": "FAILURE", "message": error_msg, "error": error_msg}
 
+    except LoginError:
+        error_msg = "로그인 실패: 학번 또는 비밀번호가 잘못되었습니다."
+        logger.error(f"로그인 실패 - 사용자 ID: {user_id}")
+        return {"status": "FAILURE", "message": error_msg, "error": error_msg}
+
     except Exception as e:
         error_msg = f"시간표 크롤링 중 오류가 발생했습니다: {str(e)}"
         logger.error(f"시간표 크롤링 오류 - 사용자 ID: {user_id}, 오류: {e}")
@@ -298,26 +238,15 @@ def crawl_events_task(self, user_id):
         student_password = user.get_student_password()
         logger.info(f"일정 크롤링 시작 - 사용자: {user.email} (ID: {user_id})")
 
-        # WebDriver 설정
-        with get_driver() as driver:
-            try:
-                # 태스크 상태 업데이트
-                self.update_state(
-                    state="PROGRESS",
-                    meta={"status": "eCampus 로그인 중...", "progress": 20},
-                )
-
-                # eCampus 로그인
-                login_attempt(driver, student_id, student_password)
-                if check_error(driver):
-                    error_msg = "로그인 실패: 학번 또는 비밀번호가 잘못되었습니다."
-                    logger.error(f"로그인 실패 - 사용자: {user.email}")
-                    return {
-                        "status": "FAILURE",
-                        "message": error_msg,
-                        "error": error_msg,
-                    }
+        # 태스크 상태 업데이트
+        self.update_state(
+            state="PROGRESS",
+            meta={"status": "eCampus 로그인 중...", "progress": 20},
+        )
 
+        # eCampus 로그인 (CRAWLER_BACKEND에 따라 HTTP 또는 Chrome)
+        with get_crawler(student_id, student_password) as crawler:
+            try:
                 logger.info("✅ 로그인 성공!")
 
                 # 태스크 상태 업데이트
@@ -329,7 +258,7 @@ def crawl_events_task(self, user_id):
                 # 일정 불러오기
                 logger.info("일정 크롤링 시작...")
                 course_events, saved_event_count, saved_schedule_ids = get_events(
-                    driver, user
+                    crawler, user
                 )
                 logger.info(
                     f"일정 크롤링 결과: {course_events}, 저장된 일정 수: {saved_event_count}, 저장된 일정 ID: {saved_schedule_ids}"
@@ -400,6 +329,11 @@ def crawl_events_task(self, user_id):
         logger.error(error_msg)
         return {"status": "FAILURE", "message": error_msg, "error": error_msg}
 
+    except LoginError:
+        error_msg = "로그인 실패: 학번 또는 비밀번호가 잘못되었습니다."
+        logger.error(f"로그인 실패 - 사용자 ID: {user_id}")
+        return {"status": "FAILURE", "message": error_msg, "error": error_msg}
+
     except Exception as e:
         error_msg = f"일정 크롤링 중 오류가 발생했습니다: {str(e)}"
         logger.error(f"일정 크롤링 오류 - 사용자 ID: {user_id}, 오류: {e}")
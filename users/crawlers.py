@@ -0,0 +1,680 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from urllib3.util.retry import Retry
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from users.utils import (
+    check_error,
+    get_all_first_semester_courses,
+    get_calendar_url,
+    get_courses,
+    get_events_for_course,
+    get_syllabus,
+    login_attempt,
+    parse_calendar_courses,
+    parse_calendar_events,
+    parse_courses,
+    parse_login_error,
+    parse_syllabus,
+)
+
+logger = logging.getLogger("schedulo")
+
+ECAMPUS_URL = "https://ecampus.smu.ac.kr/"
+LOGIN_URL = "https://ecampus.smu.ac.kr/login.php/?lang=ko"
+SYLLABUS_URL = "https://ecampus.smu.ac.kr/local/ubion/setting/syllabus.php?id={}"
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# ChromeDriver 경로 설정 (서버 환경에 맞게 조정)
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER", "/usr/bin/chromedriver")
+
+# ChromeDriver 존재 확인
+if not os.path.exists(CHROMEDRIVER_PATH):
+    logger.warning(
+        f"ChromeDriver not found at {CHROMEDRIVER_PATH}, using ChromeDriverManager"
+    )
+    CHROMEDRIVER_PATH = None  # ChromeDriverManager 사용
+
+
+class LoginError(Exception):
+    """학번 또는 비밀번호가 잘못된 경우"""
+
+
+class CrawlerError(Exception):
+    """HTTP 크롤러로 처리할 수 없는 응답 (페이지 구조 변경, 세션 만료, 네트워크 오류)"""
+
+
+class CrawlerBusyError(Exception):
+    """동시 실행 제한으로 Chrome 크롤링 자리를 얻지 못한 경우"""
+
+
+# ------------------------------- 동시 실행 제한 ------------------------------- #
+_local_slots = {}
+_local_slots_lock = threading.Lock()
+
+
+@contextmanager
+def crawl_slot(slots=None, timeout=None, slot_dir=None):
+    """
+    호스트 전체에서 동시에 실행되는 Chrome 크롤링 수 제한
+    슬롯별 잠금 파일에 flock을 걸어 prefork 프로세스/스레드 어느 쪽이든 안전
+    (open마다 별도 잠금이라 같은 프로세스의 스레드끼리도 배타적)
+    """
+    slots = slots or settings.CRAWLER_CHROME_SLOTS
+    timeout = settings.CRAWLER_SLOT_TIMEOUT if timeout is None else timeout
+    slot_dir = slot_dir or settings.CRAWLER_SLOT_DIR
+
+    if fcntl is None:
+        # flock이 없는 환경은 프로세스 안에서만 제한
+        with _local_slots_lock:
+            semaphore = _local_slots.setdefault(
+                slots, threading.BoundedSemaphore(slots)
+            )
+        if not semaphore.acquire(timeout=timeout):
+            raise CrawlerBusyError("크롤링 대기 시간이 초과되었습니다.")
+        try:
+            yield None
+        finally:
+            semaphore.release()
+        return
+
+    os.makedirs(slot_dir, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        for index in range(slots):
+            lock_file = open(os.path.join(slot_dir, f"slot-{index}.lock"), "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            try:
+                yield index
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            return
+        if time.monotonic() >= deadline:
+            raise CrawlerBusyError("크롤링 대기 시간이 초과되었습니다.")
+        time.sleep(0.2)
+
+
+# ------------------------------- Chrome 풀 ------------------------------- #
+_chromedriver_path = None
+
+
+def get_chromedriver_path():
+    """ChromeDriver 경로 (ChromeDriverManager 설치/버전 확인은 프로세스당 한 번)"""
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        _chromedriver_path = CHROMEDRIVER_PATH or ChromeDriverManager().install()
+    return _chromedriver_path
+
+
+def get_process_tree_rss(pid):
+    """pid와 모든 하위 프로세스의 RSS 합 (MB), /proc가 없는 환경이면 0"""
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+            for tid in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{tid}/children") as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+class PooledDriver:
+    """풀에 보관하는 Chrome 한 개와 프로필 디렉토리"""
+
+    def __init__(self, driver, tmpdir):
+        self.driver = driver
+        self.tmpdir = tmpdir
+        self.uses = 0
+
+    @classmethod
+    def launch(cls):
+        # Windows 환경에서는 XDG_RUNTIME_DIR 설정 생략
+        if os.name != "nt":  # Unix/Linux 환경에서만
+            runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp/chrome-runtime"
+            os.makedirs(runtime_dir, exist_ok=True)
+            os.chmod(runtime_dir, 0o700)  # 디렉토리 권한 설정
+            os.environ["XDG_RUNTIME_DIR"] = runtime_dir
+
+        tmpdir = tempfile.mkdtemp(prefix="chrome-profile-")  # 브라우저별 고유 디렉토리
+        data_path = os.path.join(tmpdir, "data")
+        cache_path = os.path.join(tmpdir, "cache")
+
+        options = Options()
+        options.add_argument("--headless=new")  # Headless 모드 설정
+        options.add_argument("--lang=ko-KR")
+
+        # Windows 환경에 맞는 옵션
+        if os.name == "nt":  # Windows
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-gpu")
+            options.add_argument(f"--user-data-dir={tmpdir}")
+        else:  # Unix/Linux
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-gpu")
+            options.add_argument(f"--user-data-dir={tmpdir}")
+            options.add_argument(f"--data-path={data_path}")
+            options.add_argument(f"--disk-cache-dir={cache_path}")
+            # 디버깅 포트를 지정하지 않으면 chromedriver가 빈 포트를 골라 사용
+
+        try:
+            service = Service(executable_path=get_chromedriver_path())
+            driver = webdriver.Chrome(service=service, options=options)
+            driver.set_page_load_timeout(30)
+        except Exception:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise
+        logger.info("🌐 Chrome 실행")
+        return cls(driver, tmpdir)
+
+    def is_alive(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def rss_mb(self):
+        try:
+            return get_process_tree_rss(self.driver.service.process.pid)
+        except Exception:
+            return 0
+
+    def reset(self):
+        """다음 사용자를 위해 탭, 쿠키, 저장소, 캐시 초기화"""
+        driver = self.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        driver.execute_cdp_cmd(
+            "Storage.clearDataForOrigin",
+            {"origin": ECAMPUS_URL.rstrip("/"), "storageTypes": "all"},
+        )
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        finally:
+            # tmpdir이 유효할 경우에만 삭제
+            if self.tmpdir and os.path.exists(self.tmpdir):
+                shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+class DriverPool:
+    """
+    워커 프로세스별로 미리 띄워 둔 Chrome 풀
+    반납할 때마다 브라우저 상태를 초기화하고, 사용 횟수/메모리 한도를 넘으면 종료
+    crawl_slot은 Chrome을 빌려 쓰는 동안만 점유 (대기 중인 Chrome은 다른 크롤링을 막지 않음)
+    pooled가 아니면 (Celery 워커가 아닌 웹 프로세스 등) 쓸 때마다 실행 후 종료
+    """
+
+    def __init__(self, size, max_uses, max_rss_mb, slot_dir=None, pooled=False):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.slot_dir = slot_dir
+        self.pooled = pooled
+        self._idle = []
+        self._inherited = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        # fork 이전 프로세스의 Chrome은 자식 프로세스에서 사용/종료하지 않음
+        # (참조를 남겨 두어 자식에서 정리되면서 부모의 Chrome이 종료되지 않게 함)
+        if self._pid != os.getpid():
+            self._inherited.extend(self._idle)
+            self._idle = []
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def warm_up(self):
+        self._check_fork()
+        while True:
+            with self._lock:
+                if len(self._idle) >= self.size:
+                    return
+            try:
+                # 실행하는 동안만 자리를 잡고, 빈 자리가 없으면 기다리지 않고 필요할 때 실행
+                with crawl_slot(timeout=0, slot_dir=self.slot_dir):
+                    entry = PooledDriver.launch()
+            except CrawlerBusyError:
+                logger.warning("⚠️ 크롤링 자리가 없어 풀 준비 중단")
+                return
+            with self._lock:
+                self._idle.append(entry)
+
+    def _take(self):
+        self._check_fork()
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                return PooledDriver.launch()
+            if entry.is_alive():
+                return entry
+            logger.warning("⚠️ 응답 없는 Chrome 종료 후 다시 선택")
+            entry.quit()
+
+    def _release(self, entry):
+        entry.uses += 1
+        reason = None
+        if not self.pooled:
+            reason = "풀 사용 안 함"
+        elif entry.uses >= self.max_uses:
+            reason = f"사용 횟수 {entry.uses}회"
+        else:
+            rss = entry.rss_mb()
+            if rss > self.max_rss_mb:
+                reason = f"메모리 {rss:.0f}MB"
+        if reason is None:
+            try:
+                entry.reset()
+            except Exception as e:
+                reason = f"초기화 실패 ({e})"
+
+        if reason is None:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append(entry)
+                    return
+            reason = "풀 가득 참"
+        logger.info(f"♻️ Chrome 종료: {reason}")
+        entry.quit()
+
+    @contextmanager
+    def acquire(self):
+        # 대기 중인 Chrome은 자리를 차지하지 않고, 빌려 쓰는 동안만 호스트 한도에 포함
+        with crawl_slot(slot_dir=self.slot_dir):
+            entry = self._take()
+            try:
+                yield entry.driver
+            finally:
+                self._release(entry)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            entry.quit()
+
+
+driver_pool = DriverPool(
+    size=settings.CRAWLER_DRIVER_POOL_SIZE,
+    max_uses=settings.CRAWLER_DRIVER_MAX_USES,
+    max_rss_mb=settings.CRAWLER_DRIVER_MAX_RSS_MB,
+)
+
+
+@contextmanager
+def get_driver():
+    """동시 실행 자리를 얻은 뒤 풀에서 초기화된 Chrome을 빌려 사용"""
+    with driver_pool.acquire() as driver:
+        yield driver
+
+
+# ------------------------------- HTTP 크롤러 ------------------------------- #
+_http_adapter = None
+_http_adapter_pid = None
+
+
+def get_http_adapter():
+    """
+    워커 프로세스별로 공유하는 eCampus 연결 풀
+    쿠키는 Session마다 따로 두고 TCP/TLS 연결만 사용자 간에 재사용
+    """
+    global _http_adapter, _http_adapter_pid
+    # fork 이전에 만든 연결은 자식 프로세스에서 사용하지 않음
+    if _http_adapter is None or _http_adapter_pid != os.getpid():
+        _http_adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.CRAWLER_HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET",),
+            ),
+        )
+        _http_adapter_pid = os.getpid()
+    return _http_adapter
+
+
+def parse_login_form(html, page_url):
+    """로그인 페이지에서 (form action URL, hidden 입력값) 반환"""
+    soup = BeautifulSoup(html, "lxml")
+    username_input = soup.select_one("input[name='username']")
+    form = username_input.find_parent("form") if username_input else None
+    if form is None:
+        raise CrawlerError("로그인 폼을 찾을 수 없습니다.")
+
+    data = {
+        field["name"]: field.get("value", "")
+        for field in form.select("input[type='hidden'][name]")
+    }
+    return urljoin(page_url, form.get("action") or page_url), data
+
+
+class HttpCrawler:
+    """브라우저 없이 eCampus 페이지를 요청하는 크롤러 (사용자별 Session, 연결은 공유)"""
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = get_http_adapter()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"}
+        )
+
+    def _request(self, method, url, **kwargs):
+        try:
+            response = self.session.request(
+                method, url, timeout=settings.CRAWLER_HTTP_TIMEOUT, **kwargs
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise CrawlerError(f"요청 실패 ({url}): {e}") from e
+        return response
+
+    def _get(self, url):
+        """로그인 상태로 페이지 요청, 로그인 페이지로 돌아오면 세션 만료"""
+        response = self._request("GET", url)
+        if "login" in urlparse(response.url).path:
+            raise CrawlerError(f"세션이 만료되었습니다 ({url})")
+        return response.text
+
+    def login(self, student_id, password):
+        response = self._request("GET", LOGIN_URL)
+        action, data = parse_login_form(response.text, response.url)
+        data.update({"username": student_id, "password": password})
+
+        response = self._request("POST", action, data=data)
+        error = parse_login_error(response.text)
+        if error:
+            logger.error(f"❌ 로그인 실패: {error}")
+            raise LoginError(error)
+
+    def get_courses(self):
+        try:
+            return parse_courses(self._get(ECAMPUS_URL))
+        except CrawlerError as e:
+            logger.error("과목 리스트 로딩 실패: %s", e)
+            return []
+
+    def get_syllabus(self, course_id):
+        try:
+            html = self._get(SYLLABUS_URL.format(course_id))
+        except CrawlerError as e:
+            logger.error("강의 계획서 로딩 실패: %s", e)
+            return "정보 없음", "정보 없음", []
+        return parse_syllabus(html, course_id)
+
+    def get_syllabi(self, course_ids):
+        """
+        강의 계획서를 동시에 요청 (최대 CRAWLER_SYLLABUS_WORKERS개)
+        응답이 도착하는 순서대로 파싱해 가장 느린 페이지만큼만 대기
+        """
+        results = {}
+        if not course_ids:
+            return results
+        workers = min(settings.CRAWLER_SYLLABUS_WORKERS, len(course_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._get, SYLLABUS_URL.format(course_id)): course_id
+                for course_id in course_ids
+            }
+            for future in as_completed(futures):
+                course_id = futures[future]
+                try:
+                    html = future.result()
+                except CrawlerError as e:
+                    logger.error("강의 계획서 로딩 실패: %s", e)
+                    results[course_id] = ("정보 없음", "정보 없음", [])
+                    continue
+                results[course_id] = parse_syllabus(html, course_id)
+        return results
+
+    def get_calendar_courses(self, year, month, semester):
+        try:
+            html = self._get(get_calendar_url(year, month))
+        except CrawlerError as e:
+            logger.warning(f"📅 페이지 로딩 실패 ({month}월): {e}")
+            return []
+        return parse_calendar_courses(html, semester)
+
+    def get_course_events(self, year, month, course):
+        course_text, course_value = course
+        try:
+            html = self._get(get_calendar_url(year, month, course_value))
+        except CrawlerError as e:
+            logger.error(f"강좌 {course_text} 이벤트 파싱 오류: {e}")
+            return {}
+        return parse_calendar_events(html)
+
+    def close(self):
+        # Session.close()는 공유 연결 풀까지 닫으므로 쿠키만 정리
+        self.session.cookies.clear()
+
+
+# ------------------------------- Selenium 크롤러 ------------------------------- #
+class SeleniumCrawler:
+    """headless Chrome으로 eCampus 페이지를 여는 크롤러 (HttpCrawler와 같은 인터페이스)"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def login(self, student_id, password):
+        login_attempt(self.driver, student_id, password)
+        if check_error(self.driver):
+            raise LoginError("로그인 실패")
+
+    def get_courses(self):
+        return get_courses(self.driver)
+
+    def get_syllabus(self, course_id):
+        return get_syllabus(self.driver, course_id)
+
+    def get_syllabi(self, course_ids):
+        """
+        강의 계획서를 탭 여러 개에서 동시에 로딩 (최대 CRAWLER_SYLLABUS_WORKERS개씩)
+        먼저 연 탭부터 파싱하는 동안 나머지 탭은 계속 로딩
+        """
+        driver = self.driver
+        main_handle = driver.current_window_handle
+        batch_size = settings.CRAWLER_SYLLABUS_WORKERS
+        results = {}
+
+        for start in range(0, len(course_ids), batch_size):
+            tabs = []
+            for course_id in course_ids[start : start + batch_size]:
+                before = set(driver.window_handles)
+                # window.open은 로딩을 기다리지 않음
+                driver.execute_script(
+                    "window.open(arguments[0], '_blank');",
+                    SYLLABUS_URL.format(course_id),
+                )
+                tabs.append((course_id, (set(driver.window_handles) - before).pop()))
+
+            for course_id, handle in tabs:
+                driver.switch_to.window(handle)
+                try:
+                    WebDriverWait(driver, 5).until(
+                        EC.presence_of_element_located((By.ID, "region-main"))
+                    )
+                    results[course_id] = parse_syllabus(driver.page_source, course_id)
+                except Exception as e:
+                    logger.error("강의 계획서 로딩 실패: %s", e)
+                    results[course_id] = ("정보 없음", "정보 없음", [])
+                finally:
+                    driver.close()
+
+        driver.switch_to.window(main_handle)
+        return results
+
+    def get_calendar_courses(self, year, month, semester):
+        self.driver.get(get_calendar_url(year, month))
+        try:
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "h2.current"))
+            )
+        except Exception as e:
+            logger.warning(f"📅 페이지 로딩 실패 ({month}월): {e}")
+            return []
+        # 드롭다운은 보이는 강좌명으로 선택
+        return [
+            (text, text)
+            for text in get_all_first_semester_courses(self.driver, semester)
+        ]
+
+    def get_course_events(self, year, month, course):
+        # 현재 열린 달력 페이지의 드롭다운에서 강좌 선택
+        return get_events_for_course(self.driver, course[0])
+
+
+# ------------------------------- 강의 계획서 캐시 ------------------------------- #
+SYLLABUS_CACHE_KEY = "syllabus:{version}:{semester}:{course_id}"
+SYLLABUS_VERSION_KEY = "syllabus:version"
+
+
+def get_semester(day=None):
+    """학기 키 ("2025-1"), 1~2월은 전년도 2학기에 포함"""
+    day = day or timezone.localdate()
+    if day.month <= 2:
+        return f"{day.year - 1}-2"
+    return f"{day.year}-{1 if day.month <= 8 else 2}"
+
+
+def get_syllabus_version():
+    """전체 무효화 때마다 바뀌는 값, 강의 계획서 캐시 키에 포함"""
+    version = cache.get(SYLLABUS_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(SYLLABUS_VERSION_KEY, version, timeout=None)
+        version = cache.get(SYLLABUS_VERSION_KEY, version)
+    return version
+
+
+def _syllabus_keys(course_ids, semester):
+    version = get_syllabus_version()
+    return {
+        SYLLABUS_CACHE_KEY.format(
+            version=version, semester=semester, course_id=course_id
+        ): course_id
+        for course_id in course_ids
+    }
+
+
+def fetch_syllabi(crawler, course_ids, semester=None):
+    """
+    강의 계획서 (과목명, 강의시간, 시간표), 캐시에 없는 과목만 크롤러로 요청
+    강의 계획서는 과목 단위 정보라 사용자 간 공유, 파싱에 성공한 결과만 저장
+    """
+    semester = semester or get_semester()
+    keys = _syllabus_keys(course_ids, semester)
+    syllabi = {keys[key]: value for key, value in cache.get_many(keys).items()}
+
+    missing = [course_id for course_id in course_ids if course_id not in syllabi]
+    if syllabi:
+        logger.info(f"📦 강의 계획서 캐시 사용: {len(syllabi)}/{len(course_ids)}과목")
+    if not missing:
+        return syllabi
+
+    fetched = crawler.get_syllabi(missing)
+    syllabi.update(fetched)
+    # 강의계획서가 없거나 로딩/파싱에 실패한 결과(로그인 페이지 포함)는 저장하지 않음
+    cache.set_many(
+        {
+            key: fetched[course_id]
+            for key, course_id in keys.items()
+            if course_id in fetched and fetched[course_id][1] != "정보 없음"
+        },
+        timeout=settings.CRAWLER_SYLLABUS_CACHE_TIMEOUT,
+    )
+    return syllabi
+
+
+def invalidate_syllabi(course_ids=None, semester=None):
+    """지정한 과목의 강의 계획서 캐시 삭제, 과목을 지정하지 않으면 전체 무효화"""
+    if not course_ids:
+        cache.set(SYLLABUS_VERSION_KEY, time.time_ns(), timeout=None)
+        return
+    cache.delete_many(list(_syllabus_keys(course_ids, semester or get_semester())))
+
+
+@contextmanager
+def get_crawler(student_id, password):
+    """
+    eCampus에 로그인된 크롤러
+    CRAWLER_BACKEND가 "http"면 HttpCrawler, 로그인 단계에서 처리할 수 없는 응답이면 Selenium으로 전환
+    학번/비밀번호 오류는 LoginError
+    """
+    if settings.CRAWLER_BACKEND == "http":
+        crawler = HttpCrawler()
+        try:
+            crawler.login(student_id, password)
+        except CrawlerError as e:
+            crawler.close()
+            logger.warning(f"⚠️ HTTP 크롤러 사용 불가, Selenium으로 전환: {e}")
+        except LoginError:
+            crawler.close()
+            raise
+        else:
+            try:
+                yield crawler
+            finally:
+                crawler.close()
+            return
+
+    with get_driver() as driver:
+        crawler = SeleniumCrawler(driver)
+        crawler.login(student_id, password)
+        yield crawler
@@ -6,31 +6,14 @@ import datetime
 from datetime import datetime
 from bs4 import BeautifulSoup
 from django.views import View
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import tempfile
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 from rest_framework.response import Response
 from rest_framework import status
 
 from schedules.models import Schedule, Tag, TimeTable
 from schedules.serializers import ScheduleSerializer
-from users.utils import (
-    check_error,
-    get_courses,
-    get_events,
-    get_syllabus,
-    login_attempt,
-    save_to_timetable,
-)
+from users.crawlers import LoginError, get_crawler
 from users.async_tasks import crawl_timetable_task, crawl_events_task
 from celery.result import AsyncResult
-import shutil
 
 # log test
 import logging
@@ -38,70 +21,6 @@ import logging
 # 로거 설정
 logger = logging.getLogger("schedulo")  # myapp 로거를 사용
 
-from contextlib import contextmanager
-import os
-
-# ChromeDriver 경로 설정 (서버 환경에 맞게 조정)
-CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER", "/usr/bin/chromedriver")
-
-# ChromeDriver 존재 확인
-if not os.path.exists(CHROMEDRIVER_PATH):
-    logger.warning(
-        f"ChromeDriver not found at {CHROMEDRIVER_PATH}, using ChromeDriverManager"
-    )
-    CHROMEDRIVER_PATH = None  # ChromeDriverManager 사용
-
-
-# chromedriver 설정 함수
-@contextmanager
-def get_driver():
-    tmpdir = None
-    try:
-        runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp/chrome-runtime"
-        os.makedirs(runtime_dir, exist_ok=True)
-        os.chmod(runtime_dir, 0o700)  # 디렉토리 권한 설정
-        os.environ["XDG_RUNTIME_DIR"] = runtime_dir
-
-        tmpdir = tempfile.mkdtemp(prefix="chrome-profile-")  # 요청별 고유 디렉토리
-        data_path = os.path.join(tmpdir, "data")
-        cache_path = os.path.join(tmpdir, "cache")
-
-        options = Options()
-        options.add_argument("--headless=new")  # Headless 모드 설정
-        options.add_argument("--lang=ko-KR")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-extensions")  # 확장 프로그램 비활성화
-        options.add_argument("--disable-gpu")  # GPU 가속 비활성화
-
-        # --user-data 중복 방지
-        options.add_argument(f"--user-data-dir={tmpdir}")
-        options.add_argument(f"--data-path={data_path}")
-        options.add_argument(f"--disk-cache-dir={cache_path}")
-        options.add_argument("--remote-debugging-port=9222")
-
-        # ChromeDriver 경로에 따라 Service 설정
-        if CHROMEDRIVER_PATH:
-            service = Service(executable_path=CHROMEDRIVER_PATH)
-        else:
-            service = Service(executable_path=ChromeDriverManager().install())
-
-        driver = None
-        try:
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.set_page_load_timeout(30)
-            yield driver
-        finally:
-            try:
-                if driver:
-                    driver.quit()
-            except Exception:
-                pass
-    finally:
-        # 4. tmpdir이 유효할 경우에만 삭제
-        if tmpdir and os.path.exists(tmpdir):
-            shutil.rmtree(tmpdir, ignore_errors=True)
-
 
 # 학번, 비밀번호 유효성 검사
 class StudentInfoCheckView(APIView):
@@ -109,27 +28,25 @@ class StudentInfoCheckView(APIView):
         student_id = request.data.get("student_id")
         student_password = request.data.get("student_password")
 
-        with get_driver() as driver:
-            try:
-                # ecampus login
-                login_attempt(driver, student_id, student_password)
-                if check_error(driver):
-                    return Response(
-                        {
-                            "message": "로그인 실패: 학번 또는 비밀번호가 잘못되었습니다."
-                        },
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-                return Response(
-                    {"message": "올바른 학번, 비밀번호 입니다."},
-                    status=status.HTTP_200_OK,
-                )
-            except Exception as e:
-                logger.error(f"StudentInfoCheckView 오류: {e}")
-                return Response(
-                    {"message": "로그인 검증 중 오류가 발생했습니다."},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
+        try:
+            # ecampus login
+            with get_crawler(student_id, student_password):
+                pass
+        except LoginError:
+            return Response(
+                {"message": "로그인 실패: 학번 또는 비밀번호가 잘못되었습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            logger.error(f"StudentInfoCheckView 오류: {e}")
+            return Response(
+                {"message": "로그인 검증 중 오류가 발생했습니다."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return Response(
+            {"message": "올바른 학번, 비밀번호 입니다."},
+            status=status.HTTP_200_OK,
+        )
 
 
 ##시간표 불러오기 (비동기)
@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import django
+from celery import chord
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from users.models import User
+from users.tasks import (
+    backfill_scores_task,
+    finish_score_backfill,
+    replay_scores,
+    update_user_percentages,
+)
+
+
+def _init_worker():
+    # spawn 방식 프로세스에서도 Django 설정을 불러오도록
+    django.setup()
+
+
+def _replay_partition(user_ids, start, end):
+    return replay_scores(user_ids, start, end)
+
+
+class Command(BaseCommand):
+    help = "기간 내 점수 기록을 현재 점수 규칙으로 다시 계산 (사용자를 나눠 병렬 처리)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", required=True, help="시작 날짜 (YYYY-MM-DD)")
+        parser.add_argument("--end", required=True, help="종료 날짜 (YYYY-MM-DD)")
+        parser.add_argument(
+            "--workers", type=int, default=1, help="로컬에서 사용할 프로세스 수"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=500, help="작업 하나가 맡을 사용자 수"
+        )
+        parser.add_argument(
+            "--celery",
+            action="store_true",
+            help="로컬 프로세스 대신 Celery 워커에 나눠 실행",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["start"])
+            end = date.fromisoformat(options["end"])
+        except ValueError as e:
+            raise CommandError(f"날짜 형식이 올바르지 않습니다: {e}")
+        if start > end:
+            raise CommandError("시작 날짜가 종료 날짜보다 늦습니다.")
+
+        user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+        chunk_size = options["chunk_size"]
+        chunks = [
+            user_ids[i : i + chunk_size] for i in range(0, len(user_ids), chunk_size)
+        ]
+        if not chunks:
+            self.stdout.write("재계산할 사용자가 없습니다.")
+            return
+
+        if options["celery"]:
+            result = chord(
+                backfill_scores_task.s(chunk, start.isoformat(), end.isoformat())
+                for chunk in chunks
+            )(finish_score_backfill.s(start.isoformat(), end.isoformat()))
+            self.stdout.write(
+                f"Celery 작업 {len(chunks)}개 등록 (chord id: {result.id})"
+            )
+            return
+
+        started = time.perf_counter()
+        workers = max(1, options["workers"])
+        if workers == 1:
+            written = sum(replay_scores(chunk, start, end) for chunk in chunks)
+        else:
+            # 자식 프로세스가 부모의 DB 연결을 공유하지 않도록 먼저 닫음
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker
+            ) as executor:
+                written = sum(
+                    executor.map(
+                        _replay_partition,
+                        chunks,
+                        [start] * len(chunks),
+                        [end] * len(chunks),
+                    )
+                )
+
+        day = start
+        while day <= end:
+            update_user_percentages(day)
+            day += timedelta(days=1)
+
+        self.stdout.write(
+            f"{start} ~ {end}: 사용자 {len(user_ids)}명, 점수 {written}건 재계산 "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
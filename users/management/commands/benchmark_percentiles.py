@@ -0,0 +1,87 @@
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.models import Score, User
+from users.tasks import update_user_percentages
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_update_user_percentages(target_date):
+    """기존 방식: 전체 점수를 불러와 행마다 save()"""
+    scores = list(Score.objects.filter(date=target_date).order_by("-score"))
+    total = len(scores)
+
+    for index, score in enumerate(scores):
+        percentage = round((index / total * 100), 2) if total > 1 else 100.0
+        score.percentage = percentage
+        score.save()
+
+
+class Command(BaseCommand):
+    help = "백분위 갱신 기존 방식(행마다 save)과 window 함수 + 점수별 CASE UPDATE 방식 비교 (데이터는 롤백)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, nargs="+", default=[10_000, 100_000],
+            help="측정할 사용자 수 목록",
+        )
+        parser.add_argument(
+            "--skip-legacy", action="store_true", help="기존 방식 측정 생략"
+        )
+
+    def handle(self, *args, **options):
+        for n_users in options["users"]:
+            try:
+                with transaction.atomic():
+                    self.run(n_users, options["skip_legacy"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def run(self, n_users, skip_legacy):
+        target_date = date.today()
+        rnd = random.Random(n_users)
+        prefix = f"bench-{time.time_ns()}"
+
+        users = User.objects.bulk_create(
+            [
+                User(email=f"{prefix}-{i}@bench.local", password="!")
+                for i in range(n_users)
+            ],
+            batch_size=1000,
+        )
+        if users[0].pk is None:
+            users = User.objects.filter(email__startswith=prefix)
+        Score.objects.filter(date=target_date).delete()
+        Score.objects.bulk_create(
+            [
+                Score(user=user, score=rnd.randint(0, 300), highest=300, date=target_date)
+                for user in users
+            ],
+            batch_size=1000,
+        )
+
+        timings = {}
+        if not skip_legacy:
+            started = time.perf_counter()
+            legacy_update_user_percentages(target_date)
+            timings["legacy"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        update_user_percentages(target_date)
+        timings["window"] = time.perf_counter() - started
+
+        line = f"{n_users:>7} users: window {timings['window']:.3f}s"
+        if "legacy" in timings:
+            line += (
+                f", legacy {timings['legacy']:.3f}s"
+                f" (x{timings['legacy'] / timings['window']:.1f})"
+            )
+        self.stdout.write(line)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.crawlers import get_semester, invalidate_syllabi
+
+
+class Command(BaseCommand):
+    help = "공유 강의 계획서 캐시 삭제 (강의 계획서가 수정된 과목 또는 전체)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_ids", nargs="*", help="eCampus 과목 id")
+        parser.add_argument("--semester", help="학기 (예: 2025-1, 기본값은 현재 학기)")
+        parser.add_argument(
+            "--all", action="store_true", help="모든 학기/과목 캐시 무효화"
+        )
+
+    def handle(self, *args, **options):
+        course_ids = options["course_ids"]
+        if options["all"]:
+            invalidate_syllabi()
+            self.stdout.write("강의 계획서 캐시를 모두 무효화했습니다.")
+            return
+        if not course_ids:
+            raise CommandError("과목 id를 지정하거나 --all 옵션을 사용하세요.")
+
+        semester = options["semester"] or get_semester()
+        invalidate_syllabi(course_ids, semester)
+        self.stdout.write(
+            f"{semester} 강의 계획서 캐시 {len(course_ids)}과목 삭제: "
+            + ", ".join(course_ids)
+        )
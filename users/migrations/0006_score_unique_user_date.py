@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:23
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_scores(apps, schema_editor):
+    """같은 날짜에 중복 저장된 점수는 가장 마지막 행만 남기고 삭제"""
+    Score = apps.get_model("users", "Score")
+    duplicates = (
+        Score.objects.values("user_id", "date")
+        .annotate(n=Count("id"), last_id=Max("id"))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    for row in duplicates.iterator():
+        Score.objects.filter(user_id=row["user_id"], date=row["date"]).exclude(
+            id=row["last_id"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_user_notify_deadline_schedule_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_scores, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="score",
+            constraint=models.UniqueConstraint(
+                fields=("user", "date"), name="unique_user_score_date"
+            ),
+        ),
+    ]
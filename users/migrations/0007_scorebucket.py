@@ -0,0 +1,56 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:24
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_score_buckets(apps, schema_editor):
+    """기존 점수로 날짜별 점수 분포 채우기"""
+    Score = apps.get_model("users", "Score")
+    ScoreBucket = apps.get_model("users", "ScoreBucket")
+    rows = Score.objects.values("date", "score").annotate(n=Count("id")).order_by()
+    ScoreBucket.objects.bulk_create(
+        (
+            ScoreBucket(date=row["date"], score=row["score"], count=row["n"])
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_score_unique_user_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScoreBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("score", models.IntegerField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="score",
+            index=models.Index(fields=["date", "-score"], name="score_date_score_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="scorebucket",
+            constraint=models.UniqueConstraint(
+                fields=("date", "score"), name="unique_score_bucket"
+            ),
+        ),
+        migrations.RunPython(backfill_score_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:03
+
+from django.db import migrations, models
+
+
+def backfill_bucket_ranks(apps, schema_editor):
+    """기존 점수 분포에 날짜별 순위 채우기"""
+    ScoreBucket = apps.get_model("users", "ScoreBucket")
+    buckets = []
+    current_date = None
+    for bucket in ScoreBucket.objects.order_by("date", "-score").iterator():
+        if bucket.date != current_date:
+            current_date, rank = bucket.date, 1
+        bucket.rank = rank
+        rank += bucket.count
+        buckets.append(bucket)
+    ScoreBucket.objects.bulk_update(buckets, ["rank"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_scorebucket"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scorebucket",
+            name="rank",
+            field=models.IntegerField(default=1),
+        ),
+        migrations.RunPython(backfill_bucket_ranks, migrations.RunPython.noop),
+    ]
@@ -62,3 +62,28 @@ class Score(models.Model):
     highest = models.IntegerField(default=100)
     percentage = models.FloatField(default=100.0)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="scores")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="unique_user_score_date"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "-score"], name="score_date_score_idx"),
+        ]
+
+
+class ScoreBucket(models.Model):
+    """
+    날짜별 점수 분포 (점수 값별 인원, 순위), 순위/백분위 조회용
+    점수는 일 단위 배치(calculate_score, backfill_scores)로만 저장되므로 배치 끝에 날짜 단위로 다시 만듦
+    """
+
+    date = models.DateField()
+    score = models.IntegerField()
+    count = models.IntegerField(default=0)
+    rank = models.IntegerField(default=1)  # 이 점수의 순위 (자신보다 높은 점수 인원 + 1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "score"], name="unique_score_bucket"),
+        ]
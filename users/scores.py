@@ -0,0 +1,128 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from users.models import Score, ScoreBucket
+
+SCORE_HISTORY_DAYS = (7, 30, 90)
+SCORE_HISTORY_TIMEOUT = 60 * 60 * 24
+SCORE_VERSION_KEY = "scores:version"
+
+
+def get_percentage(rank, total):
+    """상위 백분위 (자신보다 점수가 높은 사용자 비율), 1명뿐이면 100"""
+    return round(((rank - 1) / total * 100), 2) if total > 1 else 100.0
+
+
+def save_score_buckets(target_date, ranks):
+    """
+    해당 날짜 점수 분포 저장
+    ranks: 점수 값별 (점수, 순위, 인원) 목록 (update_user_percentages에서 계산한 값)
+    점수는 일 단위 배치로만 저장되므로 점수를 쓸 때마다 갱신하지 않고 배치 끝에 날짜 단위로 다시 만듦
+    """
+    with transaction.atomic():
+        ScoreBucket.objects.filter(date=target_date).delete()
+        ScoreBucket.objects.bulk_create(
+            [
+                ScoreBucket(date=target_date, score=score, rank=rank, count=n)
+                for score, rank, n in ranks
+            ],
+            batch_size=1000,
+        )
+
+
+def get_score_rank(user):
+    """
+    사용자의 최신 점수 기준 순위
+    (date, score) unique 인덱스로 자신의 점수 구간과 최하위 구간만 조회 (점수 종류 수와 무관)
+    """
+    latest = (
+        Score.objects.filter(user=user).order_by("-date").values("date", "score").first()
+    )
+    if latest is None:
+        return None
+
+    buckets = ScoreBucket.objects.filter(date=latest["date"])
+    bucket = buckets.filter(score=latest["score"]).values("rank").first()
+    lowest = buckets.order_by("score").values("rank", "count").first()
+    if bucket is None or lowest is None:
+        # 점수 분포가 아직 만들어지지 않은 날짜 (배치 진행 중)
+        counts = Score.objects.filter(date=latest["date"]).aggregate(
+            higher=Count("id", filter=Q(score__gt=latest["score"])),
+            total=Count("id"),
+        )
+        rank, total = counts["higher"] + 1, counts["total"]
+    else:
+        rank = bucket["rank"]
+        total = lowest["rank"] + lowest["count"] - 1
+    return {
+        "date": latest["date"],
+        "score": latest["score"],
+        "rank": rank,
+        "total": total,
+        "percentage": get_percentage(rank, total),
+    }
+
+
+def get_leaderboard(target_date, limit, user=None):
+    """해당 날짜 상위 limit명 (동점자는 같은 순위)"""
+    scores = list(
+        Score.objects.filter(date=target_date)
+        .order_by("-score", "id")
+        .values_list("user_id", "score")[:limit]
+    )
+
+    leaderboard = []
+    for index, (user_id, score) in enumerate(scores):
+        if index == 0 or score != scores[index - 1][1]:
+            rank = index + 1
+        leaderboard.append(
+            {
+                "rank": rank,
+                "score": score,
+                "is_me": user is not None and user_id == user.id,
+            }
+        )
+    return leaderboard
+
+
+# ------------------------------- 점수 기록 캐시 ------------------------------- #
+def get_score_version():
+    """점수가 새로 저장될 때마다 바뀌는 값, 사용자별 점수 기록 캐시 키에 포함"""
+    version = cache.get(SCORE_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(SCORE_VERSION_KEY, version, timeout=None)
+        version = cache.get(SCORE_VERSION_KEY, version)
+    return version
+
+
+def invalidate_score_history():
+    """전체 사용자 점수 기록 캐시 무효화 (이전 버전 키는 timeout으로 만료)"""
+    cache.set(SCORE_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_score_history(user):
+    """
+    최근 점수 기록(최대 90개, 오래된 순) + 최신 최고 점수/백분위
+    쿼리 한 번으로 가져와 사용자별로 캐시, 기간별 응답은 캐시된 목록을 잘라서 사용
+    """
+    key = f"scores:history:{user.id}:{get_score_version()}"
+    history = cache.get(key)
+    if history is not None:
+        return history
+
+    rows = list(
+        Score.objects.filter(user=user)
+        .order_by("-date")
+        .values("date", "score", "highest", "percentage")[: max(SCORE_HISTORY_DAYS)]
+    )
+    history = {
+        "scores": [(row["date"], row["score"]) for row in reversed(rows)],
+        "highest": rows[0]["highest"] if rows else None,
+        "percentage": rows[0]["percentage"] if rows else None,
+    }
+    cache.set(key, history, timeout=SCORE_HISTORY_TIMEOUT)
+    return history
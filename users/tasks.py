@@ -1,8 +1,19 @@
 from datetime import date, timedelta
+import logging
+import time
 from celery import shared_task
+from django.utils import timezone
 from .models import User, Score
-from schedules.models import Schedule
-from django.db.models import Max
+from schedules.models import ScheduleDailyCount
+from schedules.utils import bulk_upsert
+from users.scores import get_percentage, invalidate_score_history, save_score_buckets
+from django.db import connection
+from django.db.models import Case, Count, F, FloatField, Max, Q, Value, When, Window
+from django.db.models.functions import Rank
+
+logger = logging.getLogger("schedulo")
+
+SCORE_BATCH_SIZE = 1000
 
 
 def calculate_score_by_ratio(ratio, schedules_count):
@@ -40,79 +51,279 @@ def apply_streak_bonus(ratio_today, ratio_yesterday, ratio_two_days_ago):
     return bonus
 
 
+def get_ratio(counts):
+    """(전체, 완료) 일정 수로 달성률 계산, 일정이 없으면 0"""
+    total, completed = counts
+    return completed / total if total else 0
+
+
+def compute_daily_score(score, highest, today_counts, yesterday_counts, two_days_ago_counts):
+    """
+    전날 점수, 최고 점수와 3일치 (전체, 완료) 일정 수로 오늘 점수와 최고 점수 계산
+    """
+    schedules_count = today_counts[0]
+
+    # 일정 없는 경우 점수 변동 없음
+    if schedules_count == 0:
+        return score, highest
+
+    # 오늘 달성률
+    ratio_today = get_ratio(today_counts)
+
+    # 점수 계산
+    score += calculate_score_by_ratio(ratio_today, schedules_count)
+
+    # streak 보너스/패널티 적용
+    score += apply_streak_bonus(
+        ratio_today, get_ratio(yesterday_counts), get_ratio(two_days_ago_counts)
+    )
+
+    # 최고 점수 갱신
+    return score, max(highest, score)
+
+
 @shared_task
 def calculate_score():
-    users = User.objects.all()
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    two_days_ago = today - timedelta(days=2)
+    elapsed = {}
+    started = time.perf_counter()
 
-    for user in users:
-        # 기본 점수
-        if not user.scores.exists():
-            score = 100
-            highest = score
+    user_ids = list(User.objects.values_list("id", flat=True))
+
+    # 1. 3일치 날짜별 일정 수 (user, date, 전체, 완료) 조회
+    phase_started = time.perf_counter()
+    schedule_counts = {
+        (user_id, day): (total, completed)
+        for user_id, day, total, completed in ScheduleDailyCount.objects.filter(
+            date__range=[two_days_ago, today]
+        ).values_list("user_id", "date", "total", "completed")
+    }
+    elapsed["schedules"] = time.perf_counter() - phase_started
+
+    # 2. 사용자별 어제 점수, 최고 점수 집계 (재실행 시 오늘 점수는 제외)
+    phase_started = time.perf_counter()
+    previous_scores = {
+        row["user_id"]: row
+        for row in Score.objects.filter(date__lt=today)
+        .values("user_id")
+        .annotate(
+            max_score=Max("score"),
+            yesterday_score=Max("score", filter=Q(date=yesterday)),
+        )
+        .order_by()
+    }
+    elapsed["scores"] = time.perf_counter() - phase_started
+
+    # 3. 오늘 점수 계산
+    phase_started = time.perf_counter()
+    no_schedules = (0, 0)
+    new_scores = []
+    for user_id in user_ids:
+        previous = previous_scores.get(user_id)
+        if previous is None:
+            # 기본 점수
+            score, highest = 100, 100
         else:
-            # 어제 점수 가져오기
-            yesterday_score_obj = user.scores.filter(date=(date.today() - timedelta(days=1))).first()
-            score = yesterday_score_obj.score if yesterday_score_obj else 100
-            # 최고 점수 갱신
-            highest = user.scores.aggregate(MaxScore=Max('score'))['MaxScore'] or 100
-
-        # 오늘 일정 불러오기
-        schedules = Schedule.objects.filter(user=user, scheduled_date=date.today())
-        schedules_count = schedules.count()
-        completed_schedules_count = schedules.filter(is_completed=True).count()
-
-        # 일정 없는 경우 점수 변동 없음
-        if schedules_count == 0:
-            user_score = Score.objects.create(
-                user=user,
-                score=score,
-                highest=highest,
-                date=date.today()
+            # 어제 점수, 최고 점수
+            score = previous["yesterday_score"]
+            score = score if score is not None else 100
+            highest = previous["max_score"] or 100
+
+        score, highest = compute_daily_score(
+            score,
+            highest,
+            schedule_counts.get((user_id, today), no_schedules),
+            schedule_counts.get((user_id, yesterday), no_schedules),
+            schedule_counts.get((user_id, two_days_ago), no_schedules),
+        )
+
+        # 오늘 점수 저장 (highest는 지금까지 최고 점수 반영)
+        new_scores.append(
+            Score(user_id=user_id, score=score, highest=highest, date=today)
+        )
+    elapsed["compute"] = time.perf_counter() - phase_started
+
+    # 4. 일괄 저장, 같은 날 다시 실행되면 (user, date) 기준으로 덮어씀
+    phase_started = time.perf_counter()
+    bulk_upsert(
+        Score,
+        new_scores,
+        unique_fields=["user", "date"],
+        update_fields=["score", "highest"],
+        batch_size=SCORE_BATCH_SIZE,
+    )
+    elapsed["write"] = time.perf_counter() - phase_started
+
+    # 오늘 점수 기준으로 백분위 갱신
+    phase_started = time.perf_counter()
+    update_user_percentages()
+    elapsed["percentages"] = time.perf_counter() - phase_started
+    elapsed["total"] = time.perf_counter() - started
+
+    logger.info(
+        f"📈 점수 계산 완료 - 사용자 수: {len(new_scores)}, 소요 시간: "
+        + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in elapsed.items())
+    )
+
+
+def replay_scores(user_ids, start, end):
+    """
+    start ~ end 기간의 점수를 날짜 순서대로 다시 계산해 덮어씀 (점수 규칙 변경 후 재계산용)
+    전날 점수, 최고 점수는 메모리에 유지하며 하루씩 진행, 가입일 이전 날짜는 건너뜀
+    """
+    joined = {
+        user_id: timezone.localdate(date_joined)
+        for user_id, date_joined in User.objects.filter(id__in=user_ids).values_list(
+            "id", "date_joined"
+        )
+    }
+
+    # 기간(+ 앞 2일) 날짜별 일정 수
+    schedule_counts = {
+        (user_id, day): (total, completed)
+        for user_id, day, total, completed in ScheduleDailyCount.objects.filter(
+            user_id__in=joined, date__range=[start - timedelta(days=2), end]
+        ).values_list("user_id", "date", "total", "completed")
+    }
+
+    # 시작일 이전 점수로 초기 상태 구성: user_id -> [전날 점수, 최고 점수]
+    state = {
+        row["user_id"]: [row["yesterday_score"], row["max_score"]]
+        for row in Score.objects.filter(user_id__in=joined, date__lt=start)
+        .values("user_id")
+        .annotate(
+            max_score=Max("score"),
+            yesterday_score=Max("score", filter=Q(date=start - timedelta(days=1))),
+        )
+        .order_by()
+    }
+
+    no_schedules = (0, 0)
+    buffer = []
+    written = 0
+    day = start
+    while day <= end:
+        yesterday = day - timedelta(days=1)
+        two_days_ago = day - timedelta(days=2)
+        for user_id, joined_date in joined.items():
+            if day < joined_date:
+                continue
+
+            previous = state.get(user_id)
+            if previous is None:
+                score, highest = 100, 100
+            else:
+                score = previous[0] if previous[0] is not None else 100
+                highest = previous[1] or 100
+
+            score, highest = compute_daily_score(
+                score,
+                highest,
+                schedule_counts.get((user_id, day), no_schedules),
+                schedule_counts.get((user_id, yesterday), no_schedules),
+                schedule_counts.get((user_id, two_days_ago), no_schedules),
             )
-            user_score.save()
-            continue
+            buffer.append(Score(user_id=user_id, score=score, highest=highest, date=day))
 
-        # 오늘 달성률
-        ratio_today = completed_schedules_count / schedules_count
+            # 다음 날을 위한 상태 갱신
+            max_score = previous[1] if previous and previous[1] is not None else score
+            state[user_id] = [score, max(max_score, score)]
 
-        # 점수 계산
-        score += calculate_score_by_ratio(ratio_today, schedules_count)
+        if len(buffer) >= SCORE_BATCH_SIZE:
+            written += _write_scores(buffer)
+            buffer = []
+        day += timedelta(days=1)
 
-        # streak 보너스/패널티 적용
-        ratio_yesterday, ratio_two_days_ago = 0, 0
+    written += _write_scores(buffer)
+    return written
 
-        yesterday_schedules = Schedule.objects.filter(user=user, scheduled_date=(date.today() - timedelta(days=1)))
 
-        if yesterday_schedules.exists():
-            ratio_yesterday = yesterday_schedules.filter(is_completed=True).count() / yesterday_schedules.count()
+def _write_scores(scores):
+    bulk_upsert(
+        Score,
+        scores,
+        unique_fields=["user", "date"],
+        update_fields=["score", "highest"],
+        batch_size=SCORE_BATCH_SIZE,
+    )
+    return len(scores)
 
-        two_days_schedules = Schedule.objects.filter(user=user, scheduled_date=(date.today() - timedelta(days=2)))
-        
-        if two_days_schedules.exists():
-            ratio_two_days_ago = two_days_schedules.filter(is_completed=True).count() / two_days_schedules.count()
 
-        score += apply_streak_bonus(ratio_today, ratio_yesterday, ratio_two_days_ago)
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+def backfill_scores_task(self, user_ids, start, end):
+    """사용자 묶음 하나의 점수 재계산 (실패 시 해당 묶음만 재시도)"""
+    started = time.perf_counter()
+    written = replay_scores(user_ids, date.fromisoformat(start), date.fromisoformat(end))
+    logger.info(
+        f"📈 점수 재계산 - 사용자 {len(user_ids)}명, {written}건, "
+        f"{time.perf_counter() - started:.3f}s"
+    )
+    return written
 
-        # 최고 점수 갱신
-        highest = max(highest, score)
 
-        # 오늘 점수 저장 (highest는 지금까지 최고 점수 반영)
-        Score.objects.create(
-            user=user,
-            score=score,
-            highest=highest,
-            date=date.today()
+@shared_task
+def finish_score_backfill(results, start, end):
+    """모든 묶음이 끝난 뒤 기간 내 날짜별 백분위 갱신"""
+    day, end = date.fromisoformat(start), date.fromisoformat(end)
+    while day <= end:
+        update_user_percentages(day)
+        day += timedelta(days=1)
+    logger.info(f"📈 점수 재계산 완료 - {start} ~ {end}, {sum(results)}건")
+    return sum(results)
+
+
+def get_score_ranks(target_date):
+    """
+    해당 날짜 점수별 (점수, 순위, 인원) 목록, 동점자는 같은 순위
+    window 함수를 지원하면 DB에서 순위를 매기고, 아니면 점수별 인원으로 메모리에서 계산
+    """
+    scores = Score.objects.filter(date=target_date).order_by()
+    if connection.features.supports_over_clause:
+        return list(
+            scores.annotate(
+                rank=Window(Rank(), order_by=F("score").desc()),
+                n=Window(Count("id"), partition_by=[F("score")]),
+            )
+            .values_list("score", "rank", "n")
+            .distinct()
         )
 
-    # 오늘 점수 기준으로 백분위 갱신
-    update_user_percentages()
+    counts = dict(
+        scores.values("score").annotate(n=Count("id")).values_list("score", "n")
+    )
+    ranks = []
+    rank = 1
+    for score in sorted(counts, reverse=True):
+        ranks.append((score, rank, counts[score]))
+        rank += counts[score]
+    return ranks
+
 
+def update_user_percentages(target_date=None):
+    """
+    오늘 점수 기준 백분위 및 점수 분포 갱신
+    같은 점수는 같은 백분위이므로 점수 값별 CASE 문으로 묶어 UPDATE (행 수가 아닌 점수 종류 수에 비례)
+    """
+    target_date = target_date or date.today()
+    ranks = get_score_ranks(target_date)
+    total = sum(n for _, _, n in ranks)
+    save_score_buckets(target_date, ranks)
 
-def update_user_percentages():
-    scores = list(Score.objects.filter(date=date.today()).order_by("-score"))
-    total = len(scores)
+    for i in range(0, len(ranks), SCORE_BATCH_SIZE):
+        chunk = ranks[i : i + SCORE_BATCH_SIZE]
+        Score.objects.filter(
+            date=target_date, score__in=[score for score, _, _ in chunk]
+        ).update(
+            percentage=Case(
+                *[
+                    When(score=score, then=Value(get_percentage(rank, total)))
+                    for score, rank, _ in chunk
+                ],
+                output_field=FloatField(),
+            )
+        )
 
-    for index, score in enumerate(scores):
-        percentage = round((index / total * 100), 2) if total > 1 else 100.0
-        score.percentage = percentage
-        score.save()
+    # 점수/백분위가 바뀌었으므로 점수 기록 캐시 무효화
+    invalidate_score_history()
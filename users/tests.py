@@ -1,3 +1,804 @@
-from django.test import TestCase
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from schedules.models import ScheduleDailyCount
+from users.crawlers import (
+    CrawlerBusyError,
+    CrawlerError,
+    DriverPool,
+    HttpCrawler,
+    LoginError,
+    PooledDriver,
+    SeleniumCrawler,
+    crawl_slot,
+    fetch_syllabi,
+    get_crawler,
+    get_semester,
+)
+from users.models import Score, ScoreBucket, User
+from users.tasks import calculate_score, get_score_ranks, update_user_percentages
+from users.utils import parse_calendar_courses, parse_calendar_events, parse_syllabus
+
+LOGIN_PAGE = """
+<div id="region-main"><form action="https://ecampus.smu.ac.kr/login/index.php" method="post">
+  <input type="hidden" name="logintoken" value="token123">
+  <input type="text" name="username"><input type="password" name="password">
+  <input type="submit" name="loginbutton">
+</form></div>
+"""
+LOGIN_ERROR_PAGE = LOGIN_PAGE.replace(
+    "</form>", "<p>아이디 또는 패스워드가 잘못 입력되었습니다.</p></form>"
+)
+SYLLABUS_PAGE = """
+<div id="region-main"><table>
+  <tr><th>교과목명</th><td>자료구조</td></tr>
+  <tr><th>강의시간</th><td>월1,2(G301) 수3-5(G302)</td></tr>
+</table></div>
+"""
+CALENDAR_PAGE = """
+<select class="select autosubmit cal_courses_flt" name="course">
+  <option value="1">전체</option>
+  <option value="101">[1학기]자료구조(01)</option>
+  <option value="202">[2학기]운영체제(02)</option>
+</select>
+<div class="day"><a>3</a></div><ul class="events-new"><li class="calendar_event_course"><a>과제 1</a></li></ul>
+<div class="day"><a>4</a></div><ul class="events-new"></ul>
+"""
+
+
+def make_response(url, text, status_code=200):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+class EcampusParseTest(TestCase):
+    """eCampus 페이지 파싱 (HTTP/Selenium 공통)"""
+
+    def test_parse_syllabus(self):
+        name, course_time, schedules = parse_syllabus(SYLLABUS_PAGE, "10")
+        self.assertEqual(name, "자료구조")
+        self.assertEqual(course_time, "월1,2(G301) 수3-5(G302)")
+        self.assertEqual(
+            schedules,
+            [
+                ("월", "09:00~10:00", "G301"),
+                ("월", "10:00~11:00", "G301"),
+                ("수", "11:00~12:00", "G302"),
+                ("수", "12:00~13:00", "G302"),
+            ],
+        )
+
+    def test_parse_calendar(self):
+        self.assertEqual(
+            parse_calendar_courses(CALENDAR_PAGE, "1학기"),
+            [("[1학기]자료구조(01)", "101")],
+        )
+        self.assertEqual(parse_calendar_events(CALENDAR_PAGE), {"3": ["과제 1"]})
+
+
+class HttpCrawlerTest(TestCase):
+    """브라우저 없이 로그인/페이지 요청"""
+
+    def setUp(self):
+        self.crawler = HttpCrawler()
+        self.request = mock.patch.object(self.crawler.session, "request").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_login_posts_form(self):
+        self.request.side_effect = [
+            make_response("https://ecampus.smu.ac.kr/login.php", LOGIN_PAGE),
+            make_response("https://ecampus.smu.ac.kr/", "<html></html>"),
+        ]
+        self.crawler.login("202400001", "pw")
+
+        method, url = self.request.call_args.args
+        self.assertEqual(method, "POST")
+        self.assertEqual(url, "https://ecampus.smu.ac.kr/login/index.php")
+        self.assertEqual(
+            self.request.call_args.kwargs["data"],
+            {"logintoken": "token123", "username": "202400001", "password": "pw"},
+        )
+
+    def test_login_error(self):
+        self.request.side_effect = [
+            make_response("https://ecampus.smu.ac.kr/login.php", LOGIN_PAGE),
+            make_response("https://ecampus.smu.ac.kr/login.php", LOGIN_ERROR_PAGE),
+        ]
+        with self.assertRaises(LoginError):
+            self.crawler.login("202400001", "wrong")
+
+    def test_login_form_missing(self):
+        self.request.return_value = make_response(
+            "https://ecampus.smu.ac.kr/login.php", "<html></html>"
+        )
+        with self.assertRaises(CrawlerError):
+            self.crawler.login("202400001", "pw")
+
+    def test_course_events_by_option_value(self):
+        self.request.return_value = make_response(
+            "https://ecampus.smu.ac.kr/calendar/view.php", CALENDAR_PAGE
+        )
+        events = self.crawler.get_course_events(2025, 3, ("[1학기]자료구조(01)", "101"))
+        self.assertEqual(events, {"3": ["과제 1"]})
+        self.assertIn("course=101", self.request.call_args.args[1])
+
+    def test_session_expired(self):
+        self.request.return_value = make_response(
+            "https://ecampus.smu.ac.kr/login.php", LOGIN_PAGE
+        )
+        self.assertEqual(
+            self.crawler.get_syllabus("10"), ("정보 없음", "정보 없음", [])
+        )
+
+    @override_settings(CRAWLER_SYLLABUS_WORKERS=4)
+    def test_syllabi_fetched_concurrently(self):
+        def slow_request(method, url, **kwargs):
+            time.sleep(0.2)
+            return make_response(url, SYLLABUS_PAGE)
+
+        self.request.side_effect = slow_request
+        started = time.monotonic()
+        syllabi = self.crawler.get_syllabi(["1", "2", "3", "4"])
+
+        # 순서대로 요청하면 0.8초
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(set(syllabi), {"1", "2", "3", "4"})
+        self.assertEqual(syllabi["3"][0], "자료구조")
+
+
+@override_settings(CRAWLER_BACKEND="http")
+class GetCrawlerTest(TestCase):
+    """HTTP 로그인이 불가능할 때만 Selenium 사용"""
+
+    def test_fallback_to_selenium(self):
+        @contextmanager
+        def fake_driver():
+            yield object()
+
+        with mock.patch.object(
+            HttpCrawler, "login", side_effect=CrawlerError("폼 없음")
+        ), mock.patch("users.crawlers.get_driver", fake_driver), mock.patch.object(
+            SeleniumCrawler, "login"
+        ):
+            with get_crawler("202400001", "pw") as crawler:
+                self.assertIsInstance(crawler, SeleniumCrawler)
+
+    def test_login_error_does_not_fallback(self):
+        with mock.patch.object(
+            HttpCrawler, "login", side_effect=LoginError("실패")
+        ), mock.patch("users.crawlers.get_driver") as get_driver:
+            with self.assertRaises(LoginError):
+                with get_crawler("202400001", "wrong"):
+                    pass
+        get_driver.assert_not_called()
+
+
+class DriverPoolTest(TestCase):
+    """Chrome 재사용/초기화/교체 (실제 Chrome 대신 가짜 드라이버)"""
+
+    def setUp(self):
+        self.launched = []
+
+        def launch():
+            entry = PooledDriver(mock.Mock(), None)
+            entry.driver.execute_script.return_value = 1
+            entry.driver.window_handles = ["main"]
+            entry.driver.service.process.pid = -1
+            self.launched.append(entry)
+            return entry
+
+        patcher = mock.patch.object(PooledDriver, "launch", side_effect=launch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.slot_dir = tempfile.mkdtemp()
+        self.pool = DriverPool(
+            size=1, max_uses=3, max_rss_mb=500, slot_dir=self.slot_dir, pooled=True
+        )
+
+    def test_reuses_and_resets(self):
+        for _ in range(2):
+            with self.pool.acquire() as driver:
+                pass
+        self.assertEqual(len(self.launched), 1)
+        self.assertEqual(driver.execute_cdp_cmd.call_count, 6)  # 반납마다 3번
+        driver.get.assert_called_with("about:blank")
+
+    def test_recycles_after_max_uses(self):
+        for _ in range(4):
+            with self.pool.acquire():
+                pass
+        self.assertEqual(len(self.launched), 2)
+        self.launched[0].driver.quit.assert_called_once()
+
+    def test_replaces_dead_driver(self):
+        with self.pool.acquire() as driver:
+            pass
+        driver.execute_script.side_effect = Exception("disconnected")
+        with self.pool.acquire() as new_driver:
+            pass
+        self.assertIsNot(new_driver, driver)
+        driver.quit.assert_called_once()
+
+    def test_recycles_on_memory_limit(self):
+        with mock.patch.object(PooledDriver, "rss_mb", return_value=800):
+            with self.pool.acquire() as driver:
+                pass
+        driver.quit.assert_called_once()
+        self.assertEqual(self.pool._idle, [])
+
+    @override_settings(CRAWLER_CHROME_SLOTS=1, CRAWLER_SLOT_TIMEOUT=0)
+    def test_idle_pool_does_not_block_other_process(self):
+        # 대기 중인 Chrome은 자리를 차지하지 않아 다른 프로세스도 바로 크롤링
+        self.pool.warm_up()
+        self.assertEqual(len(self.pool._idle), 1)
+        with multiprocessing.get_context("fork").Pool(1) as processes:
+            self.assertEqual(processes.apply(take_slot, (self.slot_dir,)), 0)
+
+            # 빌려 쓰는 동안에는 자리를 차지
+            with self.pool.acquire():
+                with self.assertRaises(CrawlerBusyError):
+                    processes.apply(take_slot, (self.slot_dir,))
+        self.assertEqual(len(self.launched), 1)
+        self.pool.close()
+
+    def test_unpooled_quits_after_use(self):
+        pool = DriverPool(size=1, max_uses=3, max_rss_mb=500, slot_dir=self.slot_dir)
+        for _ in range(2):
+            with pool.acquire() as driver:
+                pass
+            driver.quit.assert_called_once()
+        self.assertEqual(len(self.launched), 2)
+        self.assertEqual(pool._idle, [])
+
+
+def take_slot(slot_dir):
+    """다른 프로세스에서 기다리지 않고 자리 하나를 잡았다가 반납"""
+    with crawl_slot(slots=1, timeout=0, slot_dir=slot_dir) as slot:
+        return slot
+
+
+def fake_crawl(args):
+    """슬롯을 잡고 자기 프로필 디렉토리에 기록 후 확인 (다른 크롤링과 겹치면 실패)"""
+    name, slot_dir, log_path = args
+    with crawl_slot(slots=2, timeout=30, slot_dir=slot_dir) as slot:
+        with open(log_path, "a") as log:
+            log.write(f"start {time.monotonic()}\n")
+        profile = tempfile.mkdtemp(prefix="chrome-profile-")
+        with open(os.path.join(profile, "owner"), "w") as f:
+            f.write(name)
+        time.sleep(0.05)
+        with open(os.path.join(profile, "owner")) as f:
+            owner = f.read()
+        with open(log_path, "a") as log:
+            log.write(f"end {time.monotonic()}\n")
+    return slot, profile, owner == name
+
+
+class ConcurrentCrawlTest(TestCase):
+    """동시에 여러 크롤링을 실행해도 슬롯 제한을 지키고 서로 간섭하지 않는지"""
+
+    def setUp(self):
+        self.slot_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.slot_dir, "log")
+
+    def max_running(self):
+        events = []
+        with open(self.log_path) as log:
+            for line in log:
+                kind, at = line.split()
+                # 같은 시각이면 종료를 먼저 처리
+                events.append((float(at), kind == "start"))
+        running = peak = 0
+        for _, is_start in sorted(events):
+            running += 1 if is_start else -1
+            peak = max(peak, running)
+        return peak
+
+    def check(self, results, count):
+        slots, profiles, owned = zip(*results)
+        self.assertEqual(len(results), count)
+        self.assertTrue(all(owned))
+        self.assertEqual(len(set(profiles)), count)
+        self.assertTrue(set(slots) <= {0, 1})
+        self.assertLessEqual(self.max_running(), 2)
+
+    def test_threads(self):
+        args = [(f"t{i}", self.slot_dir, self.log_path) for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(fake_crawl, args))
+        self.check(results, 8)
+
+    def test_processes(self):
+        args = [(f"p{i}", self.slot_dir, self.log_path) for i in range(6)]
+        with multiprocessing.get_context("fork").Pool(6) as pool:
+            results = pool.map(fake_crawl, args)
+        self.check(results, 6)
+
+    def test_busy_timeout(self):
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with crawl_slot(slots=1, timeout=0, slot_dir=self.slot_dir):
+                held.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait(5)
+        try:
+            with self.assertRaises(CrawlerBusyError):
+                with crawl_slot(slots=1, timeout=0.3, slot_dir=self.slot_dir):
+                    pass
+        finally:
+            release.set()
+            thread.join()
+
+    def test_chrome_options_are_unique(self):
+        with mock.patch("users.crawlers.webdriver.Chrome") as chrome, mock.patch(
+            "users.crawlers.get_chromedriver_path", return_value="/bin/true"
+        ):
+            entries = [PooledDriver.launch() for _ in range(3)]
+        for entry in entries:
+            entry.quit()
+
+        arguments = [call.kwargs["options"].arguments for call in chrome.call_args_list]
+        profiles = {
+            arg
+            for args in arguments
+            for arg in args
+            if arg.startswith("--user-data-dir")
+        }
+        self.assertEqual(len(profiles), 3)
+        self.assertFalse(
+            any(
+                arg.startswith("--remote-debugging-port")
+                for args in arguments
+                for arg in args
+            )
+        )
+
+
+class SyllabusCacheTest(TestCase):
+    """강의 계획서는 과목/학기 단위로 사용자 간 공유"""
+
+    def setUp(self):
+        cache.clear()
+        self.crawler = mock.Mock()
+        self.crawler.get_syllabi.side_effect = lambda course_ids: {
+            course_id: (
+                ("정보 없음", "정보 없음", [])
+                if course_id == "404"
+                else ("자료구조", "월1(G301)", [("월", "09:00~10:00", "G301")])
+            )
+            for course_id in course_ids
+        }
+
+    def test_shared_between_crawls(self):
+        first = fetch_syllabi(self.crawler, ["1", "2"], "2025-1")
+        second = fetch_syllabi(mock.Mock(), ["1", "2"], "2025-1")
+        self.assertEqual(first, second)
+        self.crawler.get_syllabi.assert_called_once_with(["1", "2"])
+
+    def test_only_missing_courses_fetched(self):
+        fetch_syllabi(self.crawler, ["1"], "2025-1")
+        fetch_syllabi(self.crawler, ["1", "2"], "2025-1")
+        self.crawler.get_syllabi.assert_called_with(["2"])
+        # 다른 학기는 따로 저장
+        fetch_syllabi(self.crawler, ["1"], "2025-2")
+        self.crawler.get_syllabi.assert_called_with(["1"])
+
+    def test_failed_parse_not_cached(self):
+        fetch_syllabi(self.crawler, ["404"], "2025-1")
+        fetch_syllabi(self.crawler, ["404"], "2025-1")
+        self.assertEqual(self.crawler.get_syllabi.call_count, 2)
+
+    def test_invalidate_command(self):
+        fetch_syllabi(self.crawler, ["1", "2"], "2025-1")
+        call_command(
+            "invalidate_syllabus_cache", "1", semester="2025-1", stdout=StringIO()
+        )
+        fetch_syllabi(self.crawler, ["1", "2"], "2025-1")
+        self.crawler.get_syllabi.assert_called_with(["1"])
+
+        call_command("invalidate_syllabus_cache", all=True, stdout=StringIO())
+        fetch_syllabi(self.crawler, ["1", "2"], "2025-1")
+        self.crawler.get_syllabi.assert_called_with(["1", "2"])
+
+    def test_semester(self):
+        self.assertEqual(get_semester(date(2025, 3, 2)), "2025-1")
+        self.assertEqual(get_semester(date(2025, 9, 1)), "2025-2")
+        self.assertEqual(get_semester(date(2026, 1, 15)), "2025-2")
+
+
+class ScoreRankTest(TestCase):
+    """동점자는 같은 순위, 순위 조회는 점수 분포의 (date, score) 인덱스로"""
+
+    def setUp(self):
+        self.today = date.today()
+        self.users = [User.objects.create(email=f"{i}@test.com") for i in range(6)]
+        for user, score in zip(self.users, [100, 120, 120, 90, 130, 100]):
+            Score.objects.create(user=user, score=score, highest=score, date=self.today)
+        update_user_percentages()
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def test_rank(self):
+        # 최신 점수 1번 + 자신의 점수 구간 1번 + 최하위 구간 1번
+        with self.assertNumQueries(3):
+            response = self.client.get("/users/scores/rank/")
+        self.assertEqual(response.data["rank"], 4)
+        self.assertEqual(response.data["total"], 6)
+        self.assertEqual(
+            response.data["percentage"],
+            Score.objects.get(user=self.users[0], date=self.today).percentage,
+        )
+
+    def test_buckets_rebuilt_per_date(self):
+        update_user_percentages()
+        self.assertEqual(
+            list(
+                ScoreBucket.objects.filter(date=self.today)
+                .order_by("-score")
+                .values_list("score", "rank", "count")
+            ),
+            [(130, 1, 1), (120, 2, 2), (100, 4, 2), (90, 6, 1)],
+        )
+
+    def test_no_score(self):
+        self.client.force_authenticate(User.objects.create(email="new@test.com"))
+        self.assertEqual(self.client.get("/users/scores/rank/").status_code, 204)
+
+    def test_rank_without_buckets(self):
+        ScoreBucket.objects.all().delete()
+        response = self.client.get("/users/scores/rank/")
+        self.assertEqual((response.data["rank"], response.data["total"]), (4, 6))
+
+    def test_leaderboard_ties(self):
+        response = self.client.get("/users/scores/leaderboard/", {"limit": 4})
+        leaderboard = response.data["leaderboard"]
+        self.assertEqual([entry["rank"] for entry in leaderboard], [1, 2, 2, 4])
+        self.assertEqual(
+            [entry["score"] for entry in leaderboard], [130, 120, 120, 100]
+        )
+        self.assertEqual([entry["is_me"] for entry in leaderboard].count(True), 1)
+
+
+class ScoreCalculationTest(TestCase):
+    """날짜별 일정 수와 이전 점수로 계산한 오늘 점수"""
+
+    def setUp(self):
+        self.today = date.today()
+        self.users = {}
+
+    def create_user(self, name, scores=(), counts=()):
+        """scores: (며칠 전, 점수), counts: (며칠 전, 전체, 완료)"""
+        user = User.objects.create(email=f"{name}@test.com")
+        for days, score in scores:
+            Score.objects.create(
+                user=user, score=score, date=self.today - timedelta(days=days)
+            )
+        for days, total, completed in counts:
+            ScheduleDailyCount.objects.create(
+                user=user,
+                date=self.today - timedelta(days=days),
+                total=total,
+                completed=completed,
+            )
+        self.users[name] = user
+
+    def today_scores(self):
+        return {
+            name: tuple(
+                Score.objects.filter(user=user, date=self.today).values_list(
+                    "score", "highest"
+                )[0]
+            )
+            for name, user in self.users.items()
+        }
+
+    def test_scores(self):
+        self.create_user("new")
+        self.create_user("idle", scores=[(1, 90), (3, 95)])
+        # 80% 이상 +10, 10개 이상 +3 +5
+        self.create_user("busy", scores=[(1, 110), (2, 120)], counts=[(0, 10, 9)])
+        # 60% 이상 +5
+        self.create_user("mid", counts=[(0, 3, 2)])
+        # 80% 이상 +10, 5개 이상 +3, 3일 연속 80% 이상 +10
+        self.create_user(
+            "streak", scores=[(1, 100)], counts=[(0, 5, 4), (1, 1, 1), (2, 2, 2)]
+        )
+        # 60% 미만 -5, 2일 연속 60% 미만 -10
+        self.create_user(
+            "slump", scores=[(1, 100), (5, 130)], counts=[(0, 2, 0), (1, 1, 0)]
+        )
+
+        calculate_score()
+        self.assertEqual(
+            self.today_scores(),
+            {
+                "new": (100, 100),
+                "idle": (90, 95),
+                "busy": (128, 128),
+                "mid": (105, 105),
+                "streak": (123, 123),
+                "slump": (85, 130),
+            },
+        )
+
+    def test_missing_yesterday_score(self):
+        # 어제 점수가 없으면 100점에서 시작, 최고 점수는 유지
+        self.create_user("gap", scores=[(3, 140)], counts=[(0, 1, 1)])
+        calculate_score()
+        self.assertEqual(self.today_scores(), {"gap": (110, 140)})
+
+    def test_query_count_does_not_grow_per_user(self):
+        # 백분위 갱신 쿼리는 ScorePercentageTest에서 확인
+        for i in range(3):
+            self.create_user(f"u{i}", counts=[(0, 2, 1)])
+        with mock.patch("users.tasks.update_user_percentages"):
+            with CaptureQueriesContext(connection) as few:
+                calculate_score()
+
+            Score.objects.filter(date=self.today).delete()
+            for i in range(3, 40):
+                self.create_user(f"u{i}", scores=[(1, 100 + i)], counts=[(0, 2, 1)])
+            with CaptureQueriesContext(connection) as many:
+                calculate_score()
+        self.assertEqual(Score.objects.filter(date=self.today).count(), 40)
+        self.assertEqual(len(many), len(few))
+
+
+class ScorePercentageTest(TestCase):
+    """동점자는 같은 순위/백분위, window 함수가 없는 DB도 같은 결과"""
+
+    def setUp(self):
+        self.today = date.today()
+        scores = [130, 120, 120, 100, 100, 100, 90, 80]
+        for i, score in enumerate(scores):
+            user = User.objects.create(email=f"{i}@test.com")
+            Score.objects.create(user=user, score=score, date=self.today)
+        # 다른 날짜 점수는 영향 없음
+        Score.objects.create(user=user, score=200, date=self.today - timedelta(days=1))
+
+    def percentages(self):
+        return dict(
+            Score.objects.filter(date=self.today).values_list("score", "percentage")
+        )
+
+    def test_ranks_with_ties(self):
+        expected = [(130, 1, 1), (120, 2, 2), (100, 4, 3), (90, 7, 1), (80, 8, 1)]
+        self.assertEqual(sorted(get_score_ranks(self.today), reverse=True), expected)
+        with mock.patch.object(
+            type(connection.features), "supports_over_clause", False
+        ):
+            self.assertEqual(get_score_ranks(self.today), expected)
+
+    def test_percentages(self):
+        update_user_percentages()
+        expected = {130: 0.0, 120: 12.5, 100: 37.5, 90: 75.0, 80: 87.5}
+        self.assertEqual(self.percentages(), expected)
+
+        Score.objects.update(percentage=0)
+        with mock.patch.object(
+            type(connection.features), "supports_over_clause", False
+        ):
+            update_user_percentages()
+        self.assertEqual(self.percentages(), expected)
+
+    def test_single_user(self):
+        Score.objects.filter(date=self.today).exclude(score=130).delete()
+        update_user_percentages()
+        self.assertEqual(self.percentages(), {130: 100.0})
+
+    def test_query_count_does_not_grow_per_user(self):
+        with CaptureQueriesContext(connection) as few:
+            update_user_percentages()
+        for i in range(8, 60):
+            user = User.objects.create(email=f"{i}@test.com")
+            Score.objects.create(user=user, score=80 + i % 5, date=self.today)
+        with CaptureQueriesContext(connection) as many:
+            update_user_percentages()
+        self.assertEqual(len(many), len(few))
+
+
+class ScoreUpsertTest(TestCase):
+    """같은 날 점수 계산을 다시 실행해도 (user, date) 당 한 행, 누적되지 않음"""
+
+    def setUp(self):
+        self.today = date.today()
+        self.user = User.objects.create(email="test@test.com")
+        Score.objects.create(
+            user=self.user, score=100, date=self.today - timedelta(days=1)
+        )
+        self.count = ScheduleDailyCount.objects.create(
+            user=self.user, date=self.today, total=2, completed=2
+        )
+
+    def today_score(self):
+        return Score.objects.filter(user=self.user, date=self.today).values_list(
+            "score", "highest"
+        )
+
+    def test_rerun(self):
+        calculate_score()
+        calculate_score()
+        self.assertEqual(list(self.today_score()), [(110, 110)])
+        self.assertEqual(Score.objects.filter(user=self.user).count(), 2)
+
+    def test_rerun_after_schedules_change(self):
+        calculate_score()
+        # 재실행 시 오늘 점수는 이전 점수로 쓰지 않고 어제 점수에서 다시 계산
+        self.count.completed = 0
+        self.count.save()
+        calculate_score()
+        self.assertEqual(list(self.today_score()), [(85, 100)])  # -5, 2일 연속 -10
+
+    def test_unique_user_date(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Score.objects.create(
+                user=self.user, score=90, date=self.today - timedelta(days=1)
+            )
+
+
+class ScoreBackfillTest(TestCase):
+    """기간 점수 재계산이 매일 calculate_score를 실행한 결과와 같고, 재실행해도 중복 없음"""
+
+    def setUp(self):
+        self.today = date.today()
+        self.start = self.today - timedelta(days=9)
+        self.users = []
+        for i in range(6):
+            user = User.objects.create(email=f"{i}@test.com")
+            self.users.append(user)
+            for days in range(12):
+                total = (i + days) % 7
+                ScheduleDailyCount.objects.create(
+                    user=user,
+                    date=self.today - timedelta(days=days),
+                    total=total,
+                    completed=min(total, (i * days) % 6),
+                )
+        # 가입일을 기간 시작 이전으로 (마지막 사용자는 기간 중간에 가입)
+        User.objects.exclude(id=self.users[-1].id).update(
+            date_joined=self.users[0].date_joined - timedelta(days=30)
+        )
+        User.objects.filter(id=self.users[-1].id).update(
+            date_joined=self.users[0].date_joined - timedelta(days=3)
+        )
+
+    def backfill(self, **options):
+        call_command(
+            "backfill_scores",
+            start=self.start.isoformat(),
+            end=self.today.isoformat(),
+            stdout=StringIO(),
+            **options,
+        )
+
+    def snapshot(self, **filters):
+        return sorted(
+            Score.objects.filter(**filters).values_list(
+                "user_id", "date", "score", "highest", "percentage"
+            )
+        )
+
+    def test_matches_calculate_score(self):
+        self.backfill(chunk_size=4)
+        self.assertEqual(Score.objects.count(), 5 * 10 + 4)
+        self.assertFalse(
+            Score.objects.filter(
+                user=self.users[-1], date__lt=self.today - timedelta(days=3)
+            ).exists()
+        )
+        backfilled = self.snapshot(date=self.today)
+
+        Score.objects.filter(date=self.today).delete()
+        calculate_score()
+        self.assertEqual(self.snapshot(date=self.today), backfilled)
+
+    def test_rerun(self):
+        self.backfill(chunk_size=4)
+        first = self.snapshot()
+        self.backfill(chunk_size=2)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_overwrites_existing_scores(self):
+        self.backfill()
+        first = self.snapshot()
+        Score.objects.filter(date=self.start + timedelta(days=2)).update(
+            score=0, highest=0
+        )
+        self.backfill()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_invalid_range(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "backfill_scores",
+                start=self.today.isoformat(),
+                end=self.start.isoformat(),
+            )
+
+
+class ScoreHistoryTest(TestCase):
+    """점수 기록은 쿼리 한 번으로 불러와 캐시, 점수 계산 후에는 다시 조회"""
+
+    def setUp(self):
+        cache.clear()
+        self.today = date.today()
+        self.user = User.objects.create(email="test@test.com")
+        for i in range(40):
+            Score.objects.create(
+                user=self.user,
+                score=100 + i,
+                highest=100 + i,
+                date=self.today - timedelta(days=40 - i),
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_history(self, **params):
+        response = self.client.get("/users/scores/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_cached_by_period(self):
+        with self.assertNumQueries(1):
+            history = self.get_history()
+        self.assertEqual(
+            [point["y"] for point in history["data"]], list(range(133, 140))
+        )
+        self.assertEqual(history["highest"], 139)
+
+        # 기간이 달라도 캐시된 목록을 잘라서 응답
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.get_history(days=30)["data"]), 30)
+            self.assertEqual(len(self.get_history(days=90)["data"]), 40)
+
+    def test_invalid_days(self):
+        self.assertEqual(
+            self.client.get("/users/scores/", {"days": 8}).status_code, 400
+        )
+        self.assertEqual(
+            self.client.get("/users/scores/", {"days": "a"}).status_code, 400
+        )
+
+    def test_invalidated_after_calculate_score(self):
+        self.get_history()
+        ScheduleDailyCount.objects.create(
+            user=self.user, date=self.today, total=1, completed=0
+        )
+        calculate_score()
+
+        with self.assertNumQueries(1):
+            history = self.get_history()
+        self.assertEqual(history["data"][-1]["y"], 124)  # 139 - 5, 2일 연속 -10
+        self.assertEqual(history["highest"], 139)
+        self.assertEqual(len(self.get_history(days=90)["data"]), 41)
+
+    def test_without_scores(self):
+        self.client.force_authenticate(User.objects.create(email="new@test.com"))
+        history = self.get_history()
+        self.assertEqual((history["highest"], history["percentage"]), (100, 100.0))
+        self.assertEqual(len(history["data"]), 1)
@@ -41,4 +41,10 @@ urlpatterns = [
     ),
     ### score ###
     path("scores/", views.get_user_score, name="get-user-score"),
+    path("scores/rank/", views.get_user_rank, name="get-user-rank"),
+    path(
+        "scores/leaderboard/",
+        views.get_score_leaderboard,
+        name="get-score-leaderboard",
+    ),
 ]
@@ -9,9 +9,9 @@ from datetime import datetime
 import calendar
 import re
 
-from schedules.models import Schedule, Tag, TimeTable
+from schedules.models import Schedule, TimeTable
 from schedules.serializers import ScheduleSerializer
-from schedules.views import tag_colors
+from schedules.utils import bump_schedule_version, resolve_tags
 
 
 # log test
@@ -53,6 +53,37 @@ def check_error(driver):
         return False
 
 
+def parse_login_error(html):
+    """로그인 응답 페이지에 로그인 폼이 남아 있으면 오류 메시지 (성공이면 None)"""
+    soup = BeautifulSoup(html, "lxml")
+    if not soup.select_one("input[name='password']"):
+        return None
+    error = soup.select_one("#region-main form p")
+    return error.get_text(strip=True) if error else "로그인 실패"
+
+
+def parse_courses(html):
+    """메인 페이지에서 수강 중인 과목 (과목명, 과목 id) 목록"""
+    soup = BeautifulSoup(html, "lxml")
+
+    # 과목 리스트 찾기
+    courses = soup.select("ul.my-course-lists > li > div.course_box > a.course_link")
+
+    if not courses:
+        logger.warning("❌ 과목 정보를 찾을 수 없습니다.")
+        return []
+
+    course_info = []
+    for course in courses:
+        title_el = course.select_one("div.course-title > h3")
+        if title_el:
+            course_title = title_el.get_text(strip=True)
+            course_id = course["href"].split("=")[-1]
+            course_info.append((course_title, course_id))
+
+    return course_info
+
+
 def get_courses(driver):
     """수강 중인 과목 정보"""
     driver.get("https://ecampus.smu.ac.kr/")
@@ -61,51 +92,44 @@ def get_courses(driver):
         WebDriverWait(driver, 5).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "ul.my-course-lists"))
         )
-        soup = BeautifulSoup(driver.page_source, "lxml")
-
-        # 과목 리스트 찾기
-        courses = soup.select(
-            "ul.my-course-lists > li > div.course_box > a.course_link"
-        )
-
-        if not courses:
-            logger.warning("❌ 과목 정보를 찾을 수 없습니다.")
-            return []
-
-        course_info = []
-        for course in courses:
-            title_el = course.select_one("div.course-title > h3")
-            if title_el:
-                course_title = title_el.get_text(strip=True)
-                course_id = course["href"].split("=")[-1]
-                course_info.append((course_title, course_id))
-
-        return course_info
+        return parse_courses(driver.page_source)
 
     except Exception as e:
         logger.error("과목 리스트 로딩 실패: %s", e)
         return []
 
 
-def get_syllabus(driver, course_id):
-    """강의 계획서에서 시간표 데이터를 반환"""
-    syllabus_url = (
-        f"https://ecampus.smu.ac.kr/local/ubion/setting/syllabus.php?id={course_id}"
-    )
+def parse_course_time(course_time):
+    """강의시간 문자열 "월1,2(강의실) 수3-5(강의실)" 을 (요일, 시간대, 장소) 목록으로"""
+    schedules = []
+    for slot in course_time.split():
+        match = re.match(r"([월화수목금토일])(\d+(?:,\d+)*|\d+-\d+)\((.*?)\)", slot)
+        if not match:
+            logger.warning(f"⚠️ 강의시간 파싱 실패: {slot}")
+            continue
 
-    try:
-        driver.get(syllabus_url)
-        # WebDriverWait(driver, 5).until(
-        #     EC.presence_of_element_located((By.TAG_NAME, "table"))
-        # )
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.ID, "region-main"))
+        day, periods_part, location = match.groups()
+        periods = (
+            list(map(int, periods_part.split(",")))
+            if "," in periods_part
+            else (
+                list(range(*map(int, periods_part.split("-"))))
+                if "-" in periods_part
+                else [int(periods_part)]
+            )
         )
-    except Exception as e:
-        logger.error("강의 계획서 로딩 실패: %s", e)
-        return "정보 없음", "정보 없음", []
 
-    soup = BeautifulSoup(driver.page_source, "lxml")
+        for period in periods:
+            start_hour = period + 8
+            end_hour = start_hour + 1
+            time_range = f"{start_hour:02d}:00~{end_hour:02d}:00"
+            schedules.append((day, time_range, location))
+    return schedules
+
+
+def parse_syllabus(html, course_id):
+    """강의 계획서 페이지에서 (과목명, 강의시간, 시간표) 반환"""
+    soup = BeautifulSoup(html, "lxml")
 
     # 강의계획서가 없는 경우 (텍스트 기반 체크)
     if soup.find(string=re.compile("등록된 강의계획서가 없습니다")):
@@ -133,30 +157,7 @@ def get_syllabus(driver, course_id):
         # 시간표 정보 정제
         schedules = []
         if course_time != "정보 없음":
-            for slot in course_time.split():
-                match = re.match(
-                    r"([월화수목금토일])(\d+(?:,\d+)*|\d+-\d+)\((.*?)\)", slot
-                )
-                if not match:
-                    logger.warning(f"⚠️ 강의시간 파싱 실패: {slot}")
-                    continue
-
-                day, periods_part, location = match.groups()
-                periods = (
-                    list(map(int, periods_part.split(",")))
-                    if "," in periods_part
-                    else (
-                        list(range(*map(int, periods_part.split("-"))))
-                        if "-" in periods_part
-                        else [int(periods_part)]
-                    )
-                )
-
-                for period in periods:
-                    start_hour = period + 8
-                    end_hour = start_hour + 1
-                    time_range = f"{start_hour:02d}:00~{end_hour:02d}:00"
-                    schedules.append((day, time_range, location))
+            schedules = parse_course_time(course_time)
 
         return course_name, course_time, schedules
 
@@ -165,6 +166,27 @@ def get_syllabus(driver, course_id):
         return "정보 없음", "정보 없음", []
 
 
+def get_syllabus(driver, course_id):
+    """강의 계획서에서 시간표 데이터를 반환"""
+    syllabus_url = (
+        f"https://ecampus.smu.ac.kr/local/ubion/setting/syllabus.php?id={course_id}"
+    )
+
+    try:
+        driver.get(syllabus_url)
+        # WebDriverWait(driver, 5).until(
+        #     EC.presence_of_element_located((By.TAG_NAME, "table"))
+        # )
+        WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.ID, "region-main"))
+        )
+    except Exception as e:
+        logger.error("강의 계획서 로딩 실패: %s", e)
+        return "정보 없음", "정보 없음", []
+
+    return parse_syllabus(driver.page_source, course_id)
+
+
 def save_to_timetable(self, user, courses_data):
     """Save courses_data into the TimeTable model without duplicates."""
     day_map = {
@@ -177,6 +199,13 @@ def save_to_timetable(self, user, courses_data):
         "일": "sun",
     }
 
+    # 수업 시간이 있는 과목명으로 태그를 한 번에 생성
+    tags = resolve_tags(
+        user, [course_name[:30] for course_name, schedules in courses_data if schedules]
+    )
+    for tag in tags:
+        logger.debug(f"✅ 태그 확인: {tag.name}")
+
     for course_name, schedules in courses_data:
         for day, time_range, location in schedules:
             start_str, end_str = time_range.split("~")
@@ -186,13 +215,6 @@ def save_to_timetable(self, user, courses_data):
 
             subject = course_name[:30] if len(course_name) > 30 else course_name
 
-            order = Tag.objects.filter(user=user).count()
-            tag, created = Tag.objects.get_or_create(name=subject, user=user)
-            if created:
-                tag.color = tag_colors[order % len(tag_colors)]
-                tag.save()
-                logger.info(f"✅ 태그 저장: {tag.name}")
-
             # Check for existing entry to avoid duplicates
             existing_entry = TimeTable.objects.filter(
                 subject=subject,
@@ -214,22 +236,63 @@ def save_to_timetable(self, user, courses_data):
                     f"✅ 과목정보 저장:: {subject} ({day_of_week}: {start_time} - {end_time})"
                 )
 
+    bump_schedule_version(user.id)
+
+
+def get_calendar_url(year, month, course=1):
+    """해당 월 달력 페이지 URL (course: 드롭다운 강좌 option value, 1이면 전체)"""
+    timestamp = calendar.timegm(datetime(year, month, 1).timetuple())
+    return f"https://ecampus.smu.ac.kr/calendar/view.php?view=month&course={course}&time={timestamp}"
+
+
+def parse_calendar_courses(html, semester):
+    """달력 페이지 드롭다운에서 해당 학기 강좌 (강좌명, option value) 목록"""
+    soup = BeautifulSoup(html, "lxml")
+    options = soup.select("select.select.autosubmit.cal_courses_flt option")
+    logger.debug("📋 드롭다운 옵션들:")
+    for option in options:
+        logger.debug(f" - {option.get_text(strip=True)}")
+
+    return [
+        (option.get_text(strip=True), option.get("value"))
+        for option in options
+        if f"[{semester}]" in option.get_text()
+    ]
+
+
+def parse_calendar_events(html):
+    """달력 페이지에서 날짜별 이벤트 {"일": [이벤트명, ...]}"""
+    soup = BeautifulSoup(html, "lxml")
+    date_elements = soup.select("div.day a")
+    event_lists = soup.select("ul.events-new")
+
+    logger.debug(
+        f"날짜 요소 개수: {len(date_elements)}, 이벤트 리스트 개수: {len(event_lists)}"
+    )
+
+    events_by_date = {}
+    for i, date_text in enumerate([date.get_text().strip() for date in date_elements]):
+        try:
+            events = event_lists[i].select("li.calendar_event_course a")
+            event_texts = [event.get_text().strip() for event in events]
+            if event_texts:
+                events_by_date[date_text] = event_texts
+                logger.debug(f"날짜 {date_text}: {event_texts}")
+        except IndexError:
+            continue
+    return events_by_date
+
 
 def get_all_first_semester_courses(driver, semester):
     """드롭다운에서 수강하는 강좌 가져오기"""
     try:
-        select_element = WebDriverWait(driver, 5).until(
+        WebDriverWait(driver, 5).until(
             EC.presence_of_element_located(
                 (By.CSS_SELECTOR, "select.select.autosubmit.cal_courses_flt")
             )
         )
-        select = Select(select_element)
-        logger.debug("📋 드롭다운 옵션들:")
-        for option in select.options:
-            logger.debug(f" - {option.text}")
-
         return [
-            option.text for option in select.options if f"[{semester}]" in option.text
+            text for text, _ in parse_calendar_courses(driver.page_source, semester)
         ]
     except Exception as e:
         logger.error("과목 드롭다운 로딩 실패: %s", e)
@@ -248,27 +311,7 @@ def get_events_for_course(driver, course_text):
         select.select_by_visible_text(course_text)
         time.sleep(0.5)
 
-        soup = BeautifulSoup(driver.page_source, "lxml")
-        date_elements = soup.select("div.day a")
-        event_lists = soup.select("ul.events-new")
-
-        logger.debug(
-            f"강좌 {course_text} - 날짜 요소 개수: {len(date_elements)}, 이벤트 리스트 개수: {len(event_lists)}"
-        )
-
-        events_by_date = {}
-        for i, date_text in enumerate(
-            [date.get_text().strip() for date in date_elements]
-        ):
-            try:
-                events = event_lists[i].select("li.calendar_event_course a")
-                event_texts = [event.get_text().strip() for event in events]
-                if event_texts:
-                    events_by_date[date_text] = event_texts
-                    logger.debug(f"날짜 {date_text}: {event_texts}")
-            except IndexError:
-                continue
-
+        events_by_date = parse_calendar_events(driver.page_source)
         logger.debug(f"강좌 {course_text} 최종 이벤트: {events_by_date}")
         return events_by_date
     except Exception as e:
@@ -276,22 +319,14 @@ def get_events_for_course(driver, course_text):
         return {}
 
 
-def move_to_next_month(driver):
-    try:
-        next_month_button = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.arrow_link.next"))
-        )
-        next_month_button.click()
-        WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "h2.current"))
-        )
-        logger.debug("➡️ 다음 달로 이동했습니다.")
-    except Exception as e:
-        logger.error("❌ 다음 달 이동 실패: %s", e)
+def get_subject_name(course_text):
+    """드롭다운 강좌명 "[학기]과목명(분반)" 에서 과목명"""
+    match = re.search(r"\](.*?)\(", course_text)
+    return match.group(1).strip() if match else course_text
 
 
-def get_events(driver, user, year=None, months=None):
-    """학기 중 일정"""
+def get_events(crawler, user, year=None, months=None):
+    """학기 중 일정 (crawler: users.crawlers의 HttpCrawler 또는 SeleniumCrawler)"""
     now = datetime.now()
     year = year or now.year
     current_month = now.month
@@ -319,39 +354,30 @@ def get_events(driver, user, year=None, months=None):
     saved_schedule_ids = []  # 저장된 일정들의 ID 목록
 
     for month in months:
-        start_date = datetime(year, month, 1)
-        timestamp = calendar.timegm(start_date.timetuple())
-        url = f"https://ecampus.smu.ac.kr/calendar/view.php?view=month&course=1&time={timestamp}"
-        driver.get(url)
-
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "h2.current"))
-            )
-        except Exception as e:
-            logger.warning(f"📅 페이지 로딩 실패 ({month}월): {e}")
-            move_to_next_month(driver)
-            continue
-
         # 수업이 아닌 항목 제외
-        first_semester_courses = get_all_first_semester_courses(driver, semester_name)
-        if not first_semester_courses:
+        semester_courses = crawler.get_calendar_courses(year, month, semester_name)
+        if not semester_courses:
             logger.debug("❌ 수강하는 강좌가 없습니다.")
-            move_to_next_month(driver)
             continue
 
-        for course_text in first_semester_courses:
+        # 강좌별 태그를 한 번에 생성/조회
+        tags = {
+            tag.name: tag
+            for tag in resolve_tags(
+                user,
+                [get_subject_name(course_text) for course_text, _ in semester_courses],
+            )
+        }
+
+        for course in semester_courses:
+            course_text = course[0]
             logger.debug(f"선택된 강좌: {course_text}")
             # get events
-            events = get_events_for_course(driver, course_text)
+            events = crawler.get_course_events(year, month, course)
             logger.debug(f"강좌 {course_text}의 이벤트: {events}")
 
-            subject_name = (
-                re.search(r"\](.*?)\(", course_text).group(1).strip()
-                if re.search(r"\](.*?)\(", course_text)
-                else course_text
-            )
-            tag, _ = Tag.objects.get_or_create(name=subject_name, user=user)
+            subject_name = get_subject_name(course_text)
+            tag = tags.get(subject_name)
 
             # 과목별 이벤트 저장
             if subject_name not in course_events:
@@ -388,8 +414,9 @@ def get_events(driver, user, year=None, months=None):
                             logger.debug(f"Schedule 객체 저장 완료: {schedule.id}")
 
                             # 태그 추가
-                            schedule.tag.add(tag)
-                            logger.debug(f"태그 추가 완료: {tag.name}")
+                            if tag:
+                                schedule.tag.add(tag)
+                                logger.debug(f"태그 추가 완료: {tag.name}")
 
                             course_events.setdefault(subject_name, []).append(
                                 {
@@ -412,7 +439,8 @@ def get_events(driver, user, year=None, months=None):
                 except Exception as e:
                     logger.error(f"❌ 이벤트 저장 실패: {e}", exc_info=True)
 
-        move_to_next_month(driver)
+    # 일정 저장 후 추가한 태그까지 조회 캐시에 반영
+    bump_schedule_version(user.id)
 
     logger.info(
         f"📅 이벤트 크롤링 완료 - 사용자: {user.email}, 저장된 일정 수: {saved_count}"
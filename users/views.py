@@ -18,11 +18,19 @@ from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils.crypto import get_random_string
 from django.core.mail import EmailMessage
+from users.scores import (
+    SCORE_HISTORY_DAYS,
+    get_leaderboard,
+    get_score_history,
+    get_score_rank,
+)
 
 
 # User 관련 view
 logger = logging.getLogger("schedulo")
 
+LEADERBOARD_MAX_LIMIT = 100
+
 
 # 조회, 탈퇴
 class UserDetailView(generics.RetrieveDestroyAPIView):
@@ -286,33 +294,73 @@ def get_user_score(request):
             status=status.HTTP_200_OK,
         )
 
-    user = request.user
-    scores_qs = getattr(user, "scores", Score.objects.filter(user=user))
-
-    data = []
-    if scores_qs.exists():
-        scores_qs = scores_qs.order_by("-date")
-        iter_count = min(scores_qs.count(), 7)
-        recent_scores = scores_qs[:iter_count][::-1]  # 최신 7개 거꾸로
-
-        for score in recent_scores:
-            data.append({
-                "x": score.date.strftime("%m월 %d일"),
-                "y": score.score,
-            })
+    try:
+        days = int(request.GET.get("days", 7))
+    except ValueError:
+        days = None
+    if days not in SCORE_HISTORY_DAYS:
+        return Response(
+            {"message": f"days는 {', '.join(map(str, SCORE_HISTORY_DAYS))} 중 하나여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-        first_score = scores_qs.first()
+    history = get_score_history(request.user)
+    if history["scores"]:
+        data = [
+            {"x": score_date.strftime("%m월 %d일"), "y": score}
+            for score_date, score in history["scores"][-days:]
+        ]
         return Response(
             {
                 "data": data,
-                "highest": first_score.highest,
-                "percentage": getattr(first_score, "percentage", 100.0),
+                "highest": history["highest"],
+                "percentage": history["percentage"],
             },
             status=status.HTTP_200_OK,
         )
     else:
-        data.append({"x": date.today().strftime("%m월 %d일"), "y": 100})
+        data = [{"x": date.today().strftime("%m월 %d일"), "y": 100}]
         return Response(
             {"data": data, "highest": 100, "percentage": 100.0},
             status=status.HTTP_200_OK,
         )
+
+
+# 실시간 순위, 백분위
+@api_view(["GET"])
+def get_user_rank(request):
+    if not request.user.is_authenticated:
+        return Response(status=status.HTTP_401_UNAUTHORIZED)
+
+    rank = get_score_rank(request.user)
+    if rank is None:
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(rank, status=status.HTTP_200_OK)
+
+
+# 상위 N명 순위표
+@api_view(["GET"])
+def get_score_leaderboard(request):
+    if not request.user.is_authenticated:
+        return Response(status=status.HTTP_401_UNAUTHORIZED)
+
+    try:
+        limit = min(int(request.GET.get("limit", 10)), LEADERBOARD_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {"message": "limit은 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    latest_date = (
+        Score.objects.order_by("-date").values_list("date", flat=True).first()
+    )
+    if latest_date is None:
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response(
+        {
+            "date": latest_date,
+            "leaderboard": get_leaderboard(latest_date, max(limit, 1), request.user),
+        },
+        status=status.HTTP_200_OK,
+    )